@@ -37,6 +37,7 @@ ALLOWED_HOSTS = ["localhost","127.0.0.1","10.0.2.2","192.168.1.4","vercel.app","
 # Application definition
 
 INSTALLED_APPS = [
+    'daphne',  # ASGI runserver, so `manage.py runserver` also serves WebSockets
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -45,10 +46,12 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'base',
     'rest_framework',
+    'channels',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'base.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -76,6 +79,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'ReactFitPythonBackend.wsgi.application'
+ASGI_APPLICATION = 'ReactFitPythonBackend.asgi.application'
 
 
 # Database
@@ -94,6 +98,38 @@ DATABASES = {
     }
 }
 
+# Optional read replica for analytics reads (base/services/readReplica.py)
+# REPLICA_DATABASE_URL: postgres://... (or sqlite:////path for local testing); REPLICA_MIGRATE=1 only for a standalone local copy
+
+tmpReplica = urlparse(os.getenv("REPLICA_DATABASE_URL", ""))
+if tmpReplica.scheme == 'sqlite':
+    # Local testing against a second database file: sqlite:////abs/path/replica.sqlite3
+    DATABASES['replica'] = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': tmpReplica.path[1:]}
+elif tmpReplica.scheme:
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': tmpReplica.path.replace('/', ''),
+        'USER': tmpReplica.username,
+        'PASSWORD': tmpReplica.password,
+        'HOST': tmpReplica.hostname,
+        'PORT': tmpReplica.port or 5432,
+        'OPTIONS': dict(parse_qsl(tmpReplica.query)),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+READ_REPLICA = {
+    'ALIAS': 'replica',
+    'MAX_LAG_SECONDS': float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5")),
+    'LAG_CHECK_INTERVAL': 2,
+    'STICKY_SECONDS': 10,
+    'STICKY_CACHE': 'shared',  # shared between workers; a per-process cache fails the system check
+    'MIGRATE': bool(os.getenv("REPLICA_MIGRATE")),
+}
+DATABASE_ROUTERS = ['base.services.readReplica.ReplicaRouter']
+
+# Covering indexes (INCLUDE) are Postgres-only; the SQLite fallback just ignores them
+SILENCED_SYSTEM_CHECKS = ['models.W040']
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -130,6 +166,119 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Caches
+# "profiles" is an optional shared local L2 for the profile cache (set PROFILE_CACHE_L2=1)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'profiles': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.cache' / 'profiles',
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+    # State every worker must see: replica read-your-writes pins, Idempotency-Key responses, dashboard sections.
+    # Files serve one host; set SHARED_CACHE_URL (Redis) for several, it also makes the idempotency lock atomic
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv("SHARED_CACHE_URL"),
+    } if os.getenv("SHARED_CACHE_URL") else {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.cache' / 'shared',
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+}
+
+PROFILE_CACHE = {
+    'TTL_SECONDS': int(os.getenv("PROFILE_CACHE_TTL", "300")),
+    'L1_MAX_ENTRIES': 10000,
+    'L2_ALIAS': 'profiles' if os.getenv("PROFILE_CACHE_L2") else None,
+}
+
+# Background task queue (base/services/taskQueue.py)
+# memory: drained by an in-process thread; sqlite: shared local file drained by `manage.py drain_tasks`
+
+TASK_QUEUE_BACKEND = os.getenv("TASK_QUEUE_BACKEND", "memory")
+TASK_QUEUE = {
+    'BACKEND': TASK_QUEUE_BACKEND,
+    'PATH': BASE_DIR / 'tasks.sqlite3',
+    'WORKER': TASK_QUEUE_BACKEND == 'memory',
+    'LEASE_SECONDS': 300,  # sqlite: re-claim tasks a dead drainer left claimed
+}
+
+# Home-screen dashboard sections (base/services/dashboard.py)
+
+DASHBOARD = {
+    'CACHE_ALIAS': 'shared',  # invalidated by whichever worker handled the write
+}
+
+# Idempotency-Key replay for log submissions (base/services/idempotency.py)
+
+IDEMPOTENCY = {
+    'CACHE_ALIAS': 'shared',  # a retry can land on any worker
+    'TTL_SECONDS': 24 * 3600,
+    'LOCK_SECONDS': 30,
+    'WAIT_SECONDS': 5,
+}
+
+# Cold-storage archive of old logs (base/services/logArchive.py, `manage.py archive_logs`)
+
+LOG_ARCHIVE = {
+    'ROOT': os.getenv("LOG_ARCHIVE_DIR", str(BASE_DIR / 'archive')),
+    'KEEP_MONTHS': int(os.getenv("LOG_ARCHIVE_KEEP_MONTHS", "12")),
+    'COMPRESSION': 'zstd',
+}
+
+# DRF: orjson for request bodies and responses (base/renderers.py, base/parsers.py)
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'base.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'base.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Brotli/gzip for JSON responses (base/middleware.py); smaller bodies are sent as-is
+
+HTTP_COMPRESSION = {
+    'MIN_BYTES': 1024,
+}
+
+# Nutrition database (base/services/foodDatabase.py, `manage.py load_foods`)
+# The index is compiled from the foods table and memory-mapped by every worker
+
+FOOD_DATABASE = {
+    'DATASET': BASE_DIR / 'base' / 'data' / 'foods.csv',
+    'INDEX_PATH': os.getenv("FOOD_INDEX_PATH", str(BASE_DIR / '.cache' / 'foods.idx')),
+    'VERSION_CHECK_INTERVAL': 5,  # seconds between checks of the foods table for edits from other processes
+}
+
+# Real-time push to open WebSockets (base/services/realtime.py, base/consumers.py)
+# In-memory by default: pushes reach sockets served by the same process. For several
+# processes set CHANNEL_REDIS_URL=redis://127.0.0.1:6379/0 (needs `pip install channels-redis`).
+
+if os.getenv("CHANNEL_REDIS_URL"):
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {'hosts': [os.getenv("CHANNEL_REDIS_URL")], 'group_expiry': 7 * 24 * 3600},
+        },
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'base.services.realtime.ChannelLayer',
+            # Idle sockets stay connected for days; keep their group membership as long
+            'CONFIG': {'group_expiry': 7 * 24 * 3600, 'capacity': 100, 'clean_interval': 5},
+        },
+    }
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
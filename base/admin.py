@@ -1,9 +1,184 @@
+"""
+Admin for the large tables (users and the per-user log tables).
+
+The stock changelist counts every row (twice) and pages with OFFSET, which
+on millions of rows is a sequential scan per page view. Here:
+
+    count       unfiltered lists read the planner's estimate (pg_class.reltuples),
+                shown as "~N"; filtered lists and small tables are counted exactly
+    paging      in the default ordering, pages continue from the last row seen
+                (?after=<cursor_field value>), an index range scan at any depth;
+                sorting by another column falls back to numbered pages
+    related     list_select_related / raw_id_fields, no per-row or full-table FK loads
+    search      only lookups an index can answer
+"""
+
 from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ORDER_VAR, PAGE_VAR, ChangeList
 from django.contrib.auth.admin import UserAdmin
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
 from .models import AppUsers  # This now works because of Step 2
+from .models import Achievement, UserAchievement
 from .models.waterIntake import WaterIntake
 from .models.dietLogs import DietLog
 
-admin.site.register(AppUsers, UserAdmin)
-admin.site.register(WaterIntake)
-admin.site.register(DietLog)
\ No newline at end of file
+CURSOR_VAR = 'after'
+EXACT_COUNT_BELOW = 100_000  # estimates under this are replaced by a real COUNT(*)
+
+
+# --- 1. ESTIMATED COUNTS ---
+
+def estimated_rows(model, using='default'):
+    """
+    Planner row estimate for ``model``'s table (summed over its partitions, see
+    services/partitions.py). None off Postgres or if any part was never analyzed.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT SUM(reltuples)::bigint FROM pg_class "
+            "WHERE relkind = 'r' AND (oid = %s::regclass "
+            "OR oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = %s::regclass)) "
+            "HAVING MIN(reltuples) >= 0",
+            [model._meta.db_table] * 2,
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+class EstimatedCountPaginator(Paginator):
+    estimated = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_rows(queryset.model, queryset.db)
+            if estimate is not None and estimate >= EXACT_COUNT_BELOW:
+                self.estimated = True
+                return estimate
+        return super().count
+
+
+# --- 2. CURSOR PAGINATION ---
+
+class CursorChangeList(ChangeList):
+    """Keyset pages over ``model_admin.cursor_field`` while the list is in its default ordering."""
+
+    def __init__(self, request, *args, **kwargs):
+        self.cursor = request.GET.get(CURSOR_VAR) or None
+        super().__init__(request, *args, **kwargs)
+
+    @property
+    def keyset(self):
+        return ORDER_VAR not in self.params and not self.show_all
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_results(self, request):
+        if not self.keyset:
+            return super().get_results(request)
+
+        cursor_field = self.model_admin.cursor_field
+        field = cursor_field.lstrip('-')
+        queryset = self.queryset
+        if self.cursor:
+            lookup = f"{field}__{'lt' if cursor_field.startswith('-') else 'gt'}"
+            try:
+                queryset = queryset.filter(**{lookup: self.cursor})
+            except (ValueError, ValidationError):
+                raise IncorrectLookupParameters
+        # The last row of this page and whether one follows it, from the index alone
+        edge = list(queryset.values_list(field, flat=True)[self.list_per_page - 1:self.list_per_page + 1])
+        next_cursor = edge[0] if len(edge) > 1 else None
+
+        self.paginator = self.model_admin.get_paginator(request, self.queryset, self.list_per_page)
+        self.result_count = self.paginator.count
+        self.full_result_count = None
+        self.show_full_result_count = self.model_admin.show_full_result_count
+        self.show_admin_actions = True
+        self.result_list = queryset[:self.list_per_page]
+        self.can_show_all = False
+        self.multi_page = bool(self.cursor or next_cursor)
+        self.first_page_url = self.cursor and self.get_query_string(remove=[CURSOR_VAR, PAGE_VAR])
+        self.next_page_url = next_cursor is not None and self.get_query_string({CURSOR_VAR: next_cursor}, [PAGE_VAR])
+
+
+class LargeTableAdmin:
+    """Mix in before ModelAdmin / UserAdmin; ``cursor_field`` must be unique and indexed."""
+    cursor_field = '-id'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_ordering(self, request):
+        return (self.cursor_field,)
+
+    def get_changelist(self, request, **kwargs):
+        return CursorChangeList
+
+
+# --- 3. MODEL ADMINS ---
+
+@admin.register(AppUsers)
+class AppUsersAdmin(LargeTableAdmin, UserAdmin):
+    cursor_field = 'username'
+    list_display = ('username', 'email', 'firstName', 'lastName', 'age', 'bmi', 'is_staff')
+    list_filter = ('role', 'is_active')
+    search_fields = ('username__startswith', 'email__exact')
+    search_help_text = "Username prefix or exact email."
+    fieldsets = UserAdmin.fieldsets + (
+        ('Profile', {'fields': ('role', 'date_of_birth', 'gender', 'country', 'height', 'weight',
+                                'activityLevel', 'primaryGoal', 'protocol')}),
+    )
+
+    def get_queryset(self, request):
+        # age / bmi computed by the database for the whole page, not per row
+        return super().get_queryset(request).with_metrics()
+
+    @admin.display(ordering='age')
+    def age(self, obj):
+        return obj.age
+
+    @admin.display(ordering='bmi', description='BMI')
+    def bmi(self, obj):
+        return round(obj.bmi, 1) if obj.bmi is not None else None
+
+
+@admin.register(DietLog)
+class DietLogAdmin(LargeTableAdmin, admin.ModelAdmin):
+    list_display = ('id', 'user', 'date', 'title', 'calories', 'protein_g', 'carbs_g', 'fat_g')
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+    search_fields = ('user__username__startswith',)
+    search_help_text = "Username prefix."
+
+
+@admin.register(WaterIntake)
+class WaterIntakeAdmin(LargeTableAdmin, admin.ModelAdmin):
+    list_display = ('id', 'user', 'date', 'current_intake_ml', 'daily_goal_ml', 'last_updated')
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+    search_fields = ('user__username__startswith',)
+    search_help_text = "Username prefix."
+
+
+@admin.register(UserAchievement)
+class UserAchievementAdmin(LargeTableAdmin, admin.ModelAdmin):
+    list_display = ('id', 'user', 'achievement', 'unlocked_at')
+    list_select_related = ('user', 'achievement')
+    raw_id_fields = ('user',)
+    search_fields = ('user__username__startswith',)
+    search_help_text = "Username prefix."
+
+
+admin.site.register(Achievement)
@@ -6,4 +6,6 @@ class BaseConfig(AppConfig):
     name = 'base'
 
     def ready(self):
-            import base.models
\ No newline at end of file
+            import base.models
+            import base.signals
+            import base.tasks
@@ -0,0 +1,47 @@
+import uuid
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
+
+from .services import profileCache, realtime
+
+
+class UserStreamConsumer(AsyncWebsocketConsumer):
+    """
+    One socket per open device: ws/v1/stream/?userID=<uuid>
+    Joins the user's group and forwards whatever services/realtime.py publishes.
+    The client only ever sends "ping" (answered with "pong") to keep idle connections alive.
+    """
+
+    group = None
+
+    async def connect(self):
+        # 1. Who is this?
+        query = parse_qs(self.scope["query_string"].decode())
+        try:
+            user_id = uuid.UUID(query.get("userID", [""])[0])
+        except ValueError:
+            await self.close(code=4400)
+            return
+
+        if await database_sync_to_async(profileCache.get_profile)(user_id) is None:
+            await self.close(code=4404)
+            return
+
+        # 2. Subscribe, then accept so no push is missed in between
+        self.group = realtime.group_for(user_id)
+        await self.channel_layer.group_add(self.group, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        if self.group:
+            await self.channel_layer.group_discard(self.group, self.channel_name)
+
+    async def receive(self, text_data=None, bytes_data=None):
+        if text_data == "ping":
+            await self.send(text_data="pong")
+
+    async def user_push(self, message):
+        # Already encoded once by the publisher
+        await self.send(text_data=message["text"])
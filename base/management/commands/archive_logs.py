@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from base.services.logArchive import CHUNK_SIZE, archive_older_than
+
+
+class Command(BaseCommand):
+    help = "Move diet, water and workout logs older than N whole months to Parquet files, then delete them."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months', type=int, default=settings.LOG_ARCHIVE['KEEP_MONTHS'],
+                            help="Whole months of history to keep in the database")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="Rows fetched per cursor round-trip")
+        parser.add_argument('--dry-run', action='store_true', help="Count rows without writing or deleting")
+
+    def handle(self, *args, **options):
+        totals = archive_older_than(options['months'], options['chunk_size'], options['dry_run'], stdout=self.stdout)
+        verb = "Would archive" if options['dry_run'] else "Archived"
+        self.stdout.write(f"{verb}: {totals or 'nothing'}")
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from base.services.taskQueue import get_queue
+
+
+class Command(BaseCommand):
+    help = "Drain the background task queue (use with TASK_QUEUE_BACKEND=sqlite)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Drain what is due and exit")
+        parser.add_argument('--interval', type=float, default=1.0, help="Seconds to sleep when the queue is empty")
+
+    def handle(self, *args, **options):
+        queue = get_queue()
+        while True:
+            handled = queue.drain()
+            if handled:
+                self.stdout.write(f"⚙️ Ran {handled} tasks")
+            if options['once']:
+                return
+            if not handled:
+                time.sleep(options['interval'])
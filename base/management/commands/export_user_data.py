@@ -0,0 +1,34 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from base.models.appUsers import AppUsers
+from base.services.userExport import CHUNK_SIZE, STREAMS
+
+
+class Command(BaseCommand):
+    help = "Stream every row stored for one user to a file (or stdout) as NDJSON or zip."
+
+    def add_arguments(self, parser):
+        parser.add_argument('user_id')
+        parser.add_argument('--format', choices=list(STREAMS), default='ndjson')
+        parser.add_argument('--output', '-o', help="File to write (default: stdout)")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="Rows fetched per cursor round-trip")
+
+    def handle(self, *args, **options):
+        if not AppUsers.objects.filter(id=options['user_id']).exists():
+            raise CommandError(f"User {options['user_id']} not found")
+
+        stream = STREAMS[options['format']][0]
+        target = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        try:
+            written = 0
+            for chunk in stream(options['user_id'], options['chunk_size']):
+                target.write(chunk)
+                written += len(chunk)
+        finally:
+            if options['output']:
+                target.close()
+
+        if options['output']:
+            self.stdout.write(f"📤 Wrote {written} bytes to {options['output']}")
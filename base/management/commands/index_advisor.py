@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from base.services.indexAdvisor import advise
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN the queries our endpoints issue and propose covering/partial indexes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--analyze', action='store_true', help="EXPLAIN ANALYZE (Postgres only; runs the queries)")
+        parser.add_argument('--plans', action='store_true', help="Print the full plan for every query")
+
+    def handle(self, *args, **options):
+        for report in advise(analyze=options['analyze']):
+            status = ", ".join(report['problems']) or "ok"
+            self.stdout.write(f"🔍 {report['query']} [{report['table']}]: {status}")
+            if options['plans'] or report['problems']:
+                for line in report['plan'].splitlines():
+                    self.stdout.write(f"    {line}")
+            if report['suggestion']:
+                self.stdout.write(self.style.WARNING(f"    -> {report['suggestion']}"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from base.services import foodDatabase
+
+
+class Command(BaseCommand):
+    help = "Upsert the bundled nutrition dataset into the foods table and rebuild the memory-mapped food index."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=None, help=f"CSV to load (default: {foodDatabase.DATASET})")
+        parser.add_argument('--index-only', action='store_true', help="Only rebuild the index from the foods table")
+
+    def handle(self, *args, **options):
+        if not options['index_only']:
+            count = foodDatabase.load_dataset(options['path'])
+            self.stdout.write(f"Loaded {count} foods")
+        foodDatabase.invalidate()
+        self.stdout.write(f"Index: {foodDatabase.INDEX_PATH or 'in memory'}")
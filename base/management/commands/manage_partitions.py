@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from base.services.partitions import MONTHS_AHEAD, detach_old_partitions, ensure_partitions
+
+
+class Command(BaseCommand):
+    help = "Create upcoming monthly log partitions and detach old ones (Postgres only). Run daily."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ahead', type=int, default=MONTHS_AHEAD, help="Months of future partitions to keep ready")
+        parser.add_argument('--detach-older-than', type=int, help="Detach partitions older than this many months")
+        parser.add_argument('--drop', action='store_true', help="Drop detached partitions instead of keeping them")
+
+    def handle(self, *args, **options):
+        created = ensure_partitions(options['ahead'])
+        self.stdout.write(f"🗂️ Created partitions: {created or 'none'}")
+
+        if options['detach_older_than']:
+            detached = detach_old_partitions(options['detach_older_than'], drop=options['drop'])
+            verb = "Dropped" if options['drop'] else "Detached"
+            self.stdout.write(f"{verb} partitions: {detached or 'none'}")
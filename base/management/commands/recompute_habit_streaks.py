@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from base.services.habitStreaks import recompute_all
+
+
+class Command(BaseCommand):
+    help = "Rebuild habit streak counters from HabitLog history (repair tool)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--habit', action='append', dest='habits', help="Habit id to repair (repeatable); default all")
+
+    def handle(self, *args, **options):
+        count = recompute_all(options['habits'])
+        self.stdout.write(f"🔁 Recomputed streaks for {count} habits with completions")
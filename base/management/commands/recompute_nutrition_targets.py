@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from base.services.nutritionTargets import USER_BLOCK_SIZE, recompute_all
+
+
+class Command(BaseCommand):
+    help = "Backfill / refresh calorie, macro and water targets for every user whose profile inputs changed."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--block-size', type=int, default=USER_BLOCK_SIZE, help="Users computed per vectorised block")
+
+    def handle(self, *args, **options):
+        count = recompute_all(options['block_size'])
+        self.stdout.write(f"🎯 Recomputed nutrition targets for {count} users")
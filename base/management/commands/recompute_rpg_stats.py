@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from base.services.rpgScoring import USER_BLOCK_SIZE, recompute_all
+
+
+class Command(BaseCommand):
+    help = "Nightly full recompute of RPG stats and body heatmap levels for every user."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--block-size', type=int, default=USER_BLOCK_SIZE, help="Users scored per vectorised block")
+
+    def handle(self, *args, **options):
+        count = recompute_all(options['block_size'])
+        self.stdout.write(f"🏋️ Recomputed RPG stats for {count} users")
@@ -0,0 +1,25 @@
+import threading
+
+from django.core.management.base import BaseCommand
+
+from base.services.reminderScheduler import FileSink, ReminderScheduler, SYNC_INTERVAL_SECONDS
+
+
+class Command(BaseCommand):
+    help = "Run the reminder dispatcher, writing due reminders to a local NDJSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='reminders.ndjson', help="File the sink appends due reminders to")
+        parser.add_argument('--sync-interval', type=int, default=SYNC_INTERVAL_SECONDS,
+                            help="Seconds between incremental reads of edited reminders")
+
+    def handle(self, *args, **options):
+        scheduler = ReminderScheduler(FileSink(options['output']), sync_interval=options['sync_interval'])
+        stop = threading.Event()
+
+        self.stdout.write(f"⏰ Reminder scheduler running -> {options['output']}")
+        try:
+            scheduler.serve_forever(stop)
+        except KeyboardInterrupt:
+            stop.set()
+            self.stdout.write("Scheduler stopped")
@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from base.services.reminderScheduler import FileSink
+from base.services.waterReminders import SHARD_SIZE, MIN_GAP, dispatch_due_reminders
+
+
+class Command(BaseCommand):
+    help = "Emit water reminders for users behind their daily pace. Schedule it no more often than --min-gap-minutes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='water_reminders.ndjson', help="File the sink appends events to")
+        parser.add_argument('--min-gap-minutes', type=int, default=int(MIN_GAP.total_seconds() // 60),
+                            help="Only remind users whose last sip is older than this")
+        parser.add_argument('--shard-size', type=int, default=SHARD_SIZE)
+
+    def handle(self, *args, **options):
+        sent = dispatch_due_reminders(
+            FileSink(options['output']),
+            min_gap=timedelta(minutes=options['min_gap_minutes']),
+            shard_size=options['shard_size'],
+        )
+        self.stdout.write(f"💧 Water reminders emitted: {sent}")
@@ -0,0 +1,42 @@
+from django.utils.cache import patch_vary_headers
+
+from .services import httpCompression
+
+
+class CompressionMiddleware:
+    """
+    Brotli/gzip for JSON and text responses above HTTP_COMPRESSION['MIN_BYTES'].
+    Responses that already carry a Content-Encoding (precompressed) pass through.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if response.streaming or response.status_code != 200 or response.has_header('Content-Encoding'):
+            return response
+        if not httpCompression.compressible(response.get('Content-Type')):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < httpCompression.MIN_BYTES:
+            return response
+
+        encoding = httpCompression.negotiate(request.headers.get('Accept-Encoding'))
+        if encoding is None:
+            return response
+
+        compressed = httpCompression.DYNAMIC[encoding](response.content)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        # The encoded bytes differ, so a strong validator no longer holds
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
@@ -0,0 +1,146 @@
+# Generated by Django 5.1.4 on 2026-10-19 15:46
+
+import django.core.validators
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0004_dietlog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Exercise',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=200)),
+                ('category', models.CharField(choices=[('strength', 'Strength Training'), ('cardio', 'Cardio'), ('flexibility', 'Flexibility'), ('balance', 'Balance'), ('sports', 'Sports')], max_length=20)),
+                ('muscle_group', models.CharField(choices=[('chest', 'Chest'), ('back', 'Back'), ('shoulders', 'Shoulders'), ('arms', 'Arms'), ('core', 'Core'), ('legs', 'Legs'), ('full_body', 'Full Body'), ('cardio', 'Cardio')], max_length=20)),
+                ('description', models.TextField(blank=True)),
+                ('instructions', models.TextField(blank=True)),
+                ('difficulty_level', models.IntegerField(default=3, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('equipment_required', models.CharField(blank=True, max_length=200)),
+                ('is_compound', models.BooleanField(default=False)),
+                ('supports_form_tracking', models.BooleanField(default=False)),
+                ('supports_rep_counting', models.BooleanField(default=False)),
+                ('is_custom', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_exercises', to='base.appusers')),
+            ],
+            options={
+                'db_table': 'exercises',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Workout',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('title', models.CharField(blank=True, max_length=200)),
+                ('date', models.DateField(default=django.utils.timezone.now)),
+                ('status', models.CharField(choices=[('planned', 'Planned'), ('in_progress', 'In Progress'), ('completed', 'Completed'), ('skipped', 'Skipped')], default='planned', max_length=20)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('duration_minutes', models.IntegerField(blank=True, null=True)),
+                ('notes', models.TextField(blank=True)),
+                ('ai_generated', models.BooleanField(default=False)),
+                ('ai_prompt', models.TextField(blank=True)),
+                ('total_volume_kg', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('estimated_calories_burned', models.IntegerField(blank=True, null=True)),
+                ('difficulty_rating', models.IntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('energy_level_before', models.IntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('energy_level_after', models.IntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='workouts', to='base.appusers')),
+            ],
+            options={
+                'db_table': 'workouts',
+                'ordering': ['-date', '-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='WorkoutExercise',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('order', models.IntegerField(default=0)),
+                ('target_sets', models.IntegerField(default=3)),
+                ('target_reps', models.IntegerField(blank=True, null=True)),
+                ('target_duration_seconds', models.IntegerField(blank=True, null=True)),
+                ('target_weight_kg', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('completed_sets', models.IntegerField(default=0)),
+                ('notes', models.TextField(blank=True)),
+                ('exercise', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='base.exercise')),
+                ('workout', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exercises', to='base.workout')),
+            ],
+            options={
+                'db_table': 'workout_exercises',
+                'ordering': ['order'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ExerciseSet',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('set_number', models.IntegerField()),
+                ('reps', models.IntegerField(blank=True, null=True)),
+                ('weight_kg', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('duration_seconds', models.IntegerField(blank=True, null=True)),
+                ('distance_meters', models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True)),
+                ('form_score', models.DecimalField(blank=True, decimal_places=2, max_digits=4, null=True)),
+                ('cv_rep_count', models.IntegerField(blank=True, null=True)),
+                ('cv_analyzed', models.BooleanField(default=False)),
+                ('rest_seconds', models.IntegerField(blank=True, null=True)),
+                ('completed', models.BooleanField(default=True)),
+                ('notes', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('workout_exercise', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sets', to='base.workoutexercise')),
+            ],
+            options={
+                'db_table': 'exercise_sets',
+                'ordering': ['set_number'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AIAction',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('action_type', models.CharField(choices=[('workout_log', 'Logged Workout'), ('workout_create', 'Created Workout Plan'), ('habit_update', 'Updated Habit'), ('goal_set', 'Set Goal'), ('recommendation', 'Made Recommendation')], max_length=20)),
+                ('action_data', models.JSONField()),
+                ('success', models.BooleanField(default=True)),
+                ('error_message', models.TextField(blank=True)),
+                ('timestamp', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ai_actions', to='base.appusers')),
+            ],
+            options={
+                'db_table': 'ai_actions',
+                'ordering': ['-timestamp'],
+                'indexes': [models.Index(fields=['user', 'action_type', '-timestamp'], name='ai_actions_user_id_82dc14_idx')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='exercise',
+            index=models.Index(fields=['category', 'muscle_group'], name='exercises_categor_884d52_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workout',
+            index=models.Index(fields=['user', 'date'], name='workouts_user_id_9fde5e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workout',
+            index=models.Index(fields=['user', 'status'], name='workouts_user_id_bee678_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='workoutexercise',
+            unique_together={('workout', 'order')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='exerciseset',
+            unique_together={('workout_exercise', 'set_number')},
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.1.4 on 2026-10-19 15:47
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0005_workout_plans'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SleepLog',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('bedtime', models.DateTimeField()),
+                ('wake_time', models.DateTimeField()),
+                ('duration_hours', models.DecimalField(decimal_places=2, max_digits=4)),
+                ('quality_rating', models.IntegerField(blank=True, choices=[(1, 'Very Poor'), (2, 'Poor'), (3, 'Fair'), (4, 'Good'), (5, 'Excellent')], null=True)),
+                ('interruptions', models.IntegerField(default=0)),
+                ('deep_sleep_hours', models.DecimalField(blank=True, decimal_places=1, max_digits=3, null=True)),
+                ('rem_sleep_hours', models.DecimalField(blank=True, decimal_places=1, max_digits=3, null=True)),
+                ('notes', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sleep_logs', to='base.appusers')),
+            ],
+            options={
+                'db_table': 'sleep_logs',
+                'ordering': ['-date'],
+                'unique_together': {('user', 'date')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StepLog',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('date', models.DateField(default=django.utils.timezone.now)),
+                ('step_count', models.IntegerField(default=0)),
+                ('distance_km', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('active_minutes', models.IntegerField(blank=True, null=True)),
+                ('calories_burned', models.IntegerField(blank=True, null=True)),
+                ('source', models.CharField(default='manual', max_length=50)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='step_logs', to='base.appusers')),
+            ],
+            options={
+                'db_table': 'step_logs',
+                'ordering': ['-date'],
+                'unique_together': {('user', 'date')},
+            },
+        ),
+    ]
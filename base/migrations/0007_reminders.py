@@ -0,0 +1,34 @@
+# Generated by Django 5.1.4 on 2026-10-19 15:48
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0006_step_and_sleep_logs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Reminder',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('type', models.CharField(choices=[('water', 'Water Reminder'), ('workout', 'Workout Reminder'), ('habit', 'Habit Reminder'), ('sleep', 'Sleep Reminder'), ('custom', 'Custom Reminder')], max_length=20)),
+                ('title', models.CharField(max_length=200)),
+                ('message', models.TextField(blank=True)),
+                ('time', models.TimeField()),
+                ('days_of_week', models.JSONField(default=list)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='base.appusers')),
+            ],
+            options={
+                'db_table': 'reminders',
+                'ordering': ['time'],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.4 on 2026-10-19 15:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0007_reminders'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='waterintake',
+            index=models.Index(fields=['date', 'last_updated'], name='water_date_last_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.1.4 on 2026-10-19 15:49
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0008_water_intake_reminder_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Habit',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('frequency', models.CharField(choices=[('daily', 'Daily'), ('weekly', 'Weekly'), ('custom', 'Custom Days')], default='daily', max_length=10)),
+                ('target_days_per_week', models.IntegerField(blank=True, null=True)),
+                ('icon', models.CharField(blank=True, max_length=50)),
+                ('color', models.CharField(default='#3B82F6', max_length=7)),
+                ('current_streak', models.PositiveIntegerField(default=0)),
+                ('longest_streak', models.PositiveIntegerField(default=0)),
+                ('completed_count', models.PositiveIntegerField(default=0)),
+                ('last_completed_date', models.DateField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='habits', to='base.appusers')),
+            ],
+            options={
+                'db_table': 'habits',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='HabitLog',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('date', models.DateField(default=django.utils.timezone.now)),
+                ('completed', models.BooleanField(default=False)),
+                ('notes', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('habit', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='logs', to='base.habit')),
+            ],
+            options={
+                'db_table': 'habit_logs',
+                'ordering': ['-date'],
+                'unique_together': {('habit', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.4 on 2026-10-19 15:51
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0009_habits'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BodyPartMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chest_level', models.FloatField(default=0.0, help_text='Calculated from Bench/Pushups')),
+                ('back_level', models.FloatField(default=0.0, help_text='Calculated from Pullups/Rows')),
+                ('arms_level', models.FloatField(default=0.0)),
+                ('shoulders_level', models.FloatField(default=0.0)),
+                ('quads_level', models.FloatField(default=0.0, help_text='Calculated from Squats')),
+                ('hamstrings_level', models.FloatField(default=0.0, help_text='Calculated from Deadlifts')),
+                ('calves_level', models.FloatField(default=0.0)),
+                ('glutes_level', models.FloatField(default=0.0)),
+                ('core_strength', models.FloatField(default=0.0)),
+                ('raw_totals', models.JSONField(blank=True, default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='body_metrics', to='base.appusers')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='UserRPGStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('strength_score', models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)])),
+                ('endurance_score', models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)])),
+                ('flexibility_score', models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)])),
+                ('recovery_score', models.IntegerField(default=0, help_text='Based on sleep/rest consistency', validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)])),
+                ('consistency_streak', models.IntegerField(default=0, help_text='Current daily streak')),
+                ('total_workouts', models.IntegerField(default=0)),
+                ('last_workout_date', models.DateField(blank=True, null=True)),
+                ('last_updated', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='rpg_stats', to='base.appusers')),
+            ],
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.4 on 2026-10-19 15:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0010_rpg_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Achievement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('description', models.TextField()),
+                ('category', models.CharField(choices=[('strength', 'Strength'), ('consistency', 'Consistency'), ('endurance', 'Endurance')], max_length=20)),
+                ('icon_url', models.URLField(blank=True, null=True)),
+                ('condition_logic', models.JSONField(help_text='JSON rule checked when a matching log event arrives')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='UserAchievement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unlocked_at', models.DateTimeField(auto_now_add=True)),
+                ('achievement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='base.achievement')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='achievements', to='base.appusers')),
+            ],
+            options={
+                'unique_together': {('user', 'achievement')},
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.4 on 2026-10-19 15:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0011_achievements'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='waterintake',
+            name='water_date_last_updated_idx',
+        ),
+        migrations.AlterField(
+            model_name='dietlog',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='diet_logs', to='base.appusers'),
+        ),
+        migrations.AlterField(
+            model_name='waterintake',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='water_logs', to='base.appusers'),
+        ),
+        migrations.AddIndex(
+            model_name='dietlog',
+            index=models.Index(fields=['user', 'date'], include=('calories', 'protein_g', 'carbs_g', 'fat_g'), name='dietlog_user_date_macros_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='waterintake',
+            index=models.Index(condition=models.Q(('current_intake_ml__lt', models.F('daily_goal_ml'))), fields=['date', 'last_updated'], name='water_behind_goal_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.4 on 2026-10-19 15:56
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0012_index_audit'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WaterIntakeLog',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('date', models.DateField(default=django.utils.timezone.now)),
+                ('timestamp', models.DateTimeField(auto_now_add=True)),
+                ('amount_ml', models.IntegerField()),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='water_intake_logs', to='base.appusers')),
+            ],
+            options={
+                'db_table': 'water_intake_logs',
+                'ordering': ['-timestamp'],
+                'indexes': [models.Index(fields=['user', 'date'], name='water_intak_user_id_a77512_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Converts the high-volume log tables to monthly range partitions on Postgres.
+# No-op on other databases (SQLite test fallback).
+
+from django.db import migrations
+
+from base.services.partitions import convert_to_partitioned, convert_to_plain
+
+# exercise_sets was listed here too; it is read by workout_exercise_id, not by date (see 0025)
+TABLES = [
+    ('DietLog', 'base_dietlog', 'date', False),
+    ('WaterIntakeLog', 'water_intake_logs', 'date', False),
+]
+
+
+def partition_tables(apps, schema_editor):
+    for _, table, column, is_datetime in TABLES:
+        convert_to_partitioned(schema_editor, table, column, is_datetime)
+
+
+def unpartition_tables(apps, schema_editor):
+    # A full copy back into plain tables
+    for model_name, *_ in TABLES:
+        convert_to_plain(schema_editor, apps.get_model('base', model_name))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0013_water_intake_log'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_tables, unpartition_tables),
+    ]
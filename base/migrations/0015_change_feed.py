@@ -0,0 +1,41 @@
+# Generated by Django 5.1.4 on 2026-10-19 16:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0014_partition_log_tables'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncCounter',
+            fields=[
+                ('user_id', models.UUIDField(primary_key=True, serialize=False)),
+                ('last_seq', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'sync_counters',
+            },
+        ),
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_id', models.UUIDField()),
+                ('seq', models.BigIntegerField()),
+                ('table', models.CharField(max_length=30)),
+                ('row_id', models.CharField(max_length=64)),
+                ('op', models.CharField(choices=[('u', 'Upsert'), ('d', 'Delete')], default='u', max_length=1)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'change_log',
+                'indexes': [models.Index(fields=['user_id', 'seq'], name='change_log_cursor_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user_id', 'table', 'row_id'), name='change_log_row_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Seeds the change feed with every existing synced row, so a client's first
+# sync (cursor=0) returns the full data set.
+
+from django.db import migrations
+
+BATCH_SIZE = 5000
+
+# feed table name -> (model, owner column)
+SOURCES = [
+    ('profile', 'AppUsers', 'id'),
+    ('diet_logs', 'DietLog', 'user_id'),
+    ('water_intake', 'WaterIntake', 'user_id'),
+    ('workouts', 'Workout', 'user_id'),
+]
+
+
+def seed(apps, schema_editor):
+    ChangeLog = apps.get_model('base', 'ChangeLog')
+    SyncCounter = apps.get_model('base', 'SyncCounter')
+
+    seqs = {}
+    batch = []
+    for table, model_name, owner in SOURCES:
+        model = apps.get_model('base', model_name)
+        for pk, user_id in model.objects.order_by().values_list('pk', owner).iterator(chunk_size=BATCH_SIZE):
+            seqs[user_id] = seqs.get(user_id, 0) + 1
+            batch.append(ChangeLog(user_id=user_id, seq=seqs[user_id], table=table, row_id=str(pk), op='u'))
+            if len(batch) >= BATCH_SIZE:
+                ChangeLog.objects.bulk_create(batch)
+                batch = []
+    ChangeLog.objects.bulk_create(batch)
+
+    SyncCounter.objects.bulk_create(
+        [SyncCounter(user_id=user_id, last_seq=seq) for user_id, seq in seqs.items()],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def unseed(apps, schema_editor):
+    apps.get_model('base', 'ChangeLog').objects.all().delete()
+    apps.get_model('base', 'SyncCounter').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0015_change_feed'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed, unseed),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.4 on 2026-10-19 16:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0016_seed_change_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Food',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.SlugField(max_length=64, unique=True)),
+                ('name', models.CharField(max_length=200)),
+                ('aliases', models.JSONField(blank=True, default=list)),
+                ('serving_qty', models.FloatField(default=1)),
+                ('serving_unit', models.CharField(default='serving', max_length=20)),
+                ('serving_g', models.FloatField()),
+                ('kcal', models.FloatField()),
+                ('protein_g', models.FloatField(default=0)),
+                ('carbs_g', models.FloatField(default=0)),
+                ('fat_g', models.FloatField(default=0)),
+                ('source', models.CharField(choices=[('bundled', 'Bundled dataset'), ('custom', 'Added by an admin')], default='custom', max_length=10)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'foods',
+                'ordering': ['name'],
+            },
+        ),
+    ]
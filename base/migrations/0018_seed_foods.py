@@ -0,0 +1,24 @@
+# Loads the bundled nutrition dataset (base/data/foods.csv) into the foods table.
+
+from django.db import migrations
+
+from base.services.foodDatabase import load_dataset
+
+
+def seed(apps, schema_editor):
+    load_dataset(model=apps.get_model('base', 'Food'))
+
+
+def unseed(apps, schema_editor):
+    apps.get_model('base', 'Food').objects.filter(source='bundled').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0017_food'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed, unseed),
+    ]
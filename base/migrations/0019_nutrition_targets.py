@@ -0,0 +1,33 @@
+# Generated by Django 5.1.4 on 2026-10-19 16:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0018_seed_foods'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NutritionTargets',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='nutrition_targets', serialize=False, to='base.appusers')),
+                ('bmr_kcal', models.PositiveIntegerField()),
+                ('tdee_kcal', models.PositiveIntegerField()),
+                ('target_kcal', models.PositiveIntegerField()),
+                ('protein_g', models.PositiveIntegerField()),
+                ('carbs_g', models.PositiveIntegerField()),
+                ('fat_g', models.PositiveIntegerField()),
+                ('water_ml', models.PositiveIntegerField()),
+                ('assumed', models.JSONField(blank=True, default=list, help_text='Profile inputs that were missing and defaulted')),
+                ('inputs_hash', models.CharField(max_length=32)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'nutrition_targets',
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.4 on 2026-10-19 16:27
+
+import base.models.appUsers
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0019_nutrition_targets'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='appusers',
+            managers=[
+                ('objects', base.models.appUsers.AppUsersManager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='appusers',
+            name='date_of_birth',
+            field=models.DateField(blank=True, null=True),
+        ),
+    ]
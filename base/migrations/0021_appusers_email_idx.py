@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-19 16:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('base', '0020_appusers_date_of_birth'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='appusers',
+            index=models.Index(fields=['email'], name='appusers_email_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.4 on 2026-10-19 16:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0022_exercise_updated_at'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='dietlog',
+            name='dietlog_user_date_macros_idx',
+        ),
+        migrations.AddField(
+            model_name='dietlog',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='dietlog',
+            index=models.Index(fields=['user', 'date'], include=('calories', 'protein_g', 'carbs_g', 'fat_g', 'updated_at'), name='dietlog_user_date_macros_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.4 on 2026-10-19 16:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0023_dietlog_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTotals',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='archived_totals', serialize=False, to='base.appusers')),
+                ('volume', models.JSONField(blank=True, default=dict)),
+                ('cardio_seconds', models.FloatField(default=0.0)),
+                ('flexibility_seconds', models.FloatField(default=0.0)),
+                ('completed_workouts', models.IntegerField(default=0)),
+                ('diet_logs', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'archived_totals',
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# 0014 used to partition exercise_sets by created_at, which no query filters on.
+# Rebuilds it as a plain table with its (workout_exercise, set_number) unique
+# constraint back. No-op where it was never partitioned, and on SQLite.
+
+from django.db import migrations
+
+from base.services.partitions import convert_to_plain
+
+
+def unpartition_exercise_sets(apps, schema_editor):
+    convert_to_plain(schema_editor, apps.get_model('base', 'ExerciseSet'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0024_archived_totals'),
+    ]
+
+    operations = [
+        # Reverse: nothing to undo, the plain table is also what 0014 now creates
+        migrations.RunPython(unpartition_exercise_sets, migrations.RunPython.noop),
+    ]
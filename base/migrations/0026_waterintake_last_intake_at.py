@@ -0,0 +1,34 @@
+# Generated by Django 5.1.4 on 2026-10-19 17:07
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_last_intake(apps, schema_editor):
+    # Until now last_updated doubled as the last sip
+    WaterIntake = apps.get_model('base', 'WaterIntake')
+    WaterIntake.objects.update(last_intake_at=models.F('last_updated'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0025_unpartition_exercise_sets'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='waterintake',
+            name='water_behind_goal_idx',
+        ),
+        migrations.AddField(
+            model_name='waterintake',
+            name='last_intake_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(backfill_last_intake, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='waterintake',
+            index=models.Index(condition=models.Q(('current_intake_ml__lt', models.F('daily_goal_ml'))), fields=['date', 'last_intake_at'], name='water_behind_goal_idx'),
+        ),
+    ]
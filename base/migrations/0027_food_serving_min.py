@@ -0,0 +1,24 @@
+# Generated by Django 5.1.4 on 2026-10-19 17:13
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0026_waterintake_last_intake_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='food',
+            name='serving_g',
+            field=models.FloatField(validators=[django.core.validators.MinValueValidator(0.01)]),
+        ),
+        migrations.AlterField(
+            model_name='food',
+            name='serving_qty',
+            field=models.FloatField(default=1, validators=[django.core.validators.MinValueValidator(0.01)]),
+        ),
+    ]
@@ -1 +1,16 @@
-from .appUsers import AppUsers
\ No newline at end of file
+from .appUsers import AppUsers, UserRPGStats, BodyPartMetrics, NutritionTargets, ArchivedTotals, Achievement, UserAchievement
+from .waterIntake import WaterIntake
+from .dietLogs import DietLog
+from .exerciseLibrary import Exercise
+from .workoutSessions import Workout
+from .workoutExercises import WorkoutExercise
+from .workoutSet import ExerciseSet
+from .aiActions import AIAction
+from .stepLogs import StepLog
+from .sleepLogs import SleepLog
+from .reminders import Reminder
+from .habits import Habit
+from .habitLogs import HabitLog
+from .waterIntakeLogs import WaterIntakeLog
+from .changeLogs import ChangeLog, SyncCounter
+from .foods import Food
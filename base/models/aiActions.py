@@ -0,0 +1,36 @@
+from django.db import models
+from .appUsers import AppUsers
+import uuid
+
+
+class AIAction(models.Model):
+    """Actions taken by AI (workout logs, habit updates, etc.)"""
+
+    ACTION_TYPE_CHOICES = [
+        ('workout_log', 'Logged Workout'),
+        ('workout_create', 'Created Workout Plan'),
+        ('habit_update', 'Updated Habit'),
+        ('goal_set', 'Set Goal'),
+        ('recommendation', 'Made Recommendation'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(AppUsers, on_delete=models.CASCADE, related_name='ai_actions')
+
+    action_type = models.CharField(max_length=20, choices=ACTION_TYPE_CHOICES)
+    action_data = models.JSONField()  # Store action details
+
+    success = models.BooleanField(default=True)
+    error_message = models.TextField(blank=True)
+
+    timestamp = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'ai_actions'
+        ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['user', 'action_type', '-timestamp']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.get_action_type_display()}"
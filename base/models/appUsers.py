@@ -2,9 +2,59 @@ from django.db import models
 from django.contrib.auth.models import AbstractUser
 import uuid
 from django.utils import timezone
-from django.contrib.auth.models import AbstractUser, Group, Permission # Add imports
+from django.utils.functional import cached_property
+from django.contrib.auth.models import AbstractUser, Group, Permission, UserManager # Add imports
+from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models import Case, ExpressionWrapper, F, FloatField, IntegerField, Q, Value, When
+from django.db.models.functions import ExtractYear
+from ..services import profileCache
+
 
 # --- 1. CORE USER MODEL (Identity) ---
+
+# Derived metrics: Python side (one instance) and SQL side (listings) of AppUsers.age / AppUsers.bmi
+def age_on(date_of_birth, today=None):
+    """Whole years between date_of_birth and today (None if unknown)."""
+    if not date_of_birth:
+        return None
+    today = today or timezone.localdate()
+    return today.year - date_of_birth.year - ((today.month, today.day) < (date_of_birth.month, date_of_birth.day))
+
+
+def bmi_of(weight, height):
+    """kg / m², None unless both are known."""
+    if not weight or not height:
+        return None
+    return weight / (height / 100) ** 2
+
+
+class AppUsersQuerySet(models.QuerySet):
+    def with_metrics(self, today=None):
+        """
+        Annotate ``age`` and ``bmi`` in SQL. The annotations land on each instance
+        and pre-fill the cached properties, so listings never compute them per row.
+        """
+        today = today or timezone.localdate()
+        birthday_ahead = Q(date_of_birth__month__gt=today.month) | Q(date_of_birth__month=today.month,
+                                                                     date_of_birth__day__gt=today.day)
+        return self.annotate(
+            age=ExpressionWrapper(
+                Value(today.year) - ExtractYear('date_of_birth')
+                - Case(When(birthday_ahead, then=Value(1)), default=Value(0)),
+                output_field=IntegerField(),
+            ),
+            bmi=Case(
+                When(height__gt=0, then=F('weight') / ((F('height') / 100.0) * (F('height') / 100.0))),
+                default=None,
+                output_field=FloatField(),
+            ),
+        )
+
+
+class AppUsersManager(UserManager.from_queryset(AppUsersQuerySet)):
+    pass
+
+
 class AppUsers(AbstractUser):
     class Role(models.TextChoices):
         ADMIN = 'ADMIN', 'Super Admin'       # User of the Project
@@ -29,7 +79,7 @@ class AppUsers(AbstractUser):
     lastName = models.CharField(default="",max_length=50)
     gender = models.CharField(max_length=1, choices=Gender.choices, default=Gender.MALE)
     country = models.CharField(default="India",max_length=50)
-    age = models.IntegerField(null=True, blank=True)
+    date_of_birth = models.DateField(null=True, blank=True)  # age is derived, see AppUsers.age
     height = models.FloatField(help_text="Height in cm", null=True, blank=True)
     weight = models.FloatField(help_text="Current weight in kg", null=True, blank=True)
     activityLevel = models.CharField(max_length=20, choices=ActivityLevels.choices, default=ActivityLevels.MODERATE)
@@ -39,18 +89,32 @@ class AppUsers(AbstractUser):
     protocol = models.CharField(default="Generate",max_length=50)
     # injuryistory = models.TextField(blank=True, help_text="Context for AI to avoid dangerous exercises")
 
+    objects = AppUsersManager()
+
+    # Derived metrics computed once per instance, or preset by AppUsers.objects.with_metrics()
+    DERIVED_METRICS = ('age', 'bmi')
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Exact-email lookups (admin search, support); username already has its unique index
+            models.Index(fields=['email'], name='appusers_email_idx'),
+        ]
+
     def __str__(self):
         return self.username
 
-    @property
+    @cached_property
     def age(self):
-        if self.date_of_birth:
-            today = timezone.now().date()
-            return today.year - self.date_of_birth.year - (
-                (today.month, today.day) < (self.date_of_birth.month, self.date_of_birth.day)
-            )
-        return None
+        return age_on(self.date_of_birth)
+
+    @cached_property
+    def bmi(self):
+        return bmi_of(self.weight, self.height)
+
     def save(self, *args, **kwargs):
+        # Inputs may have changed; recompute the derived metrics on next access
+        for name in self.DERIVED_METRICS:
+            self.__dict__.pop(name, None)
         # AUTOMATION: If role is ADMIN, give them Django Admin access automatically
         if self.role == self.Role.ADMIN:
             self.is_staff = True
@@ -60,6 +124,14 @@ class AppUsers(AbstractUser):
             self.is_staff = False
             self.is_superuser = False
         super().save(*args, **kwargs)
+        # Cached profile snapshots are stale now (see services/profileCache.py)
+        profileCache.invalidate(self.pk)
+
+    def delete(self, *args, **kwargs):
+        user_id = self.pk
+        result = super().delete(*args, **kwargs)
+        profileCache.invalidate(user_id)
+        return result
     groups = models.ManyToManyField(
         Group,
         related_name='appuser_set',  # Unique name to avoid clash
@@ -76,88 +148,147 @@ class AppUsers(AbstractUser):
     )
 
 # --- 2. RPG STATS (The "Gamification" Layer) ---
-# class UserRPGStats(models.Model):
-#     """
-#     Tracks the 'RPG' attributes of the user. 
-#     These are calculated by the AI based on workout logs.
-#     Range: 0-100 (Leveling system).
-#     """
-#     user = models.OneToOneField(AppUsers, on_delete=models.CASCADE, related_name="rpg_stats")
+class UserRPGStats(models.Model):
+    """
+    Tracks the 'RPG' attributes of the user. 
+    These are calculated from workout/sleep logs (see services/rpgScoring.py).
+    Range: 0-100 (Leveling system).
+    """
+    user = models.OneToOneField(AppUsers, on_delete=models.CASCADE, related_name="rpg_stats")
     
-#     # Core Attributes
-#     strength_score = models.IntegerField(default=0, validators=[MinValueValidator(0), MaxValueValidator(100)])
-#     endurance_score = models.IntegerField(default=0, validators=[MinValueValidator(0), MaxValueValidator(100)])
-#     flexibility_score = models.IntegerField(default=0, validators=[MinValueValidator(0), MaxValueValidator(100)])
-#     recovery_score = models.IntegerField(default=0, help_text="Based on sleep/rest consistency", validators=[MinValueValidator(0), MaxValueValidator(100)])
+    # Core Attributes
+    strength_score = models.IntegerField(default=0, validators=[MinValueValidator(0), MaxValueValidator(100)])
+    endurance_score = models.IntegerField(default=0, validators=[MinValueValidator(0), MaxValueValidator(100)])
+    flexibility_score = models.IntegerField(default=0, validators=[MinValueValidator(0), MaxValueValidator(100)])
+    recovery_score = models.IntegerField(default=0, help_text="Based on sleep/rest consistency", validators=[MinValueValidator(0), MaxValueValidator(100)])
     
-#     # Consistency Logic
-#     consistency_streak = models.IntegerField(default=0, help_text="Current daily streak")
-#     total_workouts = models.IntegerField(default=0)
+    # Consistency Logic
+    consistency_streak = models.IntegerField(default=0, help_text="Current daily streak")
+    total_workouts = models.IntegerField(default=0)
+    last_workout_date = models.DateField(null=True, blank=True)
     
-#     last_updated = models.DateTimeField(auto_now=True)
+    last_updated = models.DateTimeField(auto_now=True)
 
-#     def __str__(self):
-#         return f"{self.user.username} Stats (Str: {self.strength_score})"
+    def __str__(self):
+        return f"{self.user.username} Stats (Str: {self.strength_score})"
 
 
-# # --- 3. BODY PART ANATOMY (The "Heatmap" Data) ---
-# class BodyPartMetrics(models.Model):
-#     """
-#     Granular strength tracking for specific muscle groups.
-#     Used to generate the 'Body Heatmap' in the UI.
-#     """
-#     user = models.OneToOneField(AppUsers, on_delete=models.CASCADE, related_name="body_metrics")
+# --- 3. BODY PART ANATOMY (The "Heatmap" Data) ---
+class BodyPartMetrics(models.Model):
+    """
+    Granular strength tracking for specific muscle groups.
+    Used to generate the 'Body Heatmap' in the UI.
+    """
+    user = models.OneToOneField(AppUsers, on_delete=models.CASCADE, related_name="body_metrics")
     
-#     # Upper Body
-#     chest_level = models.FloatField(default=0.0, help_text="Calculated from Bench/Pushups")
-#     back_level = models.FloatField(default=0.0, help_text="Calculated from Pullups/Rows")
-#     arms_level = models.FloatField(default=0.0)
-#     shoulders_level = models.FloatField(default=0.0)
+    # Upper Body
+    chest_level = models.FloatField(default=0.0, help_text="Calculated from Bench/Pushups")
+    back_level = models.FloatField(default=0.0, help_text="Calculated from Pullups/Rows")
+    arms_level = models.FloatField(default=0.0)
+    shoulders_level = models.FloatField(default=0.0)
     
-#     # Lower Body
-#     quads_level = models.FloatField(default=0.0, help_text="Calculated from Squats")
-#     hamstrings_level = models.FloatField(default=0.0, help_text="Calculated from Deadlifts")
-#     calves_level = models.FloatField(default=0.0)
-#     glutes_level = models.FloatField(default=0.0)
+    # Lower Body
+    quads_level = models.FloatField(default=0.0, help_text="Calculated from Squats")
+    hamstrings_level = models.FloatField(default=0.0, help_text="Calculated from Deadlifts")
+    calves_level = models.FloatField(default=0.0)
+    glutes_level = models.FloatField(default=0.0)
     
-#     # Core
-#     core_strength = models.FloatField(default=0.0)
+    # Core
+    core_strength = models.FloatField(default=0.0)
 
-#     updated_at = models.DateTimeField(auto_now=True)
+    # Running totals the levels are derived from, so one session can be added without a rescan
+    raw_totals = models.JSONField(default=dict, blank=True)
 
-#     def __str__(self):
-#         return f"{self.user.username} Body Metrics"
+    updated_at = models.DateTimeField(auto_now=True)
 
+    def __str__(self):
+        return f"{self.user.username} Body Metrics"
+
+
+# --- 4. NUTRITION TARGETS (Derived from the profile) ---
+class NutritionTargets(models.Model):
+    """
+    Daily calorie, macro and water goals computed from the profile (see services/nutritionTargets.py).
+    Only recomputed when an input changes; ``inputs_hash`` identifies the inputs they were built from.
+    """
+    user = models.OneToOneField(AppUsers, on_delete=models.CASCADE, primary_key=True, related_name="nutrition_targets")
+
+    bmr_kcal = models.PositiveIntegerField()
+    tdee_kcal = models.PositiveIntegerField()
+    target_kcal = models.PositiveIntegerField()
+    protein_g = models.PositiveIntegerField()
+    carbs_g = models.PositiveIntegerField()
+    fat_g = models.PositiveIntegerField()
+    water_ml = models.PositiveIntegerField()
+
+    assumed = models.JSONField(default=list, blank=True, help_text="Profile inputs that were missing and defaulted")
+    inputs_hash = models.CharField(max_length=32)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'nutrition_targets'
+
+    def __str__(self):
+        return f"{self.user_id} Targets ({self.target_kcal} kcal)"
+
+
+# --- 5. ARCHIVED TOTALS (Carry-over for cumulative stats) ---
+class ArchivedTotals(models.Model):
+    """
+    What the user's archived log rows contributed to cumulative stats. Folded in by
+    services/logArchive.py just before the rows are deleted; rpgScoring and
+    achievements add it back, so archiving never lowers a level or a count.
+    """
+    user = models.OneToOneField(AppUsers, on_delete=models.CASCADE, primary_key=True, related_name="archived_totals")
 
-# # --- 4. ACHIEVEMENTS (Badges) ---
-# class Achievement(models.Model):
-#     """
-#     Stores all possible achievements in the system.
-#     """
-#     class Category(models.TextChoices):
-#         STRENGTH = 'strength', 'Strength'
-#         CONSISTENCY = 'consistency', 'Consistency'
-#         ENDURANCE = 'endurance', 'Endurance'
+    # Same shape as BodyPartMetrics.raw_totals
+    volume = models.JSONField(default=dict, blank=True)  # kg per muscle group
+    cardio_seconds = models.FloatField(default=0.0)
+    flexibility_seconds = models.FloatField(default=0.0)
+
+    completed_workouts = models.IntegerField(default=0)
+    diet_logs = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'archived_totals'
+
+    def __str__(self):
+        return f"{self.user_id} Archived Totals ({self.completed_workouts} workouts)"
+
+
+# --- 6. ACHIEVEMENTS (Badges) ---
+class Achievement(models.Model):
+    """
+    Stores all possible achievements in the system.
+    condition_logic example (see services/achievements.py):
+        {"all": [{"metric": "water_today_ml", "op": ">=", "value": 3000}]}
+    """
+    class Category(models.TextChoices):
+        STRENGTH = 'strength', 'Strength'
+        CONSISTENCY = 'consistency', 'Consistency'
+        ENDURANCE = 'endurance', 'Endurance'
     
-#     name = models.CharField(max_length=100)
-#     description = models.TextField()
-#     category = models.CharField(max_length=20, choices=Category.choices)
-#     icon_url = models.URLField(blank=True, null=True) # Link to S3 or static image
-#     condition_logic = models.JSONField(help_text="JSON rule for AI to check if unlocked") 
+    name = models.CharField(max_length=100)
+    description = models.TextField()
+    category = models.CharField(max_length=20, choices=Category.choices)
+    icon_url = models.URLField(blank=True, null=True) # Link to S3 or static image
+    condition_logic = models.JSONField(help_text="JSON rule checked when a matching log event arrives") 
     
-#     def __str__(self):
-#         return self.name
-
-# class UserAchievement(models.Model):
-#     """
-#     Link table: Which user unlocked which achievement and when.
-#     """
-#     user = models.ForeignKey(AppUsers, on_delete=models.CASCADE, related_name="achievements")
-#     achievement = models.ForeignKey(Achievement, on_delete=models.CASCADE)
-#     unlocked_at = models.DateTimeField(auto_now_add=True)
+    def __str__(self):
+        return self.name
+
+class UserAchievement(models.Model):
+    """
+    Link table: Which user unlocked which achievement and when.
+    """
+    user = models.ForeignKey(AppUsers, on_delete=models.CASCADE, related_name="achievements")
+    achievement = models.ForeignKey(Achievement, on_delete=models.CASCADE)
+    unlocked_at = models.DateTimeField(auto_now_add=True)
     
-#     class Meta:
-#         unique_together = ('user', 'achievement') # Prevent duplicate badges
+    class Meta:
+        unique_together = ('user', 'achievement') # Prevent duplicate badges
 
-#     def __str__(self):
-#         return f"{self.user.username} - {self.achievement.name}"
\ No newline at end of file
+    def __str__(self):
+        return f"{self.user.username} - {self.achievement.name}"
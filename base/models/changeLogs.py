@@ -0,0 +1,46 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ChangeLog(models.Model):
+    """
+    Latest change per synced row, for the sync-delta API (see services/changeFeed.py).
+    One entry per (user, table, row): a new change moves the row to the head of the
+    user's feed instead of appending, so a feed page is proportional to what changed.
+    """
+
+    OP_CHOICES = [
+        ('u', 'Upsert'),
+        ('d', 'Delete'),
+    ]
+
+    # Plain column, not a FK: entries are written while a user's rows cascade-delete
+    user_id = models.UUIDField()
+    seq = models.BigIntegerField()  # per-user, monotonically increasing
+
+    table = models.CharField(max_length=30)
+    row_id = models.CharField(max_length=64)
+    op = models.CharField(max_length=1, choices=OP_CHOICES, default='u')
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'change_log'
+        constraints = [
+            models.UniqueConstraint(fields=['user_id', 'table', 'row_id'], name='change_log_row_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['user_id', 'seq'], name='change_log_cursor_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} #{self.seq} {self.op} {self.table}:{self.row_id}"
+
+
+class SyncCounter(models.Model):
+    """Per-user change sequence; the row lock taken by each increment keeps a user's seqs in commit order."""
+
+    user_id = models.UUIDField(primary_key=True)
+    last_seq = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'sync_counters'
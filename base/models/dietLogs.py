@@ -3,7 +3,8 @@ from .appUsers import AppUsers
 from django.utils import timezone
 
 class DietLog(models.Model):
-    user = models.ForeignKey(AppUsers, on_delete=models.CASCADE, related_name='diet_logs')
+    # db_index=False: the (user, date) index below already serves user_id lookups
+    user = models.ForeignKey(AppUsers, on_delete=models.CASCADE, related_name='diet_logs', db_index=False)
     date = models.DateField(default=timezone.now)
     
     # Food Details
@@ -20,6 +21,17 @@ class DietLog(models.Model):
     period = models.CharField(max_length=2)  # "AM" or "PM"
 
     timestamp = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)  # moves on edits too (history validators)
+
+    class Meta:
+        indexes = [
+            # Daily macro totals / history and its validators read straight from the index (INCLUDE is Postgres-only)
+            models.Index(
+                fields=['user', 'date'],
+                include=['calories', 'protein_g', 'carbs_g', 'fat_g', 'updated_at'],
+                name='dietlog_user_date_macros_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.title} ({self.calories} kcal)"
\ No newline at end of file
@@ -1,15 +1,63 @@
-# from django.db import models
+from django.db import models
+from django.core.validators import MinValueValidator, MaxValueValidator
+from .appUsers import AppUsers
+import uuid
 
 
-# class ExerciseLibrary(models.Model):
-#     """
-#     Static database of exercises for the AI to choose from.
-#     """
-#     name = models.CharField(max_length=255, unique=True)
-#     muscle_group = models.CharField(max_length=100)
-#     equipment_required = models.CharField(max_length=100, blank=True)
-#     # AI instruction field
-#     form_cues = models.TextField(help_text="Text for AI to speak during vision correction")
+class Exercise(models.Model):
+    """Exercise library - templates for all exercises"""
 
-#     def __str__(self):
-#         return self.name
\ No newline at end of file
+    CATEGORY_CHOICES = [
+        ('strength', 'Strength Training'),
+        ('cardio', 'Cardio'),
+        ('flexibility', 'Flexibility'),
+        ('balance', 'Balance'),
+        ('sports', 'Sports'),
+    ]
+
+    MUSCLE_GROUP_CHOICES = [
+        ('chest', 'Chest'),
+        ('back', 'Back'),
+        ('shoulders', 'Shoulders'),
+        ('arms', 'Arms'),
+        ('core', 'Core'),
+        ('legs', 'Legs'),
+        ('full_body', 'Full Body'),
+        ('cardio', 'Cardio'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=200)
+    category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
+    muscle_group = models.CharField(max_length=20, choices=MUSCLE_GROUP_CHOICES)
+
+    description = models.TextField(blank=True)
+    instructions = models.TextField(blank=True)
+
+    # Metadata
+    difficulty_level = models.IntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(5)],
+        default=3
+    )
+    equipment_required = models.CharField(max_length=200, blank=True)
+    is_compound = models.BooleanField(default=False)
+
+    # Computer Vision Support
+    supports_form_tracking = models.BooleanField(default=False)
+    supports_rep_counting = models.BooleanField(default=False)
+
+    # System
+    is_custom = models.BooleanField(default=False)
+    created_by = models.ForeignKey(AppUsers, on_delete=models.SET_NULL, null=True, blank=True, related_name='created_exercises')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'exercises'
+        ordering = ['name']
+        indexes = [
+            models.Index(fields=['category', 'muscle_group']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.get_category_display()})"
@@ -0,0 +1,41 @@
+from django.core.validators import MinValueValidator
+from django.db import models
+
+
+class Food(models.Model):
+    """Nutrition database: macros per serving (bundled dataset: base/data/foods.csv)"""
+
+    SOURCE_CHOICES = [
+        ('bundled', 'Bundled dataset'),
+        ('custom', 'Added by an admin'),
+    ]
+
+    code = models.SlugField(max_length=64, unique=True)
+    name = models.CharField(max_length=200)
+    aliases = models.JSONField(default=list, blank=True)  # other names users type, e.g. ["eggs", "fried egg"]
+
+    # One serving, e.g. 0.5 "cup" = 40 g
+    # Meal resolution divides by these, so a serving can't be empty
+    serving_qty = models.FloatField(default=1, validators=[MinValueValidator(0.01)])
+    serving_unit = models.CharField(max_length=20, default='serving')
+    serving_g = models.FloatField(validators=[MinValueValidator(0.01)])
+
+    # Per serving
+    kcal = models.FloatField()
+    protein_g = models.FloatField(default=0)
+    carbs_g = models.FloatField(default=0)
+    fat_g = models.FloatField(default=0)
+
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES, default='custom')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'foods'
+        ordering = ['name']
+
+    @property
+    def serving(self):
+        return f"{self.serving_qty:g} {self.serving_unit} ({self.serving_g:g} g)"
+
+    def __str__(self):
+        return f"{self.name} - {self.kcal:g} kcal / {self.serving}"
@@ -1,21 +1,26 @@
-# from django.db import models
-# from .habits import Habit
-# from django.utils import timezone
-# from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db import models
+from .habits import Habit
+from django.utils import timezone
+import uuid
 
 
-# class HabitLog(models.Model):
-#     """
-#     Daily tracking of habits.
-#     """
-#     habit = models.ForeignKey(Habit, on_delete=models.CASCADE, related_name='logs')
-#     date = models.DateField(default=timezone.now)
-#     status = models.BooleanField(default=False)
-#     mood_rating = models.IntegerField(
-#         validators=[MinValueValidator(1), MaxValueValidator(10)],
-#         null=True, blank=True,
-#         help_text="User's subjective feeling, useful for AI context"
-#     )
+class HabitLog(models.Model):
+    """Daily habit completion tracking"""
 
-#     class Meta:
-#         unique_together = ('habit', 'date')
\ No newline at end of file
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    habit = models.ForeignKey(Habit, on_delete=models.CASCADE, related_name='logs')
+
+    date = models.DateField(default=timezone.now)
+    completed = models.BooleanField(default=False)
+    notes = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'habit_logs'
+        ordering = ['-date']
+        unique_together = ['habit', 'date']
+
+    def __str__(self):
+        status = "✓" if self.completed else "✗"
+        return f"{self.habit.name} - {self.date} {status}"
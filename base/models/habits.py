@@ -1,16 +1,57 @@
-# from django.db import models
-# from .appUsers import User
-
-# class Habit(models.Model):
-#     """
-#     Defines the habit itself (e.g., 'Cold Plunge', 'Read 10 pages').
-#     """
-#     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='habits')
-#     name = models.CharField(max_length=255)
-#     description = models.TextField(blank=True)
-#     frequency = models.CharField(max_length=50, default="Daily")
-#     target_time = models.TimeField(null=True, blank=True, help_text="Time for reminder")
-#     is_active = models.BooleanField(default=True)
-
-#     def __str__(self):
-#         return self.name
\ No newline at end of file
+from django.db import models
+from .appUsers import AppUsers
+from django.utils import timezone
+import uuid
+
+
+class Habit(models.Model):
+    """User-defined habits to track"""
+
+    FREQUENCY_CHOICES = [
+        ('daily', 'Daily'),
+        ('weekly', 'Weekly'),
+        ('custom', 'Custom Days'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(AppUsers, on_delete=models.CASCADE, related_name='habits')
+
+    name = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES, default='daily')
+
+    # Custom frequency (for 'custom' type)
+    target_days_per_week = models.IntegerField(null=True, blank=True)
+
+    # Metadata
+    icon = models.CharField(max_length=50, blank=True)
+    color = models.CharField(max_length=7, default='#3B82F6')  # Hex color
+
+    # Streak counters, maintained incrementally as logs arrive (see services/habitStreaks.py)
+    current_streak = models.PositiveIntegerField(default=0)
+    longest_streak = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    last_completed_date = models.DateField(null=True, blank=True)
+
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'habits'
+        ordering = ['name']
+
+    def __str__(self):
+        return f"{self.user.username} - {self.name}"
+
+    def live_streak(self, today=None):
+        """Current streak as of today; a streak not extended yesterday or today is broken."""
+        today = today or timezone.localdate()
+        if self.last_completed_date and (today - self.last_completed_date).days <= 1:
+            return self.current_streak
+        return 0
+
+    def completion_rate(self, today=None):
+        """Completed days / days since the habit was created."""
+        today = today or timezone.localdate()
+        tracked_days = (today - timezone.localdate(self.created_at)).days + 1
+        return round(self.completed_count / max(tracked_days, 1), 4)
@@ -0,0 +1,38 @@
+from django.db import models
+from .appUsers import AppUsers
+import uuid
+
+
+class Reminder(models.Model):
+    """User reminders (water, workout, habits, etc.)"""
+
+    TYPE_CHOICES = [
+        ('water', 'Water Reminder'),
+        ('workout', 'Workout Reminder'),
+        ('habit', 'Habit Reminder'),
+        ('sleep', 'Sleep Reminder'),
+        ('custom', 'Custom Reminder'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(AppUsers, on_delete=models.CASCADE, related_name='reminders')
+
+    type = models.CharField(max_length=20, choices=TYPE_CHOICES)
+    title = models.CharField(max_length=200)
+    message = models.TextField(blank=True)
+
+    time = models.TimeField()
+    days_of_week = models.JSONField(default=list)  # [0-6] for Mon-Sun, empty = every day
+
+    is_active = models.BooleanField(default=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Lets the scheduler pick up edits incrementally instead of reloading the table
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        db_table = 'reminders'
+        ordering = ['time']
+
+    def __str__(self):
+        return f"{self.user.username} - {self.title} @ {self.time}"
@@ -1,19 +1,54 @@
-# from django.db import models
-# from .appUsers import User
-# from django.utils import timezone
-# from django.core.validators import MinValueValidator, MaxValueValidator
-
-
-# class SleepLog(models.Model):
-#     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sleep_logs')
-#     date = models.DateField(default=timezone.now)
-#     total_hours = models.DecimalField(max_digits=4, decimal_places=2)
-#     deep_sleep_hours = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
-#     rem_sleep_hours = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
-#     recovery_score = models.IntegerField(
-#         validators=[MinValueValidator(0), MaxValueValidator(100)],
-#         help_text="AI-calculated score based on quality"
-#     )
-
-#     class Meta:
-#         unique_together = ('user', 'date')
\ No newline at end of file
+from django.db import models
+from .appUsers import AppUsers
+import uuid
+
+
+def sleep_duration_hours(bedtime, wake_time):
+    """Hours between bedtime and wake time, rounded like the stored column."""
+    delta = wake_time - bedtime
+    return round(delta.total_seconds() / 3600, 2)
+
+
+class SleepLog(models.Model):
+    """Daily sleep tracking"""
+
+    QUALITY_CHOICES = [
+        (1, 'Very Poor'),
+        (2, 'Poor'),
+        (3, 'Fair'),
+        (4, 'Good'),
+        (5, 'Excellent'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(AppUsers, on_delete=models.CASCADE, related_name='sleep_logs')
+
+    date = models.DateField()  # Date of waking up
+    bedtime = models.DateTimeField()
+    wake_time = models.DateTimeField()
+
+    # Calculated
+    duration_hours = models.DecimalField(max_digits=4, decimal_places=2)
+
+    # Quality Metrics
+    quality_rating = models.IntegerField(choices=QUALITY_CHOICES, null=True, blank=True)
+    interruptions = models.IntegerField(default=0)
+    deep_sleep_hours = models.DecimalField(max_digits=3, decimal_places=1, null=True, blank=True)
+    rem_sleep_hours = models.DecimalField(max_digits=3, decimal_places=1, null=True, blank=True)
+
+    notes = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'sleep_logs'
+        ordering = ['-date']
+        unique_together = ['user', 'date']
+
+    def __str__(self):
+        return f"{self.user.username} - {self.date} ({self.duration_hours}h)"
+
+    def save(self, *args, **kwargs):
+        # Auto-calculate duration (bulk ingest computes it per batch instead)
+        if self.bedtime and self.wake_time:
+            self.duration_hours = sleep_duration_hours(self.bedtime, self.wake_time)
+        super().save(*args, **kwargs)
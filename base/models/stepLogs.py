@@ -1,13 +1,31 @@
-# from django.db import models
-# from .appUsers import User
-# from django.utils import timezone
-
-# class StepLog(models.Model):
-#     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='step_logs')
-#     date = models.DateField(default=timezone.now)
-#     steps_count = models.PositiveIntegerField(default=0)
-#     calories_burned = models.PositiveIntegerField(default=0)
-#     distanceKm = models.DecimalField(max_digits=5, decimal_places=2, default=0.0)
-#     timeTaken = models.IntegerField(default=0)
-#     class Meta:
-#         unique_together = ('user', 'date')
\ No newline at end of file
+from django.db import models
+from .appUsers import AppUsers
+from django.utils import timezone
+import uuid
+
+
+class StepLog(models.Model):
+    """Daily step count tracking"""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(AppUsers, on_delete=models.CASCADE, related_name='step_logs')
+
+    date = models.DateField(default=timezone.now)
+    step_count = models.IntegerField(default=0)
+    distance_km = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)
+    active_minutes = models.IntegerField(null=True, blank=True)
+    calories_burned = models.IntegerField(null=True, blank=True)
+
+    # Source tracking
+    source = models.CharField(max_length=50, default='manual')  # manual, fitbit, apple_health, etc.
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'step_logs'
+        ordering = ['-date']
+        unique_together = ['user', 'date']
+
+    def __str__(self):
+        return f"{self.user.username} - {self.step_count} steps on {self.date}"
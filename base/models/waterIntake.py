@@ -3,13 +3,25 @@ from .appUsers import AppUsers
 from django.utils import timezone
 
 class WaterIntake(models.Model):
-    user = models.ForeignKey(AppUsers, on_delete=models.CASCADE, related_name='water_logs')
+    # db_index=False: unique (user, date) already serves user_id lookups
+    user = models.ForeignKey(AppUsers, on_delete=models.CASCADE, related_name='water_logs', db_index=False)
     date = models.DateField(default=timezone.now)
     current_intake_ml = models.PositiveIntegerField(default=0)
     daily_goal_ml = models.PositiveIntegerField(default=3000)
     
-    # Timestamp of last sip for "Reminder Time" logic
+    # Any change to the row (history ETags, sync feed), including a new goal
     last_updated = models.DateTimeField(auto_now=True)
+    # Timestamp of last sip for "Reminder Time" logic; only logging intake moves it
+    last_intake_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
-        unique_together = ('user', 'date')
\ No newline at end of file
+        unique_together = ('user', 'date')
+        indexes = [
+            # Serves the "behind pace" reminder sweep: date = today AND last_intake_at < cutoff.
+            # Partial: users who already hit their goal never need a reminder.
+            models.Index(
+                fields=['date', 'last_intake_at'],
+                name='water_behind_goal_idx',
+                condition=models.Q(current_intake_ml__lt=models.F('daily_goal_ml')),
+            ),
+        ]
\ No newline at end of file
@@ -0,0 +1,27 @@
+from django.db import models
+from .appUsers import AppUsers
+from django.utils import timezone
+import uuid
+
+
+class WaterIntakeLog(models.Model):
+    """Individual water intake entries (WaterIntake holds the daily total)"""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # related_name differs from Models.py: 'water_logs' is taken by WaterIntake
+    user = models.ForeignKey(AppUsers, on_delete=models.CASCADE, related_name='water_intake_logs', db_index=False)
+
+    date = models.DateField(default=timezone.now)
+    timestamp = models.DateTimeField(auto_now_add=True)
+
+    amount_ml = models.IntegerField()
+
+    class Meta:
+        db_table = 'water_intake_logs'
+        ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['user', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.amount_ml}ml on {self.date}"
@@ -0,0 +1,32 @@
+from django.db import models
+from .workoutSessions import Workout
+from .exerciseLibrary import Exercise
+import uuid
+
+
+class WorkoutExercise(models.Model):
+    """Exercises within a workout session"""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    workout = models.ForeignKey(Workout, on_delete=models.CASCADE, related_name='exercises')
+    exercise = models.ForeignKey(Exercise, on_delete=models.PROTECT)
+
+    order = models.IntegerField(default=0)  # Order in the workout
+
+    # Planned vs Actual
+    target_sets = models.IntegerField(default=3)
+    target_reps = models.IntegerField(null=True, blank=True)
+    target_duration_seconds = models.IntegerField(null=True, blank=True)  # For timed exercises
+    target_weight_kg = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)
+
+    completed_sets = models.IntegerField(default=0)
+
+    notes = models.TextField(blank=True)
+
+    class Meta:
+        db_table = 'workout_exercises'
+        ordering = ['order']
+        unique_together = ['workout', 'order']
+
+    def __str__(self):
+        return f"{self.workout.title} - {self.exercise.name}"
@@ -1,19 +1,73 @@
-# from django.db import models
-# from .appUsers import User
-
-# class WorkoutSession(models.Model):
-#     """
-#     Represents a single gym session.
-#     """
-#     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='workouts')
-#     start_time = models.DateTimeField(auto_now_add=True)
-#     end_time = models.DateTimeField(null=True, blank=True)
-#     name = models.CharField(max_length=255, default="Custom Workout")
-    
-#     # AI Feedback Loop
-#     ai_generated_plan = models.BooleanField(default=False, help_text="Was this suggested by ReactFit AI?")
-#     difficulty_rating = models.IntegerField(null=True, blank=True, help_text="RPE (1-10) for the whole session")
-#     notes = models.TextField(blank=True)
-
-#     def __str__(self):
-#         return f"{self.name} - {self.start_time.date()}"
+from django.db import models
+from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
+from .appUsers import AppUsers
+import uuid
+
+
+class Workout(models.Model):
+    """Individual workout session"""
+
+    STATUS_CHOICES = [
+        ('planned', 'Planned'),
+        ('in_progress', 'In Progress'),
+        ('completed', 'Completed'),
+        ('skipped', 'Skipped'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(AppUsers, on_delete=models.CASCADE, related_name='workouts')
+
+    title = models.CharField(max_length=200, blank=True)
+    date = models.DateField(default=timezone.now)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='planned')
+
+    # Timing
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    duration_minutes = models.IntegerField(null=True, blank=True)
+
+    # Metadata
+    notes = models.TextField(blank=True)
+    ai_generated = models.BooleanField(default=False)
+    ai_prompt = models.TextField(blank=True)  # Store the prompt if AI-generated
+
+    # Analytics
+    total_volume_kg = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    estimated_calories_burned = models.IntegerField(null=True, blank=True)
+
+    # Ratings (1-5 scale)
+    difficulty_rating = models.IntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(5)],
+        null=True, blank=True
+    )
+    energy_level_before = models.IntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(5)],
+        null=True, blank=True
+    )
+    energy_level_after = models.IntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(5)],
+        null=True, blank=True
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'workouts'
+        ordering = ['-date', '-created_at']
+        indexes = [
+            models.Index(fields=['user', 'date']),
+            models.Index(fields=['user', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.title or 'Workout'} ({self.date})"
+
+    def calculate_duration(self):
+        """Calculate workout duration from start/end times"""
+        if self.started_at and self.completed_at:
+            delta = self.completed_at - self.started_at
+            self.duration_minutes = int(delta.total_seconds() / 60)
+            return self.duration_minutes
+        return None
@@ -1,29 +1,43 @@
-# from django.db import models
-# from .workoutSessions import WorkoutSession
-# from .exerciseLibrary import ExerciseLibrary
-# from django.core.validators import MinValueValidator, MaxValueValidator
-
-
-# class WorkoutSet(models.Model):
-#     """
-#     Granular data for every set performed.
-#     CRITICAL for 'Vision Form Tracker' integration.
-#     """
-#     session = models.ForeignKey(WorkoutSession, on_delete=models.CASCADE, related_name='sets')
-#     exercise = models.ForeignKey(ExerciseLibrary, on_delete=models.PROTECT)
-#     setOrder = models.PositiveIntegerField()
-    
-#     weight_kg = models.DecimalField(max_digits=5, decimal_places=2)
-#     reps = models.PositiveIntegerField()
-#     rpe = models.PositiveIntegerField(validators=[MinValueValidator(1), MaxValueValidator(10)], null=True)
-    
-#     # VISION CV INTEGRATION
-#     # vision_form_score = models.IntegerField(
-#     #     null=True, blank=True,
-#     #     validators=[MinValueValidator(0), MaxValueValidator(100)],
-#     #     help_text="Score (0-100) generated by the Computer Vision module"
-#     # )
-#     # vision_feedback = models.TextField(blank=True, help_text="Specific form errors detected by CV (e.g., 'Knees caving in')")
-
-#     class Meta:
-#         ordering = ['setOrder']
+from django.db import models
+from .workoutExercises import WorkoutExercise
+import uuid
+
+
+class ExerciseSet(models.Model):
+    """Individual sets within a workout exercise"""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    workout_exercise = models.ForeignKey(WorkoutExercise, on_delete=models.CASCADE, related_name='sets')
+
+    set_number = models.IntegerField()
+    reps = models.IntegerField(null=True, blank=True)
+    weight_kg = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)
+    duration_seconds = models.IntegerField(null=True, blank=True)
+    distance_meters = models.DecimalField(max_digits=8, decimal_places=2, null=True, blank=True)
+
+    # Computer Vision Data
+    form_score = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)  # 0-100
+    cv_rep_count = models.IntegerField(null=True, blank=True)
+    cv_analyzed = models.BooleanField(default=False)
+
+    # Metadata
+    rest_seconds = models.IntegerField(null=True, blank=True)
+    completed = models.BooleanField(default=True)
+    notes = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'exercise_sets'
+        ordering = ['set_number']
+        unique_together = ['workout_exercise', 'set_number']
+
+    def __str__(self):
+        return f"Set {self.set_number}: {self.reps} reps @ {self.weight_kg}kg"
+
+    @property
+    def volume(self):
+        """Calculate volume (reps × weight)"""
+        if self.reps and self.weight_kg:
+            return float(self.reps) * float(self.weight_kg)
+        return 0
@@ -0,0 +1,18 @@
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from .renderers import ORJSONRenderer
+
+
+class ORJSONParser(BaseParser):
+    """JSON request bodies via orjson (UTF-8 only, as orjson requires)."""
+
+    media_type = 'application/json'
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read() if stream is not None else b'')
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
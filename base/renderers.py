@@ -0,0 +1,73 @@
+"""
+orjson-based JSON for DRF and plain Django views.
+
+orjson natively encodes str/int/float/bool/None, dict/list, datetime, date,
+time, UUID, dataclasses and numpy arrays; ``_default`` covers the rest of
+what DRF's encoder accepts (Decimal, lazy strings, querysets, timedelta...).
+Output matches DRF's compact style except datetimes keep their microseconds.
+
+Hot views can skip encoding entirely by handing pre-encoded bytes to
+``Response``/``ORJSONResponse``; they are sent unchanged.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import orjson
+from django.http import HttpResponse
+from django.utils.functional import Promise
+from rest_framework.renderers import BaseRenderer
+
+OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, Promise):
+        return str(obj)
+    if isinstance(obj, timedelta):
+        return str(obj.total_seconds())
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return bytes(obj).decode()
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    if hasattr(obj, '__getitem__') and hasattr(obj, 'keys'):
+        return dict(obj)
+    if hasattr(obj, '__iter__'):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(data, sort_keys=False):
+    return orjson.dumps(data, default=_default, option=OPTIONS | (orjson.OPT_SORT_KEYS if sort_keys else 0))
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, (bytes, memoryview)):
+            return bytes(data)  # pre-encoded by the view
+        indent = (renderer_context or {}).get('indent')
+        if indent:
+            return orjson.dumps(data, default=_default, option=OPTIONS | orjson.OPT_INDENT_2)
+        return dumps(data)
+
+
+class ORJSONResponse(HttpResponse):
+    """Drop-in for ``JsonResponse`` (same ``safe`` rule) that also accepts pre-encoded bytes."""
+
+    def __init__(self, data, safe=True, **kwargs):
+        if isinstance(data, (bytes, memoryview)):
+            content = bytes(data)
+        else:
+            if safe and not isinstance(data, dict):
+                raise TypeError("In order to allow non-dict objects to be serialized set the safe parameter to False.")
+            content = dumps(data)
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=content, **kwargs)
@@ -0,0 +1,6 @@
+from django.urls import path
+from . import consumers
+
+websocket_urlpatterns = [
+    path("ws/v1/stream/", consumers.UserStreamConsumer.as_asgi()),
+]
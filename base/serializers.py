@@ -16,10 +16,14 @@ class RegisterSerializer(serializers.ModelSerializer):
             
             # --- Your Custom Profile Fields ---
             'firstName', 'lastName', 'role',
-            'height', 'weight', 'age',
+            'height', 'weight', 'date_of_birth',
             'gender', 'country', 'activityLevel',
-            'primaryGoal', 'protocol'
+            'primaryGoal', 'protocol',
+
+            # --- Derived (computed from date_of_birth / height / weight) ---
+            'age', 'bmi'
         ]
+        read_only_fields = ['age', 'bmi']
 
     def create(self, validated_data):
         # 3. Security: Extract password so we can hash it
@@ -0,0 +1,218 @@
+"""
+Achievement rule engine.
+
+``Achievement.condition_logic`` is compiled once into a predicate closure:
+
+    {"all": [{"metric": "water_today_ml", "op": ">=", "value": 3000}]}
+    {"any": [{"metric": "workout_streak", "op": ">=", "value": 7},
+             {"metric": "habit_streak", "op": ">=", "value": 7}]}
+
+Every metric declares which log events can change it, so compiled rules are
+indexed by event type. A water log only runs the water rules, skips badges the
+user already owns (one query), and computes each metric at most once.
+"""
+
+import operator
+import threading
+import time
+
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from ..models.appUsers import Achievement, ArchivedTotals, UserAchievement, UserRPGStats
+from ..models.dietLogs import DietLog
+from ..models.habits import Habit
+from ..models.waterIntake import WaterIntake
+
+REGISTRY_TTL_SECONDS = 300
+
+WATER_LOGGED = 'water_logged'
+DIET_LOGGED = 'diet_logged'
+HABIT_LOGGED = 'habit_logged'
+WORKOUT_LOGGED = 'workout_logged'
+EVENTS = {WATER_LOGGED, DIET_LOGGED, HABIT_LOGGED, WORKOUT_LOGGED}
+
+OPS = {
+    '>': operator.gt, '>=': operator.ge,
+    '<': operator.lt, '<=': operator.le,
+    '==': operator.eq, '!=': operator.ne,
+}
+
+
+class RuleError(ValueError):
+    """condition_logic is not a valid rule."""
+
+
+# --- 1. METRICS ---
+
+def _diet_today(user_id):
+    return DietLog.objects.filter(user_id=user_id, date=timezone.localdate()).aggregate(
+        calories=Sum('calories'), protein=Sum('protein_g')
+    )
+
+
+def _diet_logs_total(user_id):
+    # Rows moved to cold storage still count (see archive_diet_logs)
+    archived = ArchivedTotals.objects.filter(user_id=user_id).values_list('diet_logs', flat=True).first() or 0
+    return DietLog.objects.filter(user_id=user_id).count() + archived
+
+
+def archive_diet_logs(logs):
+    """Fold the per-user count of ``logs`` into ArchivedTotals; logArchive calls it right before deleting them."""
+    counts = logs.values('user_id').annotate(c=Count('id')).values_list('user_id', 'c')
+    for user_id, count in counts:
+        ArchivedTotals.objects.get_or_create(user_id=user_id)
+        ArchivedTotals.objects.filter(user_id=user_id).update(diet_logs=F('diet_logs') + count)
+
+
+def _habit(metrics):
+    # Re-read, not taken from the event: a collapsed HABIT_LOGGED task keeps only its first payload
+    def load(user_id):
+        habit = Habit.objects.filter(id=metrics.habit_id, user_id=user_id).first() if metrics.habit_id else None
+        return {'streak': habit.live_streak(), 'completed': habit.completed_count} if habit else {}
+    return metrics.row('habit', load)
+
+
+def _rpg(user_id):
+    return UserRPGStats.objects.filter(user_id=user_id).values(
+        'total_workouts', 'consistency_streak', 'strength_score', 'endurance_score'
+    ).first() or {}
+
+
+# metric -> (events that can change it, loader(user_id, metrics))
+METRICS = {
+    'water_today_ml': ({WATER_LOGGED}, lambda u, m: WaterIntake.objects.filter(
+        user_id=u, date=timezone.localdate()).values_list('current_intake_ml', flat=True).first() or 0),
+    'calories_today': ({DIET_LOGGED}, lambda u, m: m.row('diet', _diet_today)['calories'] or 0),
+    'protein_today_g': ({DIET_LOGGED}, lambda u, m: m.row('diet', _diet_today)['protein'] or 0),
+    'diet_logs_total': ({DIET_LOGGED}, lambda u, m: _diet_logs_total(u)),
+    'total_workouts': ({WORKOUT_LOGGED}, lambda u, m: m.row('rpg', _rpg).get('total_workouts', 0)),
+    'workout_streak': ({WORKOUT_LOGGED}, lambda u, m: m.row('rpg', _rpg).get('consistency_streak', 0)),
+    'strength_score': ({WORKOUT_LOGGED}, lambda u, m: m.row('rpg', _rpg).get('strength_score', 0)),
+    'endurance_score': ({WORKOUT_LOGGED}, lambda u, m: m.row('rpg', _rpg).get('endurance_score', 0)),
+    # The habit that triggered the event (``habit_id`` in context)
+    'habit_streak': ({HABIT_LOGGED}, lambda u, m: _habit(m).get('streak', 0)),
+    'habit_completed_count': ({HABIT_LOGGED}, lambda u, m: _habit(m).get('completed', 0)),
+    # Only known from the triggering event (passed in ``context``)
+    'session_volume_kg': ({WORKOUT_LOGGED}, lambda u, m: 0),
+}
+CONTEXT_METRICS = {'session_volume_kg'}
+
+
+class _Metrics:
+    """Lazy, memoised metric lookup for one (user, event) evaluation."""
+
+    def __init__(self, user_id, context):
+        self.user_id = user_id
+        context = context or {}
+        # Everything else is loaded fresh; values queued with the event may be stale
+        self.values = {name: value for name, value in context.items() if name in CONTEXT_METRICS}
+        self.habit_id = context.get('habit_id')
+        self.shared = {}
+
+    def __getitem__(self, name):
+        if name not in self.values:
+            self.values[name] = METRICS[name][1](self.user_id, self)
+        return self.values[name]
+
+    def row(self, key, loader):
+        # Share one query between metrics that come from the same row/aggregate
+        if key not in self.shared:
+            self.shared[key] = loader(self.user_id)
+        return self.shared[key]
+
+
+# --- 2. COMPILER ---
+
+def compile_rule(logic):
+    """Return (predicate(metrics) -> bool, set of metric names used)."""
+    if not isinstance(logic, dict):
+        raise RuleError("Rule must be an object")
+
+    for combinator, reducer in (('all', all), ('any', any)):
+        if combinator in logic:
+            parts = [compile_rule(child) for child in logic[combinator]]
+            if not parts:
+                raise RuleError(f"'{combinator}' needs at least one condition")
+            predicates = [p for p, _ in parts]
+            used = set().union(*(u for _, u in parts))
+            return (lambda m, preds=predicates, red=reducer: red(p(m) for p in preds)), used
+
+    metric, op, value = logic.get('metric'), logic.get('op', '>='), logic.get('value')
+    if metric not in METRICS:
+        raise RuleError(f"Unknown metric: {metric}")
+    # Every metric is a number; anything else would raise TypeError at evaluation, in the task, on every retry
+    if op not in OPS or isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise RuleError(f"Invalid comparison: {op} {value!r}")
+    compare = OPS[op]
+    return (lambda m: compare(m[metric], value)), {metric}
+
+
+def rule_events(logic, used):
+    """Events a rule is indexed under: its own ``events`` list, else those of the metrics it reads."""
+    events = logic.get('events')
+    if events is None:
+        return set().union(*(METRICS[m][0] for m in used))
+    # A string would become a set of its characters
+    if not isinstance(events, list) or not events or not set(events) <= EVENTS:
+        raise RuleError(f"'events' must be a list drawn from {sorted(EVENTS)}")
+    return set(events)
+
+
+class _Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_event = None
+        self._built_at = 0.0
+
+    def invalidate(self):
+        with self._lock:
+            self._by_event = None
+
+    def rules_for(self, event):
+        with self._lock:
+            if self._by_event is None or time.monotonic() - self._built_at > REGISTRY_TTL_SECONDS:
+                self._by_event = self._build()
+                self._built_at = time.monotonic()
+            return self._by_event.get(event, ())
+
+    @staticmethod
+    def _build():
+        by_event = {}
+        for achievement_id, name, logic in Achievement.objects.values_list('id', 'name', 'condition_logic'):
+            try:
+                predicate, used = compile_rule(logic)
+                events = rule_events(logic, used)
+            except RuleError as e:
+                print(f"⚠️ Skipping achievement '{name}': {e}")
+                continue
+            for event in events:
+                by_event.setdefault(event, []).append((achievement_id, name, predicate))
+        return by_event
+
+
+registry = _Registry()
+
+
+# --- 3. EVALUATION ---
+
+def evaluate(user_id, event, context=None):
+    """Check the rules indexed under ``event``; returns names of newly unlocked badges."""
+    rules = registry.rules_for(event)
+    if not rules:
+        return []
+
+    owned = set(
+        UserAchievement.objects.filter(user_id=user_id, achievement_id__in=[r[0] for r in rules])
+        .values_list('achievement_id', flat=True)
+    )
+    metrics = _Metrics(user_id, context)
+    unlocked = [(aid, name) for aid, name, predicate in rules if aid not in owned and predicate(metrics)]
+
+    if unlocked:
+        UserAchievement.objects.bulk_create(
+            [UserAchievement(user_id=user_id, achievement_id=aid) for aid, _ in unlocked],
+            ignore_conflicts=True,
+        )
+        print(f"🏆 Unlocked for {user_id}: {[name for _, name in unlocked]}")
+    return [name for _, name in unlocked]
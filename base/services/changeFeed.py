@@ -0,0 +1,173 @@
+"""
+Sync-delta change feed.
+
+Every save/delete of a synced row (signals.py) upserts one ChangeLog entry
+for it with the user's next sequence number, so the feed holds the latest
+change per row, ordered by a per-user cursor:
+
+    GET sync/?userID=<uuid>&cursor=<last seen seq>&limit=500
+    -> {"cursor": 812, "has_more": false, "changes": [
+           {"table": "diet_logs", "op": "upsert", "row": {...}},
+           {"table": "water_intake", "op": "delete", "id": "41"}, ...]}
+
+A client stores ``cursor`` and passes it back next time; ``cursor=0`` is a
+full sync. Rows removed by archival (services/logArchive.py) are deleted
+under ``suppressed()`` and do not produce tombstones: they left the
+database, not the user's history. Rows cascading from a user delete write
+none either; ``forget_user`` drops that user's whole feed afterwards.
+"""
+
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models.appUsers import AppUsers
+from ..models.changeLogs import ChangeLog, SyncCounter
+from ..models.dietLogs import DietLog
+from ..models.waterIntake import WaterIntake
+from ..models.workoutSessions import Workout
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 2000
+
+UPSERT, DELETE = 'u', 'd'
+
+
+@dataclass(frozen=True)
+class Table:
+    model: type
+    fields: tuple
+    user_field: str = 'user_id'
+
+
+TABLES = {
+    'profile': Table(AppUsers, (
+        'id', 'username', 'firstName', 'lastName', 'date_of_birth', 'gender', 'country', 'height', 'weight',
+        'activityLevel', 'primaryGoal', 'protocol',
+    ), user_field='id'),
+    'diet_logs': Table(DietLog, (
+        'id', 'date', 'title', 'calories', 'protein_g', 'carbs_g', 'fat_g', 'time', 'period', 'timestamp',
+    )),
+    'water_intake': Table(WaterIntake, ('id', 'date', 'current_intake_ml', 'daily_goal_ml', 'last_updated')),
+    'workouts': Table(Workout, (
+        'id', 'title', 'date', 'status', 'started_at', 'completed_at', 'duration_minutes',
+        'total_volume_kg', 'estimated_calories_burned', 'notes', 'ai_generated',
+    )),
+}
+TABLE_BY_MODEL = {table.model: name for name, table in TABLES.items()}
+
+_suppressed = contextvars.ContextVar('change_feed_suppressed', default=False)
+_deleting_users = contextvars.ContextVar('change_feed_deleting_users', default=frozenset())
+
+
+@contextmanager
+def suppressed():
+    """Deletes/saves inside the block are not written to the feed."""
+    token = _suppressed.set(True)
+    try:
+        yield
+    finally:
+        _suppressed.reset(token)
+
+
+# --- 1. WRITE SIDE ---
+
+def _next_seq(user_id):
+    """Increment the user's counter; its row lock is held until the surrounding transaction commits."""
+    counters = SyncCounter.objects.filter(user_id=user_id)
+    if not counters.update(last_seq=F('last_seq') + 1):
+        _, created = SyncCounter.objects.get_or_create(user_id=user_id, defaults={'last_seq': 1})
+        if created:
+            return 1
+        counters.update(last_seq=F('last_seq') + 1)
+    return counters.values_list('last_seq', flat=True).get()
+
+
+def user_deleting(user_id):
+    """pre_delete of a user: the rows cascading with them write no tombstones (one query each otherwise)."""
+    _deleting_users.set(_deleting_users.get() | {user_id})
+
+
+def record(instance, op):
+    """Move ``instance`` to the head of its owner's feed (called from signals); returns the entry or None."""
+    if _suppressed.get():
+        return None
+    name = TABLE_BY_MODEL.get(type(instance))
+    if name is None:
+        return None
+    user_id = getattr(instance, TABLES[name].user_field)
+    if user_id is None or user_id in _deleting_users.get():
+        return None
+
+    with transaction.atomic():
+        entry = ChangeLog(user_id=user_id, seq=_next_seq(user_id), table=name, row_id=str(instance.pk),
+                          op=op, changed_at=timezone.now())
+        ChangeLog.objects.bulk_create(
+            [entry],
+            update_conflicts=True,
+            unique_fields=['user_id', 'table', 'row_id'],
+            update_fields=['seq', 'op', 'changed_at'],
+        )
+    return entry
+
+
+def row(instance):
+    """The synced fields of ``instance``, as ``page()`` returns them."""
+    # to_python: an unsaved default like DateField(default=timezone.now) is still a datetime on the instance
+    meta = instance._meta
+    return {
+        name: meta.get_field(name).to_python(getattr(instance, name))
+        for name in TABLES[TABLE_BY_MODEL[type(instance)]].fields
+    }
+
+
+def forget_user(user_id):
+    _deleting_users.set(_deleting_users.get() - {user_id})
+    ChangeLog.objects.filter(user_id=user_id).delete()
+    SyncCounter.objects.filter(user_id=user_id).delete()
+
+
+# --- 2. READ SIDE ---
+
+def page(user_id, cursor=0, limit=DEFAULT_LIMIT):
+    """Changes after ``cursor`` in seq order, with current row data for upserts."""
+    entries = list(
+        ChangeLog.objects.filter(user_id=user_id, seq__gt=cursor)
+        .order_by('seq')
+        .values_list('seq', 'table', 'row_id', 'op')[:limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    # One query per table for the rows still alive
+    wanted = {}
+    for _, name, row_id, op in entries:
+        if op == UPSERT:
+            wanted.setdefault(name, []).append(row_id)
+    rows = {}
+    for name, ids in wanted.items():
+        table = TABLES[name]
+        rows[name] = {
+            str(row['id']): row
+            for row in table.model.objects.filter(pk__in=ids).order_by().values(*table.fields)
+        }
+
+    changes = []
+    for _, name, row_id, op in entries:
+        if op == DELETE:
+            changes.append({"table": name, "op": "delete", "id": row_id})
+        elif row_id in rows[name]:
+            # Missing: removed since without a tombstone (archived), nothing to send
+            changes.append({"table": name, "op": "upsert", "row": rows[name][row_id]})
+
+    result = {"cursor": entries[-1][0] if entries else cursor, "has_more": has_more, "changes": changes}
+    if not entries and cursor:
+        # A cursor from the future (e.g. restored database): tell the client to start over
+        last_seq = SyncCounter.objects.filter(user_id=user_id).values_list('last_seq', flat=True).first() or 0
+        if cursor > last_seq:
+            result["reset"] = True
+    return result
@@ -0,0 +1,216 @@
+"""
+Home-screen dashboard: every section the app needs in one response.
+
+Each section is cached on its own (``dash:v2:<section>:<user>:<day>``) and
+dropped by signals when the rows behind it change, with a short TTL as a
+backstop for bulk writes. The cache (settings.DASHBOARD['CACHE_ALIAS']) must be
+shared by every worker: the worker that drops a section is rarely the one that
+serves the next read. Sections that miss are computed concurrently on a
+small thread pool; each pool thread keeps its own DB connection open.
+
+Sections are cached already encoded and spliced into the response body, so
+a warm dashboard is never re-serialised. The body's hash is the ETag, so an
+unchanged home screen costs the client a 304 with no body.
+"""
+
+import hashlib
+import threading
+
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from ..models.appUsers import UserRPGStats
+from ..models.dietLogs import DietLog
+from ..models.habits import Habit
+from ..models.reminders import Reminder
+from ..models.waterIntake import WaterIntake
+from ..models.workoutSessions import Workout
+from ..renderers import dumps
+from . import nutritionTargets, profileCache, readReplica
+
+_config = getattr(settings, 'DASHBOARD', {})
+CACHE_ALIAS = _config.get('CACHE_ALIAS', 'default')
+SECTION_TTL_SECONDS = 60
+MAX_WORKERS = 6
+KEY_PREFIX = "dash:v2:"
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+# --- 1. SECTIONS ---
+
+def _profile(user_id, today, alias):
+    profile = profileCache.get_profile(user_id)
+    if profile is None:
+        return None
+    return {
+        "name": profile.firstName or profile.username,
+        "goal": profile.primaryGoal,
+        "weight": profile.weight,
+        "height": profile.height,
+    }
+
+
+def _water(user_id, today, alias):
+    row = (
+        WaterIntake.objects.using(alias)
+        .filter(user_id=user_id, date=today)
+        .values_list("current_intake_ml", "daily_goal_ml")
+        .first()
+    )
+    current, goal = row or (0, nutritionTargets.water_goal_ml(profileCache.get_profile(user_id)))
+    return {"ml": current, "goal": goal}
+
+
+def _targets(user_id, today, alias):
+    # Stored by services/nutritionTargets.py, already in the cached profile snapshot
+    profile = profileCache.get_profile(user_id)
+    return profile.targets if profile is not None else None
+
+
+def _macros(user_id, today, alias):
+    # Served from dietlog_user_date_macros_idx alone (covering index)
+    totals = DietLog.objects.using(alias).filter(user_id=user_id, date=today).aggregate(
+        kcal=Sum("calories"), p=Sum("protein_g"), c=Sum("carbs_g"), f=Sum("fat_g"), meals=Count("id"),
+    )
+    return {key: value or 0 for key, value in totals.items()}
+
+
+def _latest_workout(user_id, today, alias):
+    return (
+        Workout.objects.using(alias)
+        .filter(user_id=user_id)
+        .values("id", "title", "date", "status", "duration_minutes", "total_volume_kg")
+        .first()  # Meta.ordering: newest date first
+    )
+
+
+def _streaks(user_id, today, alias):
+    habits = (
+        Habit.objects.using(alias)
+        .filter(user_id=user_id, is_active=True)
+        .only("id", "name", "current_streak", "longest_streak", "last_completed_date")
+    )
+    workout_streak = (
+        UserRPGStats.objects.using(alias)
+        .filter(user_id=user_id)
+        .values_list("consistency_streak", flat=True)
+        .first()
+    )
+    return {
+        "workout": workout_streak or 0,
+        "habits": [
+            {"id": h.id, "name": h.name, "streak": h.live_streak(today), "best": h.longest_streak,
+             "done_today": h.last_completed_date == today}
+            for h in habits
+        ],
+    }
+
+
+def _reminders(user_id, today, alias):
+    weekday = today.weekday()
+    rows = (
+        Reminder.objects.using(alias)
+        .filter(user_id=user_id, is_active=True)
+        .values("id", "type", "title", "time", "days_of_week")
+    )
+    return [
+        {"id": r["id"], "type": r["type"], "title": r["title"], "time": r["time"].strftime("%H:%M")}
+        for r in rows
+        if not r["days_of_week"] or weekday in r["days_of_week"]
+    ]
+
+
+SECTIONS = {
+    "profile": _profile,
+    "water": _water,
+    "macros": _macros,
+    "targets": _targets,
+    "latest_workout": _latest_workout,
+    "streaks": _streaks,
+    "reminders": _reminders,
+}
+
+# Which sections a write to a model makes stale (wired up in signals.py)
+MODEL_SECTIONS = {
+    "AppUsers": ["profile"],
+    "NutritionTargets": ["targets", "water"],
+    "WaterIntake": ["water"],
+    "DietLog": ["macros"],
+    "Workout": ["latest_workout"],
+    "Habit": ["streaks"],
+    "UserRPGStats": ["streaks"],
+    "Reminder": ["reminders"],
+}
+
+
+# --- 2. CACHE ---
+
+def _key(section, user_id, today):
+    return f"{KEY_PREFIX}{section}:{user_id}:{today.isoformat()}"
+
+
+def invalidate(user_id, sections=None, today=None):
+    today = today or timezone.localdate()
+    caches[CACHE_ALIAS].delete_many([_key(section, user_id, today) for section in (sections or SECTIONS)])
+
+
+def _run_section(section, user_id, today, alias):
+    # Pool threads keep their own connection warm between requests; drop it only if it died
+    connection = connections[alias]
+    if connection.connection is not None and not connection.is_usable():
+        connection.close()
+    return SECTIONS[section](user_id, today, alias)
+
+
+def _pool():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="dashboard")
+        return _executor
+
+
+# --- 3. BUILD ---
+
+def _fragments(user_id, today):
+    """{section: encoded JSON bytes}; cached sections are reused as-is, missing ones are computed in parallel."""
+    cache = caches[CACHE_ALIAS]
+    keys = {section: _key(section, user_id, today) for section in SECTIONS}
+    cached = cache.get_many(keys.values())
+    fragments = {section: cached[key] for section, key in keys.items() if key in cached}
+    missing = [section for section in SECTIONS if section not in fragments]
+
+    if missing:
+        alias = readReplica.alias_for(user_id)
+        if len(missing) == 1:
+            # Not worth a thread hop
+            fresh = {missing[0]: SECTIONS[missing[0]](user_id, today, alias)}
+        else:
+            futures = {s: _pool().submit(_run_section, s, user_id, today, alias) for s in missing}
+            fresh = {section: future.result() for section, future in futures.items()}
+        encoded = {section: dumps(value, sort_keys=True) for section, value in fresh.items()}
+        cache.set_many({keys[s]: value for s, value in encoded.items()}, SECTION_TTL_SECONDS)
+        fragments.update(encoded)
+
+    fragments["date"] = dumps(today)
+    return fragments
+
+
+def render(user_id, today=None):
+    """(compact JSON bytes, weak ETag), spliced from the per-section fragments without re-encoding."""
+    fragments = _fragments(user_id, today or timezone.localdate())
+    body = b"{" + b",".join(b'"%s":%s' % (name.encode(), fragments[name]) for name in sorted(fragments)) + b"}"
+    return body, f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+
+def build(user_id, today=None):
+    """The dashboard as a dict."""
+    return {name: orjson.loads(fragment) for name, fragment in _fragments(user_id, today or timezone.localdate()).items()}
@@ -0,0 +1,72 @@
+"""
+The built-in exercise catalogue, served as a precomputed blob.
+
+The catalogue only changes when an admin edits the library, so the JSON body
+and its brotli/gzip variants are built once per process and reused for every
+request. The version is a stamp of the catalogue rows themselves (count +
+latest ``updated_at``), checked at most every VERSION_CHECK_INTERVAL seconds,
+so an edit made through any process reaches every process within that
+window; the process that made it (signals.py) rebuilds at once.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import namedtuple
+
+from django.db.models import Count, Max
+
+from ..models.exerciseLibrary import Exercise
+from . import httpCompression
+
+VERSION_CHECK_INTERVAL = 5  # seconds
+FIELDS = (
+    'id', 'name', 'category', 'muscle_group', 'description', 'instructions', 'difficulty_level',
+    'equipment_required', 'is_compound', 'supports_form_tracking', 'supports_rep_counting',
+)
+
+Blob = namedtuple('Blob', 'version etag last_modified variants')
+
+_blob = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def _catalogue():
+    return Exercise.objects.filter(is_custom=False)
+
+
+def catalogue_version():
+    """(row count, latest edit) of the built-in exercises: the same in every process."""
+    stats = _catalogue().aggregate(count=Count('id'), latest=Max('updated_at'))
+    return stats['count'], stats['latest']
+
+
+def _build(version):
+    rows = [{**row, 'id': str(row['id'])} for row in _catalogue().values(*FIELDS)]
+    body = json.dumps({"exercises": rows}, separators=(',', ':')).encode()
+    # Weak: the same entity is sent in several encodings
+    etag = f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+    print(f"📚 Built exercise catalogue: {len(rows)} exercises, {len(body)} bytes")
+    return Blob(version, etag, version[1], httpCompression.precompress(body))
+
+
+def get_blob():
+    global _blob, _checked_at
+    blob = _blob
+    if blob is not None and time.monotonic() - _checked_at < VERSION_CHECK_INTERVAL:
+        return blob
+    with _lock:
+        if _blob is None or time.monotonic() - _checked_at >= VERSION_CHECK_INTERVAL:
+            version = catalogue_version()
+            if _blob is None or _blob.version != version:
+                _blob = _build(version)
+            _checked_at = time.monotonic()
+        return _blob
+
+
+def invalidate():
+    """Rebuild on this process's next request; the others catch up within VERSION_CHECK_INTERVAL."""
+    global _checked_at
+    _checked_at = 0.0
@@ -0,0 +1,528 @@
+"""
+Nutrition database lookups: autocomplete and "2 eggs + toast" -> macros.
+
+The foods table (models/foods.py, seeded from base/data/foods.csv) is compiled
+into one flat binary index file that every process memory-maps, so startup
+costs an mmap instead of a table scan and lookups never touch the database:
+
+    header    magic + JSON table of contents (array -> dtype, shape, offset)
+    foods     pk, serving and macros per food; names in one UTF-8 blob
+    terms     every normalised name, alias and word, sorted, for prefix search
+    trigrams  sorted trigram codes with posting lists, for typo-tolerant search
+
+The index is versioned by a stamp of the foods table itself (row count +
+latest ``updated_at``), written into the file header. Every process
+compares it with the table at most every VERSION_CHECK_INTERVAL seconds
+and remaps, or rebuilds a stale file, when it moved; so ``manage.py
+load_foods`` and admin edits in any process reach all of them. Where the
+filesystem is read-only the index is kept in memory instead.
+"""
+
+import bisect
+import csv
+import json
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+import unicodedata
+from fractions import Fraction
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Count, Max
+
+from ..models.foods import Food
+
+_config = getattr(settings, 'FOOD_DATABASE', {})
+DATASET = _config.get('DATASET', os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'foods.csv'))
+INDEX_PATH = _config.get('INDEX_PATH')
+VERSION_CHECK_INTERVAL = _config.get('VERSION_CHECK_INTERVAL', 5)  # seconds
+MAGIC = b"RFFOODIX2\n"
+ALIGN = 8
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+MAX_ITEMS = 20
+# Largest believable amount of one item; anything above is rejected, not logged
+MAX_COUNT = 50             # servings / pieces
+MAX_GRAMS = 5000
+MAX_ML = 5000
+PREFIX_SCAN = 200          # terms looked at per prefix query
+MIN_FUZZY_SCORE = 0.35     # trigram Jaccard similarity
+
+NUMBERS = ('serving_qty', 'serving_g', 'kcal', 'protein_g', 'carbs_g', 'fat_g')
+MACROS = ('kcal', 'protein_g', 'carbs_g', 'fat_g')
+
+
+# --- 1. DATASET ---
+
+def read_dataset(path=None):
+    """Rows of the bundled CSV as Food field dicts."""
+    with open(path or DATASET, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield {
+                'code': row['code'],
+                'name': row['name'],
+                'aliases': [alias for alias in row['aliases'].split('|') if alias],
+                'serving_unit': row['serving_unit'],
+                **{field: float(row[field]) for field in NUMBERS},
+            }
+
+
+def load_dataset(path=None, model=Food):
+    """Upsert the bundled dataset by code; foods added in the admin are left alone. Returns the row count."""
+    rows = [model(**row, source='bundled') for row in read_dataset(path)]
+    model.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['code'],
+        update_fields=['name', 'aliases', 'serving_unit', *NUMBERS, 'source', 'updated_at'],
+    )
+    return len(rows)
+
+
+# --- 2. NORMALISATION ---
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text):
+    """ "Crème Brûlée!" -> "creme brulee" """
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower()
+    return _NON_ALNUM.sub(" ", text).strip()
+
+
+def trigrams(phrase):
+    padded = f"  {phrase} "
+    return {
+        (ord(padded[i]) << 16) | (ord(padded[i + 1]) << 8) | ord(padded[i + 2])
+        for i in range(len(padded) - 2)
+    }
+
+
+# --- 3. BUILD ---
+
+def _blob(strings):
+    encoded = [s.encode() for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _compile(foods):
+    """Food rows -> {array name: numpy array}."""
+    pks, names, units, numbers = [], [], [], []
+    terms = []        # (term, rank, name length, food)  rank 0: whole name/alias, 1: single word
+    phrases = []      # (phrase, food)
+    for i, food in enumerate(foods):
+        pks.append(food['id'])
+        names.append(food['name'])
+        units.append(food['serving_unit'])
+        numbers.append([food[field] for field in NUMBERS])
+        seen = set()
+        for phrase in [normalize(food['name'])] + [normalize(alias) for alias in food['aliases']]:
+            if not phrase or phrase in seen:
+                continue
+            seen.add(phrase)
+            phrases.append((phrase, i))
+            terms.append((phrase, 0, len(food['name']), i))
+            for word in phrase.split():
+                if len(word) > 1 and word != phrase:
+                    terms.append((word, 1, len(food['name']), i))
+    terms.sort()
+
+    postings = {}
+    phrase_sizes = []
+    for p, (phrase, _) in enumerate(phrases):
+        grams = trigrams(phrase)
+        phrase_sizes.append(len(grams))
+        for gram in grams:
+            postings.setdefault(gram, []).append(p)
+    codes = sorted(postings)
+
+    name_blob, name_offsets = _blob(names)
+    unit_blob, unit_offsets = _blob(units)
+    term_blob, term_offsets = _blob(t[0] for t in terms)
+    tri_offsets = np.zeros(len(codes) + 1, dtype=np.int64)
+    np.cumsum([len(postings[code]) for code in codes], out=tri_offsets[1:])
+
+    return {
+        'food_pk': np.array(pks, dtype=np.int64),
+        'food_numbers': np.array(numbers, dtype=np.float32).reshape(len(pks), len(NUMBERS)),
+        'name_blob': name_blob, 'name_offsets': name_offsets,
+        'unit_blob': unit_blob, 'unit_offsets': unit_offsets,
+        'term_blob': term_blob, 'term_offsets': term_offsets,
+        'term_rank': np.array([t[1] for t in terms], dtype=np.uint8),
+        'term_food': np.array([t[3] for t in terms], dtype=np.int32),
+        'phrase_food': np.array([p[1] for p in phrases], dtype=np.int32),
+        'phrase_size': np.array(phrase_sizes, dtype=np.int32),
+        'tri_codes': np.array(codes, dtype=np.uint32),
+        'tri_offsets': tri_offsets,
+        'tri_postings': np.array([p for code in codes for p in postings[code]], dtype=np.int32),
+    }
+
+
+def _write(arrays, path, version):
+    """Header + 8-byte aligned raw arrays, written to a temp file and swapped in atomically."""
+    toc, offset = {}, 0
+    for name, array in arrays.items():
+        toc[name] = [array.dtype.str, list(array.shape), offset]
+        offset += -(-array.nbytes // ALIGN) * ALIGN
+    header = json.dumps({'version': version, 'arrays': toc}).encode()
+    start = -(-(len(MAGIC) + 4 + len(header)) // ALIGN) * ALIGN
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.foods-')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(MAGIC + struct.pack('<I', len(header)) + header)
+        for name, array in arrays.items():
+            f.seek(start + toc[name][2])
+            f.write(np.ascontiguousarray(array).tobytes())
+        f.truncate(start + offset)
+    os.replace(tmp, path)
+
+
+def table_version():
+    """Stamp of the foods table that every process can read: row count + latest edit."""
+    stats = Food.objects.aggregate(count=Count('id'), latest=Max('updated_at'))
+    return f"{stats['count']}:{stats['latest'].isoformat() if stats['latest'] else ''}"
+
+
+def build_index(path=INDEX_PATH):
+    """Compile the foods table and write it to ``path``; returns (arrays, version) for in-memory use."""
+    started = time.perf_counter()
+    # Stamped before reading: an edit in between leaves the file looking stale, never fresh
+    version = table_version()
+    # Bulk loads skip field validators; a food with an empty serving can't be resolved
+    foods = (Food.objects.filter(serving_qty__gt=0, serving_g__gt=0).order_by('pk')
+             .values('id', 'name', 'aliases', 'serving_unit', *NUMBERS))
+    arrays = _compile(foods)
+    if path:
+        try:
+            _write(arrays, path, version)
+        except OSError as e:
+            print(f"⚠️ Food index not written ({e}), keeping it in memory")
+    print(f"🥗 Built food index: {len(arrays['food_pk'])} foods, {len(arrays['term_food'])} terms "
+          f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+    return arrays, version
+
+
+# --- 4. LOAD ---
+
+class FoodIndex:
+    """Read-only view over the compiled arrays (memory-mapped from INDEX_PATH, or in memory)."""
+
+    def __init__(self, arrays, version=0, buffer=None):
+        self.version = version
+        self._buffer = buffer  # keeps the mmap alive
+        for name, array in arrays.items():
+            setattr(self, name, array)
+        self._terms = range(len(self.term_food))
+
+    @classmethod
+    def open(cls, path):
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a food index")
+        (size,) = struct.unpack_from('<I', buffer, len(MAGIC))
+        header = json.loads(buffer[len(MAGIC) + 4:len(MAGIC) + 4 + size])
+        start = -(-(len(MAGIC) + 4 + size) // ALIGN) * ALIGN
+        arrays = {}
+        for name, (dtype, shape, offset) in header['arrays'].items():
+            count = int(np.prod(shape))
+            arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count, offset=start + offset).reshape(shape)
+        return cls(arrays, header['version'], buffer)
+
+    def __len__(self):
+        return len(self.food_pk)
+
+    def _string(self, blob, offsets, i):
+        return blob[offsets[i]:offsets[i + 1]].tobytes().decode()
+
+    def _term(self, i):
+        return self.term_blob[self.term_offsets[i]:self.term_offsets[i + 1]].tobytes()
+
+    def food(self, i):
+        numbers = self.food_numbers[i]
+        row = {
+            'id': int(self.food_pk[i]),
+            'name': self._string(self.name_blob, self.name_offsets, i),
+            'serving_unit': self._string(self.unit_blob, self.unit_offsets, i),
+        }
+        row.update((field, round(float(value), 2)) for field, value in zip(NUMBERS, numbers))
+        row['serving'] = f"{row['serving_qty']:g} {row['serving_unit']} ({row['serving_g']:g} g)"
+        return row
+
+    def exact(self, phrase):
+        """Food index for a whole name/alias/word, preferring whole names; None if absent."""
+        key = phrase.encode()
+        i = bisect.bisect_left(self._terms, key, key=self._term)
+        if i < len(self._terms) and self._term(i) == key:
+            return int(self.term_food[i])
+        return None
+
+    def prefix(self, phrase, limit):
+        """Foods with a name, alias or word starting with ``phrase``: exact first, whole names before words."""
+        key = phrase.encode()
+        i = bisect.bisect_left(self._terms, key, key=self._term)
+        hits = []
+        for j in range(i, min(i + PREFIX_SCAN, len(self._terms))):
+            term = self._term(j)
+            if not term.startswith(key):
+                break
+            hits.append((term != key, int(self.term_rank[j]), len(term), int(self.term_food[j])))
+        return _unique(food for *_, food in sorted(hits))[:limit]
+
+    def fuzzy(self, phrase, limit):
+        """Foods whose name or alias shares the most trigrams with ``phrase`` (typos, word order)."""
+        grams = np.fromiter(trigrams(phrase), dtype=np.uint32)
+        if not len(self.tri_codes) or not len(grams):
+            return []
+        slots = np.searchsorted(self.tri_codes, grams)
+        found = slots < len(self.tri_codes)
+        found[found] = self.tri_codes[slots[found]] == grams[found]
+        slots = slots[found]
+        if not len(slots):
+            return []
+        postings = np.concatenate([self.tri_postings[self.tri_offsets[s]:self.tri_offsets[s + 1]] for s in slots])
+        shared = np.bincount(postings, minlength=len(self.phrase_food))
+        scores = shared / (len(grams) + self.phrase_size - shared)
+        best = np.argsort(-scores, kind='stable')[:limit * 4]
+        return _unique(int(self.phrase_food[p]) for p in best if scores[p] >= MIN_FUZZY_SCORE)[:limit]
+
+
+def _unique(items):
+    seen = set()
+    return [x for x in items if not (x in seen or seen.add(x))]
+
+
+_index = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def _open(version):
+    """The memory-mapped file if it holds ``version``, else None."""
+    if INDEX_PATH:
+        try:
+            index = FoodIndex.open(INDEX_PATH)
+        except (OSError, ValueError, KeyError):
+            return None
+        if index.version == version:
+            return index
+    return None
+
+
+def _rebuild():
+    arrays, version = build_index()
+    index = _open(version)
+    return index if index is not None else FoodIndex(arrays, version)
+
+
+def _load(version):
+    index = _open(version)
+    return index if index is not None else _rebuild()
+
+
+def get_index():
+    global _index, _checked_at
+    index = _index
+    if index is not None and time.monotonic() - _checked_at < VERSION_CHECK_INTERVAL:
+        return index
+    with _lock:
+        if _index is None or time.monotonic() - _checked_at >= VERSION_CHECK_INTERVAL:
+            version = table_version()
+            if _index is None or _index.version != version:
+                _index = _load(version)
+            _checked_at = time.monotonic()
+        return _index
+
+
+def invalidate():
+    """Recompile from the foods table; this process remaps now, others within VERSION_CHECK_INTERVAL."""
+    global _index, _checked_at
+    with _lock:
+        _index = _rebuild()
+        _checked_at = time.monotonic()
+
+
+# --- 5. SEARCH ---
+
+def autocomplete(query, limit=DEFAULT_LIMIT):
+    phrase = normalize(query)
+    if not phrase:
+        return []
+    index = get_index()
+    hits = index.prefix(phrase, limit)
+    if not hits and " " in phrase:
+        # "gre yog": every word is a prefix of some word of the name
+        found = [index.prefix(word, MAX_LIMIT) for word in phrase.split()]
+        hits = [i for i in found[0] if all(i in others for others in found[1:])][:limit]
+    if len(hits) < limit and len(phrase) >= 3:
+        hits = _unique(hits + index.fuzzy(phrase, limit))[:limit]
+    return [index.food(i) for i in hits]
+
+
+def _singulars(phrase):
+    yield phrase
+    for suffix in ("es", "s"):
+        words = [w[:-len(suffix)] if len(w) > len(suffix) + 1 and w.endswith(suffix) else w for w in phrase.split()]
+        yield " ".join(words)
+
+
+def _exact(phrase, index):
+    for candidate in _singulars(phrase):
+        found = index.exact(candidate)
+        if found is not None:
+            return found
+    return None
+
+
+def match(text, index=None):
+    """Best food index for a free-text food name, or None."""
+    index = index or get_index()
+    phrase = normalize(text)
+    if not phrase:
+        return None
+    found = _exact(phrase, index)
+    if found is not None:
+        return found
+    hits = index.prefix(phrase, 1) or index.fuzzy(phrase, 1)
+    return hits[0] if hits else None
+
+
+# --- 6. RESOLVE ("2 eggs + toast") ---
+
+MASS_G = {'g': 1, 'kg': 1000, 'oz': 28.35, 'lb': 453.6}
+VOLUME_ML = {'ml': 1, 'l': 1000, 'tsp': 4.93, 'tbsp': 14.79, 'fl oz': 29.57, 'cup': 240, 'glass': 250}
+UNITS = {
+    'g': 'g', 'gr': 'g', 'gram': 'g', 'grams': 'g', 'kg': 'kg', 'kilo': 'kg', 'kilos': 'kg',
+    'oz': 'oz', 'ounce': 'oz', 'ounces': 'oz', 'lb': 'lb', 'lbs': 'lb', 'pound': 'lb', 'pounds': 'lb',
+    'ml': 'ml', 'l': 'l', 'litre': 'l', 'liter': 'l', 'litres': 'l', 'liters': 'l',
+    'tsp': 'tsp', 'teaspoon': 'tsp', 'teaspoons': 'tsp', 'tbsp': 'tbsp', 'tablespoon': 'tbsp', 'tablespoons': 'tbsp',
+    'cup': 'cup', 'cups': 'cup', 'glass': 'glass', 'glasses': 'glass',
+}
+COUNT_WORDS = {
+    'slice', 'slices', 'piece', 'pieces', 'serving', 'servings', 'portion', 'portions', 'scoop', 'scoops',
+    'can', 'cans', 'bowl', 'bowls', 'plate', 'plates', 'handful', 'handfuls', 'bar', 'bars',
+}
+NUMBER_WORDS = {
+    'a': 1, 'an': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7,
+    'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12, 'half': 0.5, 'quarter': 0.25,
+}
+FILLER_WORDS = {'of', 'a', 'an', 'small', 'medium', 'large', 'big', 'extra'}
+
+_ITEMS = re.compile(r"\s*(?:\+|,|;|&|\n)\s*")
+_JOINERS = re.compile(r"\s+(?:and|with|plus)\s+", re.I)
+_QUANTITY = re.compile(r"^\s*(\d+\s+\d+/\d+|\d+/\d+|\d+(?:\.\d+)?)\s*(.*)$")
+
+
+def _number(text):
+    whole, _, fraction = text.partition(" ")
+    try:
+        return float(Fraction(whole) + (Fraction(fraction) if fraction else 0))
+    except (ValueError, ZeroDivisionError):
+        return None  # "1/0"
+
+
+def _plausible(quantity, unit):
+    if quantity is None or quantity <= 0:
+        return False
+    if unit in MASS_G:
+        return quantity * MASS_G[unit] <= MAX_GRAMS
+    if unit in VOLUME_ML:
+        return quantity * VOLUME_ML[unit] <= MAX_ML
+    return quantity <= MAX_COUNT
+
+
+def parse_item(text):
+    """
+    "2 slices of toast" -> (2.0, None, "toast"); "200g chicken" -> (200.0, "g", "chicken").
+    The quantity is None when it is zero, unparsable ("1/0") or implausibly large ("500 cups").
+    """
+    quantity, unit = None, None
+    match_ = _QUANTITY.match(text.lower())
+    if match_:
+        quantity, rest = _number(match_.group(1)), match_.group(2)
+        if quantity is None:
+            quantity = 0.0
+    else:
+        rest = text.lower()
+    words = rest.split()
+    if quantity is None and words and words[0] in NUMBER_WORDS:
+        quantity = NUMBER_WORDS[words.pop(0)]
+    while words and words[0] in FILLER_WORDS:
+        words.pop(0)
+    if len(words) > 1 and words[0] == 'fl' and words[1] == 'oz':
+        unit, words = 'fl oz', words[2:]
+    elif words and words[0].rstrip('.') in UNITS:
+        unit = UNITS[words.pop(0).rstrip('.')]
+    elif words and words[0] in COUNT_WORDS:
+        words.pop(0)
+    while words and words[0] in FILLER_WORDS:
+        words.pop(0)
+    quantity = 1.0 if quantity is None else float(quantity)
+    return (quantity if _plausible(quantity, unit) else None), unit, " ".join(words)
+
+
+def servings(quantity, unit, food):
+    """How many of ``food``'s servings ``quantity`` ``unit`` is; a bare count means servings."""
+    if unit in MASS_G:
+        return quantity * MASS_G[unit] / food['serving_g']
+    if unit in VOLUME_ML:
+        if food['serving_unit'] in VOLUME_ML:
+            return quantity * VOLUME_ML[unit] / (food['serving_qty'] * VOLUME_ML[food['serving_unit']])
+        return quantity * VOLUME_ML[unit] / food['serving_g']  # ~1 g per ml
+    return quantity
+
+
+def _resolve_piece(piece, index):
+    """[(text, food index or None)] for one piece; "ham and cheese sandwich" stays whole, "eggs and toast" splits."""
+    name = normalize(parse_item(piece)[2])
+    found = _exact(name, index) if name else None
+    parts = [part for part in _JOINERS.split(piece) if part.strip()]
+    if found is not None or len(parts) == 1:
+        return [(piece, found if found is not None else match(name, index))]
+    return [(part, match(parse_item(part)[2], index)) for part in parts]
+
+
+def resolve(text):
+    """Free text -> per-item servings and macros, totals, what could not be matched and bad quantities."""
+    index = get_index()
+    pieces = [p for p in _ITEMS.split(text.strip()) if p.strip()][:MAX_ITEMS]
+    items, unmatched, invalid = [], [], []
+    totals = dict.fromkeys(MACROS, 0.0)
+
+    for piece in pieces:
+        for part, i in _resolve_piece(piece, index):
+            if i is None:
+                unmatched.append(part.strip())
+                continue
+            quantity, unit, _ = parse_item(part)
+            if quantity is None:
+                invalid.append(part.strip())
+                continue
+            food = index.food(i)
+            count = servings(quantity, unit, food)
+            item = {
+                'text': part.strip(),
+                'food': {'id': food['id'], 'name': food['name'], 'serving': food['serving']},
+                'servings': round(count, 2),
+                'grams': round(count * food['serving_g']),
+            }
+            for field in MACROS:
+                item[field] = round(count * food[field], 1)
+                totals[field] += count * food[field]
+            items.append(item)
+
+    return {
+        'items': items,
+        'unmatched': unmatched,
+        'invalid': invalid,
+        'totals': {field: round(value, 1) for field, value in totals.items()},
+    }
@@ -0,0 +1,108 @@
+"""
+Habit streak counters.
+
+``Habit`` carries current/longest streak, completed count and the last completed
+date. A new completion that extends (or restarts) the streak is applied in O(1)
+under a row lock. Rare cases that can split or merge runs (back-filling an older
+day, un-checking a day) fall back to a recompute of that one habit.
+"""
+
+from datetime import timedelta
+from itertools import groupby
+
+from django.db import transaction
+
+from ..models.habitLogs import HabitLog
+from ..models.habits import Habit
+
+STREAK_FIELDS = ['current_streak', 'longest_streak', 'completed_count', 'last_completed_date']
+
+
+def _streaks_from_dates(dates):
+    """(current, longest, count, last) from ascending completed dates."""
+    current = longest = count = 0
+    last = None
+    for day in dates:
+        current = current + 1 if last is not None and day - last == timedelta(days=1) else 1
+        longest = max(longest, current)
+        count += 1
+        last = day
+    return current, longest, count, last
+
+
+def _apply(habit, stats):
+    habit.current_streak, habit.longest_streak, habit.completed_count, habit.last_completed_date = stats
+
+
+def recompute(habit):
+    """Rebuild one habit's counters from its log history."""
+    dates = (
+        HabitLog.objects.filter(habit=habit, completed=True)
+        .order_by('date').values_list('date', flat=True)
+    )
+    _apply(habit, _streaks_from_dates(dates))
+    habit.save(update_fields=STREAK_FIELDS)
+
+
+def _record_completion(habit, day):
+    last = habit.last_completed_date
+    if last is None or day > last + timedelta(days=1):
+        habit.current_streak = 1
+    elif day == last + timedelta(days=1):
+        habit.current_streak += 1
+    else:
+        return False  # back-fill on or before the last completed day: runs may merge
+
+    habit.completed_count += 1
+    habit.last_completed_date = day
+    habit.longest_streak = max(habit.longest_streak, habit.current_streak)
+    habit.save(update_fields=STREAK_FIELDS)
+    return True
+
+
+def log_habit(habit_id, user_id, day, completed, notes=""):
+    """Upsert the day's log and update the habit's counters; returns (habit, log)."""
+    with transaction.atomic():
+        habit = Habit.objects.select_for_update().get(id=habit_id, user_id=user_id)
+        log, created = HabitLog.objects.get_or_create(
+            habit=habit, date=day, defaults={'completed': completed, 'notes': notes}
+        )
+        previously_completed = False if created else log.completed
+
+        if not created:
+            log.completed = completed
+            log.notes = notes or log.notes
+            log.save(update_fields=['completed', 'notes'])
+
+        if completed and not previously_completed:
+            if not _record_completion(habit, day):
+                recompute(habit)
+        elif previously_completed and not completed:
+            recompute(habit)
+
+    return habit, log
+
+
+def recompute_all(habit_ids=None, batch_size=1000):
+    """Repair counters for many habits with one ordered scan of completed logs."""
+    logs = HabitLog.objects.filter(completed=True).order_by('habit_id', 'date')
+    habits = Habit.objects.all()
+    if habit_ids:
+        logs = logs.filter(habit_id__in=habit_ids)
+        habits = habits.filter(id__in=habit_ids)
+
+    stats = {
+        habit_id: _streaks_from_dates(day for _, day in rows)
+        for habit_id, rows in groupby(logs.values_list('habit_id', 'date').iterator(chunk_size=5000),
+                                      key=lambda row: row[0])
+    }
+
+    updated = []
+    for habit in habits.only('id', *STREAK_FIELDS).iterator(chunk_size=batch_size):
+        _apply(habit, stats.get(habit.id, (0, 0, 0, None)))
+        updated.append(habit)
+        if len(updated) >= batch_size:
+            Habit.objects.bulk_update(updated, STREAK_FIELDS)
+            updated = []
+    Habit.objects.bulk_update(updated, STREAK_FIELDS)
+    return len(stats)
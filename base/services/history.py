@@ -0,0 +1,91 @@
+"""
+Diet and water history for a date range, with cheap HTTP validators.
+
+``validators`` is a single indexed aggregate (row count + newest
+updated_at / last_updated, both auto_now) over exactly the rows the response would contain.
+A changed, added or deleted row moves one of the two, so it is enough for an
+ETag and Last-Modified, and a 304 never touches the rows themselves.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from ..models.dietLogs import DietLog
+from ..models.waterIntake import WaterIntake
+
+DEFAULT_DAYS = 30
+MAX_DAYS = 366
+
+
+class RangeError(ValueError):
+    pass
+
+
+def parse_range(params):
+    """(start, end) from ?start=&end= or ?days=, inclusive; defaults to the last 30 days."""
+    today = timezone.localdate()
+    try:
+        end = parse_date(params.get("end")) if params.get("end") else today
+        if params.get("start"):
+            start = parse_date(params["start"])
+        else:
+            start = end - timedelta(days=int(params.get("days", DEFAULT_DAYS)) - 1)
+    except ValueError as e:
+        raise RangeError(f"Invalid date range: {e}")
+    if start is None or end is None:
+        raise RangeError("Dates must be YYYY-MM-DD")
+    if start > end or (end - start).days >= MAX_DAYS:
+        raise RangeError(f"Range must be 1-{MAX_DAYS} days with start <= end")
+    return start, end
+
+
+SOURCES = {
+    "diet": (DietLog, "updated_at"),
+    "water": (WaterIntake, "last_updated"),
+}
+
+
+def _rows(kind, user_id, start, end):
+    model, _ = SOURCES[kind]
+    return model.objects.filter(user_id=user_id, date__gte=start, date__lte=end)
+
+
+def validators(kind, user_id, start, end):
+    """(etag, last_modified) for the range, from one aggregate query."""
+    _, stamp_field = SOURCES[kind]
+    stats = _rows(kind, user_id, start, end).aggregate(count=Count("id"), latest=Max(stamp_field))
+    latest = stats["latest"]
+    stamp = latest.timestamp() if latest else 0
+    return f'"{kind}-{start}-{end}-{stats["count"]}-{stamp}"', latest
+
+
+def diet_history(user_id, start, end):
+    days = {}
+    rows = (
+        _rows("diet", user_id, start, end)
+        .order_by("-date", "timestamp")
+        .values("date", "title", "calories", "protein_g", "carbs_g", "fat_g", "time", "period")
+    )
+    for row in rows:
+        day = days.setdefault(row["date"], {"date": row["date"], "kcal": 0, "p": 0, "c": 0, "f": 0, "entries": []})
+        day["kcal"] += row["calories"]
+        day["p"] += row["protein_g"]
+        day["c"] += row["carbs_g"]
+        day["f"] += row["fat_g"]
+        day["entries"].append({
+            "title": row["title"], "kcal": row["calories"], "p": row["protein_g"], "c": row["carbs_g"],
+            "f": row["fat_g"], "time": f"{row['time']} {row['period']}",
+        })
+    return list(days.values())
+
+
+def water_history(user_id, start, end):
+    rows = (
+        _rows("water", user_id, start, end)
+        .order_by("-date")
+        .values_list("date", "current_intake_ml", "daily_goal_ml")
+    )
+    return [{"date": day, "ml": ml, "goal": goal} for day, ml, goal in rows]
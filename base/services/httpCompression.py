@@ -0,0 +1,60 @@
+"""
+Response compression helpers shared by CompressionMiddleware and endpoints
+that serve precompressed bodies (e.g. the exercise catalogue).
+
+Brotli is preferred when the client accepts it, then gzip. Bodies smaller
+than settings.HTTP_COMPRESSION['MIN_BYTES'] are sent as-is: below roughly
+one TCP packet the CPU cost buys nothing on the wire.
+"""
+
+import gzip
+
+import brotli
+from django.conf import settings
+
+_config = getattr(settings, 'HTTP_COMPRESSION', {})
+MIN_BYTES = _config.get('MIN_BYTES', 1024)
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/')
+
+# On-the-fly quality favours latency; precompressed blobs can afford the maximum
+DYNAMIC = {
+    'br': lambda body: brotli.compress(body, quality=5),
+    'gzip': lambda body: gzip.compress(body, compresslevel=6, mtime=0),
+}
+STATIC = {
+    'br': lambda body: brotli.compress(body, quality=11),
+    'gzip': lambda body: gzip.compress(body, compresslevel=9, mtime=0),
+}
+PREFERENCE = ('br', 'gzip')
+
+
+def negotiate(accept_encoding):
+    """Best encoding the client accepts ('br', 'gzip') or None."""
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in PREFERENCE:
+        if accepted.get(encoding, accepted.get('*', 0)) > 0:
+            return encoding
+    return None
+
+
+def compressible(content_type):
+    return (content_type or '').startswith(COMPRESSIBLE_TYPES)
+
+
+def precompress(body):
+    """{encoding: bytes} for identity plus every encoding that actually shrinks the body."""
+    variants = {'identity': body}
+    for encoding, compress in STATIC.items():
+        packed = compress(body)
+        if len(packed) < len(body):
+            variants[encoding] = packed
+    return variants
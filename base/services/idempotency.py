@@ -0,0 +1,98 @@
+"""
+Idempotency-Key support for write endpoints.
+
+A client that retries a POST with the same ``Idempotency-Key`` header gets the
+first attempt's response back, byte for byte, without the view running again:
+
+    @idempotent
+    @api_view(["POST"])
+    def addWaterIntakeLog(request): ...
+
+Stored per (path, key) in the settings.IDEMPOTENCY['CACHE_ALIAS'] cache for
+TTL_SECONDS as a compact tuple (body fingerprint, status, content type, body).
+That cache must be shared by every worker: a retry can land on any of them.
+Reusing a key with a different body is a 422. A duplicate that arrives while
+the first is still running waits briefly on a ``cache.add`` lock, then replays
+the result (or gets a 409 if the first is still going). 5xx responses are not
+stored, so those can be retried for real.
+"""
+
+import functools
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, JsonResponse
+
+_config = getattr(settings, 'IDEMPOTENCY', {})
+CACHE_ALIAS = _config.get('CACHE_ALIAS', 'default')
+TTL_SECONDS = _config.get('TTL_SECONDS', 24 * 3600)
+LOCK_SECONDS = _config.get('LOCK_SECONDS', 30)
+WAIT_SECONDS = _config.get('WAIT_SECONDS', 5)
+POLL_SECONDS = 0.05
+MAX_KEY_LENGTH = 255
+HEADER = "Idempotency-Key"
+KEY_PREFIX = "idem:v1:"
+
+
+def _fingerprint(body):
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+def _replay(entry):
+    _, status, content_type, body = entry
+    print(f"🔁 Replaying stored {status} response")
+    response = HttpResponse(body, status=status, content_type=content_type)
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def _check(entry, fingerprint):
+    if entry[0] != fingerprint:
+        return JsonResponse({"error": f"{HEADER} was already used with a different request"}, status=422)
+    return _replay(entry)
+
+
+def idempotent(view):
+    """Wrap a view (outside ``@api_view``) so requests carrying an Idempotency-Key run at most once."""
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return view(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return JsonResponse({"error": f"{HEADER} must be at most {MAX_KEY_LENGTH} characters"}, status=400)
+
+        cache = caches[CACHE_ALIAS]
+        cache_key = f"{KEY_PREFIX}{request.path}:{key}"
+        lock_key = f"{cache_key}:lock"
+        fingerprint = _fingerprint(request.body)
+
+        entry = cache.get(cache_key)
+        if entry is not None:
+            return _check(entry, fingerprint)
+
+        if not cache.add(lock_key, 1, LOCK_SECONDS):
+            # Same key in flight: wait for its result instead of writing twice
+            deadline = time.monotonic() + WAIT_SECONDS
+            while time.monotonic() < deadline:
+                time.sleep(POLL_SECONDS)
+                entry = cache.get(cache_key)
+                if entry is not None:
+                    return _check(entry, fingerprint)
+            return JsonResponse({"error": f"A request with this {HEADER} is still in progress"}, status=409)
+
+        try:
+            response = view(request, *args, **kwargs)
+            if hasattr(response, "render") and not getattr(response, "is_rendered", True):
+                response.render()  # DRF Response
+            if response.status_code < 500 and not response.streaming:
+                entry = (fingerprint, response.status_code, response["Content-Type"], response.content)
+                cache.set(cache_key, entry, TTL_SECONDS)
+            return response
+        finally:
+            cache.delete(lock_key)
+
+    return wrapper
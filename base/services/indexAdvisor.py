@@ -0,0 +1,170 @@
+"""
+Index advisor: EXPLAIN the queries our endpoints actually issue.
+
+Each entry in ``ENDPOINT_QUERIES`` rebuilds a representative queryset from the
+same code path an endpoint/job uses. The advisor runs ``EXPLAIN`` on it, flags
+sequential scans and non-index-only lookups, and proposes an index:
+
+    key columns     = equality filters, then one range/order column
+    INCLUDE columns = remaining selected columns (covering, Postgres)
+    WHERE           = column-vs-column / constant-boolean filters (partial)
+"""
+
+import uuid
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import F
+from django.db.models.expressions import Col
+from django.db.models.lookups import Exact, In, GreaterThan, GreaterThanOrEqual, LessThan, LessThanOrEqual
+from django.utils import timezone
+
+from ..models.aiActions import AIAction
+from ..models.appUsers import AppUsers
+from ..models.dietLogs import DietLog
+from ..models.habitLogs import HabitLog
+from ..models.reminders import Reminder
+from ..models.waterIntake import WaterIntake
+from ..models.workoutSessions import Workout
+from .waterReminders import behind_pace_queryset
+
+RANGE_LOOKUPS = (GreaterThan, GreaterThanOrEqual, LessThan, LessThanOrEqual)
+MACRO_FIELDS = ('calories', 'protein_g', 'carbs_g', 'fat_g')
+
+
+def _sample_user_id():
+    return AppUsers.objects.values_list('id', flat=True).first() or uuid.uuid4()
+
+
+def endpoint_queries():
+    """name -> queryset, mirroring what the endpoints/jobs run."""
+    user_id = _sample_user_id()
+    today = timezone.localdate()
+    now = timezone.now()
+    return {
+        # adddietlog/ achievements + dashboard macros
+        'diet_today_macros': DietLog.objects.filter(user_id=user_id, date=today).values(*MACRO_FIELDS),
+        'diet_history': DietLog.objects.filter(user_id=user_id, date__gte=today - timedelta(days=30))
+                                       .order_by('-date').values('date', *MACRO_FIELDS),
+        # addwaterintakelog/
+        'water_today': WaterIntake.objects.filter(user_id=user_id, date=today),
+        # send_water_reminders
+        'water_reminder_sweep': behind_pace_queryset(today, now - timedelta(minutes=90), 0.5),
+        # getworkoutplans/
+        'recent_plans': AIAction.objects.filter(user_id=user_id, action_type='workout_create', success=True)
+                                        .values('action_data', 'timestamp')[:10],
+        # rpg streaks
+        'completed_workout_days': Workout.objects.filter(user_id__in=[user_id], status='completed',
+                                                         date__gt=today - timedelta(days=366))
+                                                 .values_list('user_id', 'date').distinct().order_by('user_id', '-date'),
+        # habit streak recompute
+        'habit_history': HabitLog.objects.filter(habit_id=uuid.uuid4(), completed=True)
+                                         .order_by('date').values_list('date', flat=True),
+        # reminder scheduler delta sync
+        'reminder_changes': Reminder.objects.filter(updated_at__gt=now - timedelta(seconds=30)).order_by(),
+    }
+
+
+# --- 1. PLAN INSPECTION ---
+
+def _plan_problems(plan, table):
+    """Return a list of human readable issues found in an EXPLAIN output."""
+    problems = []
+    text = plan.lower()
+    if connection.vendor == 'postgresql':
+        if f'seq scan on {table}' in text:
+            problems.append('sequential scan')
+        elif 'index scan' in text and 'index only scan' not in text:
+            problems.append('heap fetches (not index-only)')
+        if 'sort' in text and 'sort key' in text:
+            problems.append('explicit sort')
+    else:
+        if f'scan {table}' in text and 'using' not in text:
+            problems.append('full table scan')
+        if 'temp b-tree' in text:
+            problems.append('explicit sort')
+    return problems
+
+
+# --- 2. INDEX PROPOSAL ---
+
+def _walk(node):
+    for child in getattr(node, 'children', []):
+        if hasattr(child, 'children'):
+            yield from _walk(child)
+        else:
+            yield child
+
+
+def propose_index(queryset):
+    """Derive (key columns, include columns, partial predicate) from a queryset."""
+    query = queryset.query
+    equality, ranges, partial = [], [], []
+
+    for lookup in _walk(query.where):
+        lhs = getattr(lookup, 'lhs', None)
+        if not isinstance(lhs, Col):
+            continue
+        column = lhs.target.column
+        rhs = getattr(lookup, 'rhs', None)
+        if isinstance(rhs, Col) or isinstance(rhs, F):
+            partial.append(f'"{column}" {_op(lookup)} "{rhs.target.column}"' if isinstance(rhs, Col) else column)
+        elif isinstance(lookup, Exact) and isinstance(rhs, bool):
+            partial.append(f'"{column}" = {str(rhs).lower()}')
+        elif isinstance(lookup, (Exact, In)):
+            if column not in equality:
+                equality.append(column)
+        elif isinstance(lookup, RANGE_LOOKUPS):
+            if column not in ranges:
+                ranges.append(column)
+
+    ordering = query.order_by or (queryset.model._meta.ordering if query.default_ordering else ())
+    order_columns = []
+    for name in ordering:
+        field_name = name.lstrip('-')
+        try:
+            order_columns.append(queryset.model._meta.get_field(field_name).column)
+        except Exception:
+            continue
+
+    keys = list(equality)
+    for column in ranges[:1] + order_columns:
+        if column not in keys:
+            keys.append(column)
+
+    selected = []
+    if query.values_select:
+        selected = [queryset.model._meta.get_field(f).column for f in query.values_select]
+    include = [c for c in selected if c not in keys]
+    return keys, include, partial
+
+
+def _op(lookup):
+    return {'lt': '<', 'lte': '<=', 'gt': '>', 'gte': '>=', 'exact': '='}.get(lookup.lookup_name, '=')
+
+
+def index_ddl(table, name, keys, include, partial):
+    sql = f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" ON "{table}" ({", ".join(chr(34) + k + chr(34) for k in keys)})'
+    if include:
+        sql += f' INCLUDE ({", ".join(chr(34) + c + chr(34) for c in include)})'
+    if partial:
+        sql += ' WHERE ' + ' AND '.join(partial)
+    return sql + ';'
+
+
+def advise(analyze=False):
+    """Yield one report dict per endpoint query."""
+    for name, queryset in endpoint_queries().items():
+        table = queryset.model._meta.db_table
+        options = {'analyze': True} if analyze and connection.vendor == 'postgresql' else {}
+        plan = queryset.explain(**options)
+        problems = _plan_problems(plan, table)
+        keys, include, partial = propose_index(queryset)
+        yield {
+            'query': name,
+            'table': table,
+            'plan': plan,
+            'problems': problems,
+            'suggestion': index_ddl(table, f'{table}_{"_".join(keys)[:40]}_adv', keys, include, partial)
+            if problems and keys else None,
+        }
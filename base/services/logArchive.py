@@ -0,0 +1,318 @@
+"""
+Cold-storage archival of old log rows to Parquet.
+
+Rows older than N whole months are streamed out of the database with a
+server-side cursor, written as zstd-compressed Parquet, and only then deleted
+in small batches. Files are laid out hive-style, one directory per month:
+
+    <LOG_ARCHIVE['ROOT']>/<dataset>/month=YYYY-MM/part-<stamp>.parquet
+
+Workouts are archived together with their exercises and sets (flattened, with
+the parent workout's user and date); deleting the workout cascades to both.
+
+Before a batch is deleted, what it contributed to cumulative stats (training
+volume, completed workouts, diet log count) is folded into ArchivedTotals in
+the same transaction, so RPG levels and count achievements never drop.
+
+A month is safe to re-run: ids already present in its files are skipped on
+write and deleted from the database, so a crash between writing and deleting
+never produces duplicates.
+
+``query_archive`` / ``iter_archive`` / ``summarize`` are the read path for long-range analytics.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models.dietLogs import DietLog
+from ..models.waterIntake import WaterIntake
+from ..models.waterIntakeLogs import WaterIntakeLog
+from ..models.workoutExercises import WorkoutExercise
+from ..models.workoutSessions import Workout
+from ..models.workoutSet import ExerciseSet
+from . import achievements, changeFeed, rpgScoring
+
+CHUNK_SIZE = 5000
+DELETE_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class Dataset:
+    name: str
+    model: type
+    date_path: str             # lookup to the archived row's date
+    user_path: str = 'user'    # lookup to the owning user
+    delete: bool = True        # False: removed by cascade from its parent
+    carry_over: object = None  # fold(queryset of rows about to be deleted) into ArchivedTotals
+
+
+DATASETS = {
+    d.name: d for d in [
+        Dataset('diet_logs', DietLog, 'date', carry_over=achievements.archive_diet_logs),
+        Dataset('water_intake', WaterIntake, 'date'),
+        Dataset('water_intake_logs', WaterIntakeLog, 'date'),
+        Dataset('exercise_sets', ExerciseSet, 'workout_exercise__workout__date',
+                'workout_exercise__workout__user', delete=False),
+        Dataset('workout_exercises', WorkoutExercise, 'workout__date', 'workout__user', delete=False),
+        Dataset('workouts', Workout, 'date', carry_over=rpgScoring.archive_workouts),
+    ]
+}
+
+# Archived and deleted together; children first so nothing is lost to the cascade
+GROUPS = [
+    ['diet_logs'],
+    ['water_intake'],
+    ['water_intake_logs'],
+    ['exercise_sets', 'workout_exercises', 'workouts'],
+]
+
+
+def archive_root():
+    return settings.LOG_ARCHIVE['ROOT']
+
+
+# --- 1. SCHEMA ---
+
+def _resolve_field(model, path):
+    field = None
+    for part in path.split('__'):
+        field = model._meta.get_field(part)
+        model = field.related_model
+    return field
+
+
+def _arrow_type(field):
+    if field.is_relation:
+        return _arrow_type(field.target_field)
+    if isinstance(field, models.DateTimeField):
+        return pa.timestamp('us', tz='UTC')
+    if isinstance(field, models.DateField):
+        return pa.date32()
+    if isinstance(field, models.BooleanField):
+        return pa.bool_()
+    if isinstance(field, (models.DecimalField, models.FloatField)):
+        return pa.float64()
+    if isinstance(field, (models.IntegerField, models.AutoField)):
+        return pa.int64()
+    return pa.string()  # UUID, char, text, JSON
+
+
+def _columns(dataset):
+    """
+    [(column, field)]: the row's own concrete columns plus ``user_id`` / ``date``
+    of the owning workout for child rows.
+    """
+    columns = [(field.attname, field) for field in dataset.model._meta.concrete_fields]
+    names = {name for name, _ in columns}
+    if 'user_id' not in names:
+        columns.append(('user_id', _resolve_field(dataset.model, dataset.user_path)))
+    if 'date' not in names:
+        columns.append(('date', _resolve_field(dataset.model, dataset.date_path)))
+    return columns
+
+
+def _values(queryset, dataset):
+    own = [field.attname for field in dataset.model._meta.concrete_fields]
+    extra = {name: F(f"{dataset.user_path}_id" if name == 'user_id' else dataset.date_path)
+             for name, _ in _columns(dataset) if name not in own}
+    return queryset.values(*own, **extra)
+
+
+def _schema(dataset):
+    return pa.schema([pa.field(name, _arrow_type(field)) for name, field in _columns(dataset)])
+
+
+def _to_arrow(value):
+    if value is None or isinstance(value, (bool, int, float, str, date)):
+        return value
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)  # UUID
+
+
+# --- 2. WRITE PATH ---
+
+def _add_months(day, months):
+    years, month = divmod(day.month - 1 + months, 12)
+    return date(day.year + years, month + 1, 1)
+
+
+def _month_dir(dataset, month):
+    return os.path.join(archive_root(), dataset.name, f"month={month:%Y-%m}")
+
+
+def _archived_ids(directory):
+    if not os.path.isdir(directory):
+        return set()
+    ids = set()
+    for name in os.listdir(directory):
+        if name.endswith('.parquet'):
+            ids.update(pq.read_table(os.path.join(directory, name), columns=['id']).column('id').to_pylist())
+    return ids
+
+
+def _month_queryset(dataset, month):
+    return dataset.model.objects.filter(**{
+        f"{dataset.date_path}__gte": month,
+        f"{dataset.date_path}__lt": _add_months(month, 1),
+    }).order_by()
+
+
+def archive_dataset_month(dataset, month, chunk_size=CHUNK_SIZE, dry_run=False):
+    """
+    Stream one month of ``dataset`` into a new Parquet file.
+    Returns the primary keys now safely on disk (including earlier runs' rows still in the DB).
+    """
+    directory = _month_dir(dataset, month)
+    already = _archived_ids(directory)
+    schema = _schema(dataset)
+    rows = _values(_month_queryset(dataset, month), dataset).iterator(chunk_size=chunk_size)
+
+    archived, buffer, writer = [], [], None
+    final_name = f"part-{timezone.now():%Y%m%d%H%M%S%f}.parquet"
+    tmp_path = os.path.join(directory, f".{final_name}.tmp")
+
+    def flush():
+        nonlocal writer
+        if writer is None:
+            os.makedirs(directory, exist_ok=True)
+            writer = pq.ParquetWriter(tmp_path, schema, compression=settings.LOG_ARCHIVE['COMPRESSION'])
+        writer.write_table(pa.Table.from_pylist(buffer, schema=schema))
+        buffer.clear()
+
+    try:
+        for row in rows:
+            row = {key: _to_arrow(value) for key, value in row.items()}
+            archived.append(row['id'])
+            if row['id'] in already or dry_run:
+                continue
+            buffer.append(row)
+            if len(buffer) >= chunk_size:
+                flush()
+        if buffer:
+            flush()
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is not None:
+        # Durable before anything is deleted
+        with open(tmp_path, 'rb') as handle:
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, os.path.join(directory, final_name))
+
+    return archived
+
+
+def delete_archived(dataset, month, ids, batch_size=DELETE_BATCH_SIZE):
+    deleted = 0
+    queryset = _month_queryset(dataset, month)  # keeps the date range so Postgres can prune partitions
+    for start in range(0, len(ids), batch_size):
+        # Archived rows leave the database, not the user's history: no sync tombstones
+        with transaction.atomic(), changeFeed.suppressed():
+            batch = queryset.filter(pk__in=ids[start:start + batch_size])
+            if dataset.carry_over:
+                dataset.carry_over(batch)
+            count, _ = batch.delete()
+        deleted += count
+    return deleted
+
+
+def months_to_archive(dataset, cutoff):
+    return list(
+        dataset.model.objects.filter(**{f"{dataset.date_path}__lt": cutoff}).dates(dataset.date_path, 'month')
+    )
+
+
+def archive_older_than(months, chunk_size=CHUNK_SIZE, dry_run=False, stdout=None):
+    """Archive + delete every whole month before ``months`` months ago. Returns {dataset: rows}."""
+    cutoff = _add_months(timezone.localdate().replace(day=1), -months)
+    totals = {}
+
+    for group in GROUPS:
+        datasets = [DATASETS[name] for name in group]
+        # The group's deletable owner decides which months exist
+        owner = next(d for d in datasets if d.delete)
+        for month in months_to_archive(owner, cutoff):
+            archived = {d.name: archive_dataset_month(d, month, chunk_size, dry_run) for d in datasets}
+            for d in datasets:
+                totals[d.name] = totals.get(d.name, 0) + len(archived[d.name])
+                if d.delete and not dry_run:
+                    delete_archived(d, month, archived[d.name])
+            if stdout:
+                stdout.write(f"📦 {month:%Y-%m}: " + ", ".join(f"{n}={len(ids)}" for n, ids in archived.items()))
+
+    return totals
+
+
+# --- 3. READ PATH ---
+
+def _open(dataset_name):
+    path = os.path.join(archive_root(), dataset_name)
+    if not os.path.isdir(path):
+        return None
+    return ds.dataset(
+        path,
+        schema=_schema(DATASETS[dataset_name]).append(pa.field('month', pa.string())),
+        format='parquet',
+        partitioning=ds.partitioning(pa.schema([('month', pa.string())]), flavor='hive'),
+        exclude_invalid_files=True,
+    )
+
+
+def _filter(start=None, end=None, user_id=None):
+    expr, clauses = None, []
+    if start:
+        clauses += [ds.field('month') >= f"{start:%Y-%m}", ds.field('date') >= start]
+    if end:
+        clauses += [ds.field('month') <= f"{end:%Y-%m}", ds.field('date') <= end]
+    if user_id:
+        clauses.append(ds.field('user_id') == str(user_id))
+    for clause in clauses:
+        expr = clause if expr is None else expr & clause
+    return expr
+
+
+def query_archive(dataset_name, start=None, end=None, user_id=None, columns=None):
+    """Archived rows as a pyarrow Table; month directories outside [start, end] are never opened."""
+    dataset = _open(dataset_name)
+    schema = _schema(DATASETS[dataset_name])
+    if dataset is None:
+        return schema.empty_table() if columns is None else schema.empty_table().select(columns)
+    return dataset.to_table(columns=columns or schema.names, filter=_filter(start, end, user_id))
+
+
+def iter_archive(dataset_name, user_id=None, batch_size=CHUNK_SIZE):
+    """Archived rows as dicts, one record batch in memory at a time."""
+    dataset = _open(dataset_name)
+    if dataset is None:
+        return
+    columns = _schema(DATASETS[dataset_name]).names
+    for batch in dataset.to_batches(columns=columns, filter=_filter(user_id=user_id), batch_size=batch_size):
+        yield from batch.to_pylist()
+
+
+def summarize(dataset_name, group_by, sums, start=None, end=None, user_id=None):
+    """
+    Sum ``sums`` columns per ``group_by`` key, e.g. monthly water per user:
+        summarize('water_intake', ['user_id', 'month'], ['current_intake_ml'])
+    """
+    dataset = _open(dataset_name)
+    if dataset is None:
+        return []
+    table = dataset.to_table(columns=list(group_by) + list(sums), filter=_filter(start, end, user_id))
+    result = table.group_by(group_by).aggregate([(column, 'sum') for column in sums])
+    return result.sort_by([(key, 'ascending') for key in group_by]).to_pylist()
@@ -0,0 +1,85 @@
+"""
+Request schemas for the water and diet log endpoints.
+
+Bodies are decoded and validated in one pass straight from the raw bytes
+(``Model.model_validate_json(request.body)``), with unit suffixes handled by
+the field types:
+
+    Millilitres  250 | "250" | "250ml" | "0.5 L" | "8 fl oz"
+    Grams        12 | "12g" | "12.5 g" | "0.1kg"
+    Kilocalories 300 | "300kcal" | "300 cal"
+
+Anything else is a 400 listing each bad field, instead of silently logging 0.
+A diet entry can instead describe what was eaten ("foods": "2 eggs + toast")
+and have its macros looked up (services/foodDatabase.py).
+"""
+
+import math
+import re
+from typing import Annotated, Literal
+from uuid import UUID
+
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, ValidationError
+
+_QUANTITY = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([a-z ]*?)\s*$")
+
+ML_PER_UNIT = {"": 1, "ml": 1, "l": 1000, "oz": 29.5735, "fl oz": 29.5735}
+G_PER_UNIT = {"": 1, "g": 1, "kg": 1000}
+KCAL_PER_UNIT = {"": 1, "kcal": 1, "cal": 1}
+
+
+def _unit_parser(units, name):
+    def parse(value):
+        if isinstance(value, bool) or (isinstance(value, float) and not math.isfinite(value)):
+            raise ValueError(f"expected a number of {name}")
+        if isinstance(value, (int, float)):
+            return round(value)
+        if isinstance(value, str):
+            match = _QUANTITY.match(value.lower())
+            if match and match.group(2) in units:
+                return round(float(match.group(1)) * units[match.group(2)])
+        raise ValueError(f"expected a number of {name}, optionally suffixed with {'/'.join(u for u in units if u)}")
+    return parse
+
+
+Millilitres = Annotated[int, BeforeValidator(_unit_parser(ML_PER_UNIT, "millilitres")), Field(gt=0, le=5000)]
+Grams = Annotated[int, BeforeValidator(_unit_parser(G_PER_UNIT, "grams")), Field(ge=0, le=2000)]
+Kilocalories = Annotated[int, BeforeValidator(_unit_parser(KCAL_PER_UNIT, "kcal")), Field(ge=0, le=10000)]
+
+
+class _Schema(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+
+class WaterEntry(_Schema):
+    amount: Millilitres
+
+
+class WaterLogRequest(_Schema):
+    userID: UUID
+    messages: WaterEntry
+
+
+class DietEntry(_Schema):
+    title: str = Field(default="Unknown Meal", min_length=1, max_length=200)
+    calories: Kilocalories = 0
+    protein: Grams = 0
+    carbs: Grams = 0
+    fat: Grams = 0
+    time: str = Field(default="", max_length=10)  # e.g. "08:30"
+    period: Annotated[Literal["AM", "PM", ""], BeforeValidator(lambda v: v.upper() if isinstance(v, str) else v)] = ""
+    # "2 eggs + toast": macros come from the nutrition database instead of the fields above
+    foods: str | None = Field(default=None, min_length=1, max_length=500)
+
+
+class DietLogRequest(_Schema):
+    userID: UUID
+    messages: DietEntry
+
+
+def error_details(error: ValidationError):
+    """Compact, JSON-safe per-field errors for a 400 body."""
+    return [
+        {"field": ".".join(str(part) for part in e["loc"]), "error": e["msg"]}
+        for e in error.errors(include_url=False, include_context=False)
+    ]
@@ -0,0 +1,221 @@
+"""
+Daily calorie, macro and water targets derived from the profile.
+
+    BMR     Mifflin-St Jeor: 10*kg + 6.25*cm - 5*age + (5 male | -161 female | -78 other)
+    TDEE    BMR * activity factor (1.2 sedentary ... 1.9 extreme)
+    kcal    TDEE adjusted for the goal read from primaryGoal (cut -20%, bulk +10%)
+    macros  protein g/kg by goal, fat 25% of kcal, carbs the rest
+    water   35 ml/kg + an activity allowance, 1.5-5 L
+
+Results are stored in NutritionTargets and recomputed only when one of the
+inputs changes (signals.py -> ``profile_saved`` compares an inputs hash).
+They ride along in the cached profile snapshot (profileCache), so the
+dashboard, the water log and the chat context read them with no math and no
+query. Missing inputs fall back to population defaults, listed in ``assumed``.
+Whole-table recomputes are vectorised over blocks of users, as in rpgScoring.
+"""
+
+import hashlib
+import re
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from ..models.appUsers import AppUsers, NutritionTargets
+from ..models.waterIntake import WaterIntake
+from . import changeFeed, dashboard, profileCache, realtime
+
+USER_BLOCK_SIZE = 2000
+FORMULA_VERSION = 1   # bump to force a recompute after changing the maths below
+
+# Fields of AppUsers the targets depend on; saves touching none of them are skipped
+INPUT_FIELDS = ('height', 'weight', 'date_of_birth', 'gender', 'activityLevel', 'primaryGoal')
+DEFAULTS = {'weight': 70.0, 'height': 170.0, 'age': 30}
+DEFAULT_WATER_GOAL_ML = 3000
+
+ACTIVITY_FACTORS = {'sedentary': 1.2, 'light': 1.375, 'moderate': 1.55, 'very': 1.725, 'extreme': 1.9}
+ACTIVITY_WATER_ML = {'sedentary': 0, 'light': 250, 'moderate': 500, 'very': 750, 'extreme': 1000}
+SEX_OFFSET = {'M': 5, 'F': -161, 'O': -78}
+
+# goal -> (kcal factor on TDEE, protein g per kg)
+GOALS = {'cut': (0.80, 2.2), 'bulk': (1.10, 1.8), 'recomp': (1.00, 2.0), 'maintain': (1.00, 1.6)}
+_CUT = re.compile(r"lose|loss|cut|lean|shred|slim|tone|weight ?down", re.I)
+_BULK = re.compile(r"gain|bulk|mass|muscle|hypertroph|strength|size|powerlift", re.I)
+
+MIN_KCAL = 1200
+FAT_SHARE = 0.25
+WATER_ML_PER_KG = 35
+WATER_RANGE_ML = (1500, 5000)
+
+TARGET_FIELDS = ('bmr_kcal', 'tdee_kcal', 'target_kcal', 'protein_g', 'carbs_g', 'fat_g', 'water_ml')
+
+
+# --- 1. INPUTS ---
+
+def goal_of(primary_goal):
+    cut, bulk = bool(_CUT.search(primary_goal or "")), bool(_BULK.search(primary_goal or ""))
+    return 'recomp' if cut and bulk else 'cut' if cut else 'bulk' if bulk else 'maintain'
+
+
+def inputs(user):
+    """The profile values the targets depend on, as a plain dict (AppUsers instance or with_metrics() values() row)."""
+    get = user.get if isinstance(user, dict) else lambda field: getattr(user, field)
+    return {
+        'weight': get('weight'),
+        'height': get('height'),
+        'age': get('age'),
+        'gender': get('gender'),
+        'activity': get('activityLevel'),
+        'goal': goal_of(get('primaryGoal')),
+    }
+
+
+def inputs_hash(values):
+    key = repr((FORMULA_VERSION, sorted(values.items())))
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+# --- 2. MATHS (vectorised over a block of users) ---
+
+def compute(rows):
+    """[inputs dict] -> [{target field: int, 'assumed': [...]}], one NumPy pass for the whole block."""
+    if not rows:
+        return []
+
+    def column(field):
+        values = [row[field] for row in rows]
+        missing = np.array([v is None or v <= 0 for v in values])
+        filled = np.array([DEFAULTS[field] if m else v for v, m in zip(values, missing)], dtype=float)
+        return filled, missing
+
+    weight, no_weight = column('weight')
+    height, no_height = column('height')
+    age, no_age = column('age')
+    sex = np.array([SEX_OFFSET.get(row['gender'], SEX_OFFSET['O']) for row in rows], dtype=float)
+    factor = np.array([ACTIVITY_FACTORS.get(row['activity'], ACTIVITY_FACTORS['moderate']) for row in rows])
+    water_extra = np.array([ACTIVITY_WATER_ML.get(row['activity'], ACTIVITY_WATER_ML['moderate']) for row in rows])
+    kcal_factor, protein_per_kg = np.array([GOALS[row['goal']] for row in rows]).T
+
+    bmr = 10 * weight + 6.25 * height - 5 * age + sex
+    tdee = bmr * factor
+    kcal = np.maximum(tdee * kcal_factor, MIN_KCAL)
+    protein = protein_per_kg * weight
+    fat = kcal * FAT_SHARE / 9
+    carbs = np.maximum(kcal - protein * 4 - fat * 9, 0) / 4
+    water = np.clip(np.round((WATER_ML_PER_KG * weight + water_extra) / 50) * 50, *WATER_RANGE_ML)
+
+    columns = np.rint(np.stack([bmr, tdee, kcal, protein, carbs, fat, water], axis=1)).astype(int)
+    return [
+        {
+            **dict(zip(TARGET_FIELDS, map(int, values))),
+            'assumed': [name for name, flags in (('weight', no_weight), ('height', no_height), ('age', no_age))
+                        if flags[i]],
+        }
+        for i, values in enumerate(columns)
+    ]
+
+
+# --- 3. STORE ---
+
+def _sync_todays_water_goals(goals):
+    """
+    {user_id: water_ml}: move today's WaterIntake rows (created with the old goal) to the new goals.
+    One UPDATE for all of them; no post_save fires, so the change feed and dashboard are told here.
+    last_updated moves (history ETags), last_intake_at does not: a new goal is not a sip.
+    """
+    now = timezone.now()
+    records = [
+        record for record in WaterIntake.objects.filter(user_id__in=list(goals), date=now.date())
+        if record.daily_goal_ml != goals[record.user_id]
+    ]
+    for record in records:
+        record.daily_goal_ml, record.last_updated = goals[record.user_id], now
+    WaterIntake.objects.bulk_update(records, ['daily_goal_ml', 'last_updated'])
+    for record in records:
+        entry = changeFeed.record(record, changeFeed.UPSERT)
+        if entry:
+            realtime.change(entry, changeFeed.row(record))
+
+
+def _targets_changed(user_ids):
+    # Bulk writes fire no signals: drop the snapshot and the targets/water dashboard sections here
+    sections = dashboard.MODEL_SECTIONS['NutritionTargets']
+    for user_id in user_ids:
+        profileCache.invalidate(user_id)
+        transaction.on_commit(lambda user_id=user_id: dashboard.invalidate(user_id, sections))
+
+
+def refresh(user):
+    """Recompute ``user``'s targets if their inputs changed since last time; returns True if they did."""
+    values = inputs(user)
+    digest = inputs_hash(values)
+    stored = NutritionTargets.objects.filter(user_id=user.pk).values_list('inputs_hash', flat=True).first()
+    if stored == digest:
+        return False
+
+    targets = compute([values])[0]
+    with transaction.atomic():
+        NutritionTargets.objects.update_or_create(user_id=user.pk, defaults={**targets, 'inputs_hash': digest})
+        _sync_todays_water_goals({user.pk: targets['water_ml']})
+        _targets_changed([user.pk])
+    print(f"🎯 Targets for {user.pk}: {targets['target_kcal']} kcal | {targets['water_ml']} ml water")
+    return True
+
+
+def profile_saved(user, update_fields=None):
+    """post_save hook for AppUsers: recompute after commit unless the save cannot have changed an input."""
+    if update_fields is not None and not set(update_fields) & set(INPUT_FIELDS):
+        return
+    transaction.on_commit(lambda: refresh(user))
+
+
+def recompute_block(rows):
+    """Upsert targets for values() rows whose inputs changed; returns how many changed."""
+    values = [inputs(row) for row in rows]
+    digests = [inputs_hash(v) for v in values]
+    stored = dict(
+        NutritionTargets.objects.filter(user_id__in=[row['id'] for row in rows]).values_list('user_id', 'inputs_hash')
+    )
+    changed = [i for i, row in enumerate(rows) if stored.get(row['id']) != digests[i]]
+    if not changed:
+        return 0
+
+    targets = compute([values[i] for i in changed])
+    user_ids = [rows[i]['id'] for i in changed]
+    with transaction.atomic():
+        NutritionTargets.objects.bulk_create(
+            [NutritionTargets(user_id=u, inputs_hash=digests[i], **t) for u, i, t in zip(user_ids, changed, targets)],
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=[*TARGET_FIELDS, 'assumed', 'inputs_hash', 'updated_at'],
+        )
+        _sync_todays_water_goals({u: t['water_ml'] for u, t in zip(user_ids, targets)})
+        _targets_changed(user_ids)
+    return len(changed)
+
+
+def recompute_all(block_size=USER_BLOCK_SIZE):
+    """Backfill / formula change: walk all users in id order, one vectorised block at a time."""
+    users = AppUsers.objects.with_metrics().order_by('id').values('id', *INPUT_FIELDS, 'age')
+    done, last = 0, None
+    while True:
+        block = list((users if last is None else users.filter(id__gt=last))[:block_size])
+        if not block:
+            return done
+        done += recompute_block(block)
+        last = block[-1]['id']
+
+
+# --- 4. READ (from the cached profile snapshot) ---
+
+def water_goal_ml(profile):
+    return profile.targets['water_ml'] if profile is not None and profile.targets else DEFAULT_WATER_GOAL_ML
+
+
+def describe(targets):
+    """One line for the chat system prompt."""
+    if not targets:
+        return "N/A"
+    return (f"{targets['target_kcal']} kcal | protein {targets['protein_g']}g | carbs {targets['carbs_g']}g | "
+            f"fat {targets['fat_g']}g | water {targets['water_ml']} ml")
@@ -0,0 +1,285 @@
+"""
+Monthly range partitioning for the high-volume log tables (Postgres only).
+
+    base_dietlog        PARTITION BY RANGE (date)
+    water_intake_logs   PARTITION BY RANGE (date)
+
+Partitions are named ``<table>_pYYYYMM`` plus a ``<table>_pdefault`` catch-all.
+Queries that filter on the partition column only touch the matching months, so
+recent-range reads stay the same cost as history grows. The ORM is unaware of
+any of this: Django still sees a single table with an ``id`` primary key.
+
+Only tables read by date ranges qualify. exercise_sets is always read by
+workout_exercise_id, so month partitions would never be pruned (every lookup
+would probe each month) and its (workout_exercise, set_number) uniqueness
+could not be enforced; it stays a plain table (migration 0025 reverts it).
+
+Postgres requires the partition key in every unique constraint, so the primary
+key becomes (id, <column>) and unique indexes that lack the column are not
+recreated. ``convert_to_plain`` undoes a conversion and restores them.
+
+On other databases (the SQLite fallback) every function here is a no-op.
+"""
+
+from datetime import date
+
+from django.db import connection as default_connection, transaction
+from django.utils import timezone
+
+MONTHS_AHEAD = 3
+
+
+def partitioned_tables():
+    """db_table -> (partition column, is datetime)"""
+    from ..models.dietLogs import DietLog
+    from ..models.waterIntakeLogs import WaterIntakeLog
+
+    return {
+        DietLog._meta.db_table: ('date', False),
+        WaterIntakeLog._meta.db_table: ('date', False),
+    }
+
+
+# --- 1. HELPERS ---
+
+def _qn(name):
+    return default_connection.ops.quote_name(name)
+
+
+def _add_months(day, months):
+    years, month = divmod(day.month - 1 + months, 12)
+    return date(day.year + years, month + 1, 1)
+
+
+def _bound(day, is_datetime):
+    return f"{day.isoformat()} 00:00:00+00" if is_datetime else day.isoformat()
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y%m}"
+
+
+def _exists(cursor, name):
+    cursor.execute("SELECT to_regclass(%s)", [name])
+    return cursor.fetchone()[0] is not None
+
+
+def is_partitioned(cursor, table):
+    cursor.execute(
+        "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = %s AND c.relnamespace = current_schema()::regnamespace",
+        [table],
+    )
+    return cursor.fetchone() is not None
+
+
+def _supported(connection):
+    return connection.vendor == 'postgresql'
+
+
+# --- 2. PARTITION MANAGEMENT ---
+
+def create_month_partition(cursor, table, column, is_datetime, month):
+    """Create ``<table>_pYYYYMM``; rows already parked in the default partition are moved in."""
+    name = partition_name(table, month)
+    if _exists(cursor, name):
+        return False
+
+    start, end = _bound(month, is_datetime), _bound(_add_months(month, 1), is_datetime)
+    default = f"{table}_pdefault"
+    cursor.execute(
+        f"SELECT 1 FROM {_qn(default)} WHERE {_qn(column)} >= %s AND {_qn(column)} < %s LIMIT 1",
+        [start, end],
+    )
+    stranded = cursor.fetchone() is not None
+
+    if stranded:
+        cursor.execute(f"ALTER TABLE {_qn(table)} DETACH PARTITION {_qn(default)}")
+    cursor.execute(
+        f"CREATE TABLE {_qn(name)} PARTITION OF {_qn(table)} FOR VALUES FROM (%s) TO (%s)", [start, end]
+    )
+    if stranded:
+        cursor.execute(
+            f"INSERT INTO {_qn(table)} SELECT * FROM {_qn(default)} "
+            f"WHERE {_qn(column)} >= %s AND {_qn(column)} < %s", [start, end],
+        )
+        cursor.execute(
+            f"DELETE FROM {_qn(default)} WHERE {_qn(column)} >= %s AND {_qn(column)} < %s", [start, end]
+        )
+        cursor.execute(f"ALTER TABLE {_qn(table)} ATTACH PARTITION {_qn(default)} DEFAULT")
+    return True
+
+
+def ensure_partitions(months_ahead=MONTHS_AHEAD, connection=default_connection):
+    """Create partitions from the current month through ``months_ahead`` months out."""
+    if not _supported(connection):
+        return []
+    created = []
+    this_month = timezone.localdate().replace(day=1)
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        for table, (column, is_datetime) in partitioned_tables().items():
+            if not is_partitioned(cursor, table):
+                continue
+            for offset in range(months_ahead + 1):
+                month = _add_months(this_month, offset)
+                if create_month_partition(cursor, table, column, is_datetime, month):
+                    created.append(partition_name(table, month))
+    return created
+
+
+def list_partitions(cursor, table):
+    cursor.execute(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = %s::regclass ORDER BY c.relname",
+        [table],
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def detach_old_partitions(older_than_months, drop=False, connection=default_connection):
+    """
+    Detach month partitions that end before ``older_than_months`` ago.
+    Detached partitions stay as standalone tables (ready for archival) unless ``drop``.
+    """
+    if not _supported(connection):
+        return []
+    cutoff = _add_months(timezone.localdate().replace(day=1), -older_than_months)
+    cutoff_name = f"p{cutoff:%Y%m}"
+    detached = []
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        for table in partitioned_tables():
+            if not is_partitioned(cursor, table):
+                continue
+            for name in list_partitions(cursor, table):
+                suffix = name[len(table) + 1:]
+                if suffix == 'pdefault' or suffix >= cutoff_name:
+                    continue
+                cursor.execute(f"ALTER TABLE {_qn(table)} DETACH PARTITION {_qn(name)}")
+                if drop:
+                    cursor.execute(f"DROP TABLE {_qn(name)}")
+                detached.append(name)
+    return detached
+
+
+# --- 3. ONE-OFF CONVERSIONS (used by migrations 0014 and 0025) ---
+
+def _secondary_indexes(cursor, table):
+    cursor.execute(
+        "SELECT i.indexname, i.indexdef, x.indisunique FROM pg_indexes i "
+        "JOIN pg_class c ON c.relname = i.indexname AND c.relnamespace = current_schema()::regnamespace "
+        "JOIN pg_index x ON x.indexrelid = c.oid "
+        "WHERE i.tablename = %s AND i.schemaname = current_schema() AND NOT x.indisprimary",
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def _foreign_keys(cursor, table):
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype = 'f'",
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def convert_to_partitioned(schema_editor, table, column, is_datetime, months_ahead=MONTHS_AHEAD):
+    """Rebuild ``table`` as a monthly-partitioned table with the same columns, data, indexes and FKs."""
+    connection = schema_editor.connection
+    if not _supported(connection):
+        return
+    legacy = f"{table}_legacy"
+
+    with connection.cursor() as cursor:
+        if is_partitioned(cursor, table):
+            return
+
+        # Secondary indexes and FKs, to be recreated on the partitioned parent
+        indexes = _secondary_indexes(cursor, table)
+        foreign_keys = _foreign_keys(cursor, table)
+        cursor.execute(
+            "SELECT data_type, column_default IS NOT NULL OR is_identity = 'YES' "
+            "FROM information_schema.columns WHERE table_name = %s AND column_name = 'id' "
+            "AND table_schema = current_schema()",
+            [table],
+        )
+        id_type, id_generated = cursor.fetchone()
+        cursor.execute(f"SELECT MIN({_qn(column)}) FROM {_qn(table)}")
+        oldest = cursor.fetchone()[0]
+
+        cursor.execute(f"ALTER TABLE {_qn(table)} RENAME TO {_qn(legacy)}")
+        cursor.execute(
+            f"CREATE TABLE {_qn(table)} (LIKE {_qn(legacy)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE ({_qn(column)})"
+        )
+        if id_generated:
+            # Integer ids: a plain sequence replaces the legacy identity column
+            sequence = f"{table}_id_seq"
+            cursor.execute(f"CREATE SEQUENCE IF NOT EXISTS {_qn(sequence)} AS {id_type} OWNED BY {_qn(table)}.id")
+            cursor.execute(f"ALTER TABLE {_qn(table)} ALTER COLUMN id SET DEFAULT nextval(%s::regclass)", [sequence])
+
+        cursor.execute(f"CREATE TABLE {_qn(table + '_pdefault')} PARTITION OF {_qn(table)} DEFAULT")
+        first_month = (timezone.localtime(oldest).date() if is_datetime else oldest) if oldest else None
+        month = (first_month or timezone.localdate()).replace(day=1)
+        last_month = _add_months(timezone.localdate().replace(day=1), months_ahead)
+        while month <= last_month:
+            create_month_partition(cursor, table, column, is_datetime, month)
+            month = _add_months(month, 1)
+
+        cursor.execute(f"INSERT INTO {_qn(table)} SELECT * FROM {_qn(legacy)}")
+        if id_generated:
+            cursor.execute(
+                f"SELECT setval(%s::regclass, COALESCE((SELECT MAX(id) FROM {_qn(table)}), 0) + 1, false)",
+                [sequence],
+            )
+        cursor.execute(f"DROP TABLE {_qn(legacy)}")
+
+        cursor.execute(f"ALTER TABLE {_qn(table)} ADD PRIMARY KEY (id, {_qn(column)})")
+        for name, definition, unique in indexes:
+            if unique and column not in definition:
+                continue  # Postgres cannot enforce it across partitions
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {_qn(table)} ADD CONSTRAINT {_qn(name)} {definition}")
+
+
+def convert_to_plain(schema_editor, model):
+    """
+    Reverse of ``convert_to_partitioned``: rebuild ``model``'s table as a plain table with an ``id``
+    primary key, its indexes and FKs, and the unique_together constraints partitioning had to drop.
+    """
+    connection = schema_editor.connection
+    if not _supported(connection):
+        return
+    table = model._meta.db_table
+    partitioned = f"{table}_partitioned"
+
+    with connection.cursor() as cursor:
+        if not is_partitioned(cursor, table):
+            return
+        indexes = _secondary_indexes(cursor, table)
+        foreign_keys = _foreign_keys(cursor, table)
+
+        cursor.execute(f"ALTER TABLE {_qn(table)} RENAME TO {_qn(partitioned)}")
+        cursor.execute(
+            f"CREATE TABLE {_qn(table)} (LIKE {_qn(partitioned)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        cursor.execute(f"INSERT INTO {_qn(table)} SELECT * FROM {_qn(partitioned)}")
+        sequence = f"{table}_id_seq"
+        if _exists(cursor, sequence):
+            # Owned by the partitioned parent: would be dropped with it
+            cursor.execute(f"ALTER SEQUENCE {_qn(sequence)} OWNED BY {_qn(table)}.id")
+        # Takes its partitions, indexes and FKs with it; their names are free again below
+        cursor.execute(f"DROP TABLE {_qn(partitioned)}")
+
+        cursor.execute(f"ALTER TABLE {_qn(table)} ADD PRIMARY KEY (id)")
+        for name, definition, unique in indexes:
+            cursor.execute(definition.replace(" ON ONLY ", " ON ", 1))
+        for name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {_qn(table)} ADD CONSTRAINT {_qn(name)} {definition}")
+        constraints = connection.introspection.get_constraints(cursor, table)
+
+    for fields in model._meta.unique_together:
+        columns = [model._meta.get_field(field).column for field in fields]
+        if not any(c['unique'] and c['columns'] == columns for c in constraints.values()):
+            schema_editor.alter_unique_together(model, [], [fields])
@@ -0,0 +1,145 @@
+"""
+Read-through cache for AppUsers profiles.
+
+Hot paths (log endpoints, chat context) only need a handful of profile fields
+plus the stored nutrition targets. They are cached as a compact positional
+JSON snapshot:
+
+    L1: per-process LRU with TTL (no I/O at all)
+    L2: optional shared Django cache alias, e.g. a local file cache shared by
+        workers on one host (settings.PROFILE_CACHE['L2_ALIAS'])
+
+``AppUsers.save()``/``delete()`` invalidate both levels after commit. Other
+processes' L1 copies expire via the TTL.
+"""
+
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+PROFILE_FIELDS = (
+    'id', 'username', 'firstName', 'lastName', 'gender', 'country',
+    'height', 'weight', 'activityLevel', 'primaryGoal', 'protocol',
+)
+# Stored daily goals (services/nutritionTargets.py), joined in: profile.targets is a dict or None
+TARGET_FIELDS = ('target_kcal', 'protein_g', 'carbs_g', 'fat_g', 'water_ml')
+Profile = namedtuple('Profile', PROFILE_FIELDS + ('targets',))
+
+_config = getattr(settings, 'PROFILE_CACHE', {})
+TTL_SECONDS = _config.get('TTL_SECONDS', 300)
+L1_MAX_ENTRIES = _config.get('L1_MAX_ENTRIES', 10000)
+L2_ALIAS = _config.get('L2_ALIAS')
+KEY_PREFIX = "profile:v2:"
+
+
+class LRUCache:
+    """Small thread-safe LRU with per-entry expiry."""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_l1 = LRUCache(L1_MAX_ENTRIES, TTL_SECONDS)
+
+
+def _l2():
+    return caches[L2_ALIAS] if L2_ALIAS else None
+
+
+def _encode(row):
+    targets = {f: row[f'nutrition_targets__{f}'] for f in TARGET_FIELDS}
+    values = [str(row['id'])] + [row[f] for f in PROFILE_FIELDS[1:]]
+    values.append(targets if targets['target_kcal'] is not None else None)
+    return json.dumps(values, separators=(',', ':'))
+
+
+def _decode(blob):
+    return Profile(*json.loads(blob))
+
+
+def _normalise(user_id):
+    try:
+        return str(uuid.UUID(str(user_id)))
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def get_profile(user_id):
+    """Profile snapshot for ``user_id`` or None if no such user."""
+    key = _normalise(user_id)
+    if key is None:
+        return None
+
+    profile = _l1.get(key)
+    if profile is not None:
+        return profile
+
+    l2 = _l2()
+    blob = l2.get(KEY_PREFIX + key) if l2 else None
+    if blob is None:
+        from ..models.appUsers import AppUsers  # models import this module from save()
+
+        row = AppUsers.objects.filter(id=key).values(
+            *PROFILE_FIELDS, *(f'nutrition_targets__{f}' for f in TARGET_FIELDS)
+        ).first()
+        if row is None:
+            return None
+        blob = _encode(row)
+        if l2:
+            l2.set(KEY_PREFIX + key, blob, TTL_SECONDS)
+
+    profile = _decode(blob)
+    _l1.set(key, profile)
+    return profile
+
+
+def invalidate(user_id):
+    """Drop a user's snapshot now and again after the current transaction commits."""
+    key = _normalise(user_id)
+    if key is None:
+        return
+
+    def drop():
+        _l1.delete(key)
+        l2 = _l2()
+        if l2:
+            l2.delete(KEY_PREFIX + key)
+
+    drop()
+    transaction.on_commit(drop)
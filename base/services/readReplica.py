@@ -0,0 +1,180 @@
+"""
+Read-replica routing for heavy analytics reads.
+
+Only code that opts in is routed; everything else stays on ``default``:
+
+    with readReplica.analytics_reads(user_id):
+        plans = recent_plans(user_id, 10)
+
+Inside the block, reads go to settings.READ_REPLICA['ALIAS'] unless
+    - no replica is configured (REPLICA_DATABASE_URL unset),
+    - the replica is lagging more than MAX_LAG_SECONDS (or unreachable),
+    - the user wrote something in the last STICKY_SECONDS (read-your-writes),
+    - the primary has an open transaction (reads must see its own writes).
+
+Generators that outlive the block (streaming responses) should pin their
+querysets with ``.using(alias_for(user_id))`` instead.
+
+Writes never go to the replica. Lag is probed at most every
+LAG_CHECK_INTERVAL seconds per process. Stickiness lives in a Django cache
+alias that every worker must see (the next read can land on any of them);
+a per-process cache fails the system check below.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import ContextDecorator
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_config = getattr(settings, 'READ_REPLICA', {})
+ALIAS = _config.get('ALIAS', 'replica')
+MAX_LAG_SECONDS = _config.get('MAX_LAG_SECONDS', 5)
+LAG_CHECK_INTERVAL = _config.get('LAG_CHECK_INTERVAL', 2)
+STICKY_SECONDS = _config.get('STICKY_SECONDS', 10)
+STICKY_CACHE = _config.get('STICKY_CACHE', 'default')
+MIGRATE = _config.get('MIGRATE', False)  # only for a standalone local copy
+KEY_PREFIX = "replica:sticky:"
+
+# None outside analytics_reads(); otherwise (user_id or None,)
+_scope = contextvars.ContextVar('analytics_reads', default=None)
+
+
+def enabled():
+    return ALIAS in settings.DATABASES
+
+
+# --- 1. READ-YOUR-WRITES ---
+
+def mark_write(user_id):
+    """Pin ``user_id``'s analytics reads to the primary for STICKY_SECONDS."""
+    if user_id and enabled():
+        caches[STICKY_CACHE].set(f"{KEY_PREFIX}{user_id}", 1, STICKY_SECONDS)
+
+
+def is_sticky(user_id):
+    return bool(user_id) and caches[STICKY_CACHE].get(f"{KEY_PREFIX}{user_id}") is not None
+
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@checks.register()
+def check_sticky_cache(app_configs=None, **kwargs):
+    if not enabled():
+        return []
+    backend = settings.CACHES.get(STICKY_CACHE, {}).get('BACKEND')
+    if backend is None or backend in PROCESS_LOCAL_CACHES:
+        return [checks.Error(
+            f"READ_REPLICA['STICKY_CACHE'] ({STICKY_CACHE!r}) is not a cache shared between worker processes",
+            hint="Use a file-based, Redis or Memcached cache alias, or a write on one worker will not pin "
+                 "reads served by another.",
+            id='base.E001',
+        )]
+    return []
+
+
+# --- 2. LAG PROBE ---
+
+def _postgres_lag(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT CASE WHEN NOT pg_is_in_recovery() "
+            "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+            "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+        )
+        return float(cursor.fetchone()[0])
+
+
+def _default_probe(connection):
+    # Non-Postgres replicas (e.g. a second local SQLite file) report no lag
+    return _postgres_lag(connection) if connection.vendor == 'postgresql' else 0.0
+
+
+class LagMonitor:
+    """Caches the replica's lag for LAG_CHECK_INTERVAL; an error counts as infinitely behind."""
+
+    def __init__(self, probe=_default_probe):
+        self.probe = probe
+        self._checked_at = None
+        self._lag = float('inf')
+        self._lock = threading.Lock()
+
+    def lag(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._checked_at is None or now - self._checked_at >= LAG_CHECK_INTERVAL:
+                try:
+                    self._lag = self.probe(connections[ALIAS])
+                except Exception as e:
+                    print(f"⚠️ Replica lag probe failed, reading from primary: {e}")
+                    self._lag = float('inf')
+                self._checked_at = now
+            return self._lag
+
+    def healthy(self):
+        return self.lag() <= MAX_LAG_SECONDS
+
+    def reset(self):
+        with self._lock:
+            self._checked_at = None
+
+
+monitor = LagMonitor()
+
+
+# --- 3. OPT-IN SCOPE + ROUTER ---
+
+class analytics_reads(ContextDecorator):
+    """Context manager / decorator marking reads as replica-safe for ``user_id`` (optional)."""
+
+    def __init__(self, user_id=None):
+        self.user_id = user_id
+        self._tokens = []
+
+    def __enter__(self):
+        self._tokens.append(_scope.set((self.user_id,)))
+        return self
+
+    def __exit__(self, *exc):
+        _scope.reset(self._tokens.pop())
+        return False
+
+
+def alias_for(user_id=None):
+    """Where an analytics read for ``user_id`` should go right now (for explicit ``.using()``)."""
+    if not enabled() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return DEFAULT_DB_ALIAS
+    if is_sticky(user_id) or not monitor.healthy():
+        return DEFAULT_DB_ALIAS
+    return ALIAS
+
+
+class ReplicaRouter:
+    """settings.DATABASE_ROUTERS entry; only reads inside analytics_reads() leave the primary."""
+
+    def db_for_read(self, model, **hints):
+        scope = _scope.get()
+        if scope is None:
+            return None  # Django's default: the instance's own db, else default
+        return alias_for(scope[0])
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Same data on both aliases
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # A real replica receives schema changes through replication
+        if db == ALIAS and not MIGRATE:
+            return False
+        return None
@@ -0,0 +1,98 @@
+"""
+Per-user real-time push over WebSockets (consumer: base/consumers.py).
+
+Every socket a user opens (phone, watch, web) joins the group ``user.<id>``;
+whatever is published for that user reaches all of them:
+
+    ws://<host>/ws/v1/stream/?userID=<uuid>
+
+    {"type": "change", "seq": 812, "table": "water_intake", "op": "upsert", "row": {...}}
+    {"type": "change", "seq": 813, "table": "diet_logs", "op": "delete", "id": "41"}
+    {"type": "chat.token", "chat_id": "...", "token": "Drink"}
+    {"type": "chat.done", "chat_id": "..."}
+
+``change`` events have the same shape as the entries of the sync feed
+(services/changeFeed.py), so a client applies both with one handler and
+falls back to sync/?cursor= after a reconnect.
+
+Messages are encoded once per publish, not once per socket. The channel
+layer is settings.CHANNEL_LAYERS: in-memory by default (``ChannelLayer``
+below), so a push only reaches sockets served by the same process; set
+CHANNEL_REDIS_URL to use a local Redis broker between processes.
+Publishing never fails the write that triggered it.
+"""
+
+import time
+
+from asgiref.sync import async_to_sync
+from channels.layers import InMemoryChannelLayer, get_channel_layer
+from django.db import transaction
+
+from ..renderers import dumps
+from . import changeFeed
+
+GROUP_PREFIX = "user."
+HANDLER = "user.push"  # UserStreamConsumer.user_push
+
+
+def group_for(user_id):
+    return f"{GROUP_PREFIX}{user_id}"
+
+
+# --- 1. CHANNEL LAYER ---
+
+class ChannelLayer(InMemoryChannelLayer):
+    """
+    The stock in-memory layer sweeps every channel and group membership for
+    expiry on each receive() and group_send(): O(sockets) per message, and
+    O(sockets²) while thousands of idle sockets connect. Sweep at most once
+    per ``clean_interval`` seconds instead.
+    """
+
+    def __init__(self, clean_interval=5, **kwargs):
+        super().__init__(**kwargs)
+        self.clean_interval = clean_interval
+        self._cleaned_at = 0.0
+
+    def _clean_expired(self):
+        now = time.monotonic()
+        if now - self._cleaned_at < self.clean_interval:
+            return
+        self._cleaned_at = now
+        super()._clean_expired()
+
+
+# --- 2. PUBLISH ---
+
+def publish(user_id, event, **data):
+    """Send ``{"type": event, **data}`` to every open socket of ``user_id``."""
+    layer = get_channel_layer()
+    if layer is None or not user_id:
+        return
+    try:
+        text = dumps({"type": event, **data}).decode()
+        async_to_sync(layer.group_send)(group_for(user_id), {"type": HANDLER, "text": text})
+    except Exception as e:
+        print(f"⚠️ Realtime push failed for {user_id}: {e}")
+
+
+def publish_on_commit(user_id, event, **data):
+    transaction.on_commit(lambda: publish(user_id, event, **data))
+
+
+# --- 3. EVENTS ---
+
+def change(entry, row=None):
+    """A synced row changed: ``entry`` is its new ChangeLog entry, ``row`` the current data for upserts."""
+    if entry.op == changeFeed.DELETE:
+        publish_on_commit(entry.user_id, "change", seq=entry.seq, table=entry.table, op="delete", id=entry.row_id)
+    else:
+        publish_on_commit(entry.user_id, "change", seq=entry.seq, table=entry.table, op="upsert", row=row)
+
+
+def chat_token(user_id, chat_id, token):
+    publish(user_id, "chat.token", chat_id=chat_id, token=token)
+
+
+def chat_done(user_id, chat_id):
+    publish(user_id, "chat.done", chat_id=chat_id)
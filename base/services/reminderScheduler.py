@@ -0,0 +1,239 @@
+"""
+Reminder scheduling engine.
+
+Active reminders are loaded once into a min-heap keyed by their next fire time.
+The dispatcher sleeps until the head of the heap is due (or a change arrives),
+pops everything that is due and hands it to a sink in batches. Edits are applied
+incrementally: in-process saves/deletes arrive through signals, edits made by
+other processes are picked up from the indexed ``updated_at`` column, re-scanning
+a SYNC_OVERLAP window so rows committed late (stamped before the last sync) are
+not missed. Reminders found deleted or inactive when due are dropped, not re-armed.
+"""
+
+import heapq
+import itertools
+import json
+import queue
+import threading
+from datetime import datetime, timedelta
+
+from django.utils import timezone
+
+from ..models.reminders import Reminder
+
+BATCH_SIZE = 200
+SYNC_INTERVAL_SECONDS = 30
+SYNC_OVERLAP = timedelta(minutes=2)   # longer than any transaction that saves a reminder
+SPEC_FIELDS = ('id', 'user_id', 'type', 'title', 'message', 'time', 'days_of_week', 'updated_at')
+
+_active_scheduler = None
+
+
+# --- 1. SINKS ---
+
+class QueueSink:
+    """In-memory stand-in for a push/notification queue."""
+
+    def __init__(self, target=None):
+        self.queue = target if target is not None else queue.Queue()
+
+    def dispatch(self, events):
+        self.queue.put(events)
+
+
+class FileSink:
+    """Appends one JSON line per due reminder to a local file."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def dispatch(self, events):
+        with open(self.path, 'a', encoding='utf-8') as fh:
+            for event in events:
+                fh.write(json.dumps(event) + "\n")
+
+
+# --- 2. TIME MATH ---
+
+def next_fire_time(spec, after):
+    """First datetime strictly after ``after`` matching the reminder's time and weekdays."""
+    tz = timezone.get_current_timezone()
+    local_after = timezone.localtime(after, tz)
+    days = set(spec['days_of_week'] or range(7))
+
+    for offset in range(8):
+        day = local_after.date() + timedelta(days=offset)
+        if day.weekday() not in days:
+            continue
+        candidate = timezone.make_aware(datetime.combine(day, spec['time']), tz)
+        if candidate > after:
+            return candidate
+    return None
+
+
+# --- 3. SCHEDULER ---
+
+class ReminderScheduler:
+    def __init__(self, sink, batch_size=BATCH_SIZE, sync_interval=SYNC_INTERVAL_SECONDS):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.sync_interval = sync_interval
+
+        self._heap = []          # (fire_at, seq, reminder_id)
+        self._specs = {}         # reminder_id -> (seq, spec); heap entries with an older seq are stale
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._last_sync = None
+
+    # -- schedule maintenance --
+
+    def _push(self, spec, after):
+        fire_at = next_fire_time(spec, after)
+        if fire_at is None:
+            self._specs.pop(spec['id'], None)
+            return
+        seq = next(self._seq)
+        self._specs[spec['id']] = (seq, spec)
+        heapq.heappush(self._heap, (fire_at, seq, spec['id']))
+
+    def load(self):
+        """Initial full load; afterwards only deltas are read."""
+        now = timezone.now()
+        rows = Reminder.objects.filter(is_active=True).order_by().values(*SPEC_FIELDS).iterator(chunk_size=2000)
+        with self._cond:
+            self._heap.clear()
+            self._specs.clear()
+            for spec in rows:
+                self._push(spec, now)
+            self._last_sync = now
+            self._cond.notify()
+
+    def upsert(self, spec):
+        with self._cond:
+            if spec.get('is_active', True):
+                self._push(spec, timezone.now())
+            else:
+                self._specs.pop(spec['id'], None)
+            self._cond.notify()
+
+    def remove(self, reminder_id):
+        with self._cond:
+            self._specs.pop(reminder_id, None)
+            self._cond.notify()
+
+    def _applied(self, spec):
+        current = self._specs.get(spec['id'])
+        return current is not None and current[1]['updated_at'] == spec['updated_at']
+
+    def sync_changes(self):
+        """Apply reminders edited since the last sync (indexed range scan on updated_at)."""
+        since, now = self._last_sync, timezone.now()
+        if since is None:
+            return self.load()
+        # updated_at is stamped before commit: overlap the previous scan and skip rows already applied
+        changed = (
+            Reminder.objects.filter(updated_at__gte=since - SYNC_OVERLAP)
+            .order_by().values('is_active', *SPEC_FIELDS)
+        )
+        for spec in changed:
+            if not self._applied(spec):
+                self.upsert(spec)
+        self._last_sync = now
+
+    # -- dispatch --
+
+    def _pop_due(self, now):
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < self.batch_size:
+            fire_at, seq, reminder_id = heapq.heappop(self._heap)
+            current = self._specs.get(reminder_id)
+            if current is None or current[0] != seq:
+                continue  # superseded by an edit or removed
+            due.append((fire_at, seq, current[1]))
+        return due
+
+    def _rearm(self, due, live, now):
+        """Schedule the next occurrence of live reminders; drop the ones found deleted or inactive."""
+        for fire_at, seq, spec in due:
+            current = self._specs.get(spec['id'])
+            if current is None or current[0] != seq:
+                continue  # edited while being dispatched: the edit already re-armed it
+            if spec['id'] in live:
+                self._push(spec, max(fire_at, now))
+            else:
+                self._specs.pop(spec['id'])
+
+    def run_pending(self, now=None):
+        """Dispatch everything due at ``now``; returns the number of events sent."""
+        now = now or timezone.now()
+        sent = 0
+        while True:
+            with self._cond:
+                due = self._pop_due(now)
+            if not due:
+                return sent
+
+            # Drop reminders deleted/deactivated by another process since the last sync
+            live = set(
+                Reminder.objects.filter(id__in=[spec['id'] for _, _, spec in due], is_active=True)
+                .values_list('id', flat=True)
+            )
+            with self._cond:
+                self._rearm(due, live, now)
+            events = [
+                {
+                    "reminder_id": str(spec['id']),
+                    "user_id": str(spec['user_id']),
+                    "type": spec['type'],
+                    "title": spec['title'],
+                    "message": spec['message'],
+                    "due_at": fire_at.isoformat(),
+                }
+                for fire_at, _, spec in due if spec['id'] in live
+            ]
+            if events:
+                self.sink.dispatch(events)
+                sent += len(events)
+
+    def seconds_until_next(self, now=None):
+        now = now or timezone.now()
+        with self._cond:
+            if not self._heap:
+                return None
+            return max((self._heap[0][0] - now).total_seconds(), 0)
+
+    def serve_forever(self, stop_event):
+        """Sleep until the next reminder is due, a change arrives, or a sync is needed."""
+        global _active_scheduler
+        _active_scheduler = self
+        try:
+            self.load()
+            last_sync_check = timezone.now()
+            while not stop_event.is_set():
+                now = timezone.now()
+                if (now - last_sync_check).total_seconds() >= self.sync_interval:
+                    self.sync_changes()
+                    last_sync_check = now
+
+                self.run_pending(now)
+
+                wait = self.seconds_until_next()
+                wait = self.sync_interval if wait is None else min(wait, self.sync_interval)
+                with self._cond:
+                    self._cond.wait(timeout=wait)
+        finally:
+            _active_scheduler = None
+
+
+# --- 4. SIGNAL HOOKS ---
+
+def reminder_saved(instance):
+    if _active_scheduler is not None:
+        spec = {field: getattr(instance, field) for field in SPEC_FIELDS}
+        spec['is_active'] = instance.is_active
+        _active_scheduler.upsert(spec)
+
+
+def reminder_deleted(instance):
+    if _active_scheduler is not None:
+        _active_scheduler.remove(instance.id)
@@ -0,0 +1,255 @@
+"""
+RPG stats + body heatmap scoring.
+
+Cumulative training load is aggregated per (user, muscle group) in SQL, then
+turned into levels with NumPy for a whole block of users at once:
+
+    part_volume = group_volume @ PROJECTION        (users x parts)
+    level       = 100 * (1 - exp(-part_volume / LEVEL_SCALE_KG))
+
+Levels saturate, so the curve can be re-applied to running totals; that is what
+``apply_session`` does for one freshly logged workout without rescanning history.
+
+Sets and workouts removed by archival (services/logArchive.py) are first folded
+into ArchivedTotals (``archive_workouts``), which the full recompute starts from.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Avg, Count, F, Sum
+from django.utils import timezone
+
+from ..models.appUsers import AppUsers, ArchivedTotals, BodyPartMetrics, UserRPGStats
+from ..models.sleepLogs import SleepLog
+from ..models.workoutSessions import Workout
+from ..models.workoutSet import ExerciseSet
+
+USER_BLOCK_SIZE = 2000
+
+MUSCLE_GROUPS = ['chest', 'back', 'shoulders', 'arms', 'core', 'legs', 'full_body', 'cardio']
+BODY_PARTS = ['chest_level', 'back_level', 'arms_level', 'shoulders_level',
+              'quads_level', 'hamstrings_level', 'calves_level', 'glutes_level', 'core_strength']
+STAT_FIELDS = ['strength_score', 'endurance_score', 'flexibility_score', 'recovery_score',
+               'consistency_streak', 'total_workouts', 'last_workout_date']
+
+# How a muscle group's volume spreads over heatmap parts (rows sum to 1)
+_SPREAD = {
+    'chest': {'chest_level': 1.0},
+    'back': {'back_level': 1.0},
+    'shoulders': {'shoulders_level': 1.0},
+    'arms': {'arms_level': 1.0},
+    'core': {'core_strength': 1.0},
+    'legs': {'quads_level': 0.35, 'hamstrings_level': 0.25, 'glutes_level': 0.25, 'calves_level': 0.15},
+    'full_body': {part: 1.0 / len(BODY_PARTS) for part in BODY_PARTS},
+    'cardio': {'quads_level': 0.3, 'calves_level': 0.5, 'core_strength': 0.2},
+}
+PROJECTION = np.zeros((len(MUSCLE_GROUPS), len(BODY_PARTS)))
+for _g, _parts in _SPREAD.items():
+    for _p, _w in _parts.items():
+        PROJECTION[MUSCLE_GROUPS.index(_g), BODY_PARTS.index(_p)] = _w
+
+LEVEL_SCALE_KG = 50_000.0          # cumulative kg for a part to reach ~63
+ENDURANCE_SCALE_SECONDS = 36_000.0  # ~10h of cardio for ~63
+FLEXIBILITY_SCALE_SECONDS = 18_000.0
+TARGET_SLEEP_HOURS = 8.0
+SLEEP_WINDOW_DAYS = 7
+
+
+def _saturate(values, scale):
+    return 100.0 * (1.0 - np.exp(-np.asarray(values, dtype=float) / scale))
+
+
+def _scores(volume, cardio_seconds, flex_seconds):
+    """Vectorised: volume (n x groups) -> (levels n x parts, strength, endurance, flexibility)."""
+    levels = _saturate(volume @ PROJECTION, LEVEL_SCALE_KG)
+    strength = levels.mean(axis=1)
+    endurance = _saturate(cardio_seconds, ENDURANCE_SCALE_SECONDS)
+    flexibility = _saturate(flex_seconds, FLEXIBILITY_SCALE_SECONDS)
+    return levels, strength, endurance, flexibility
+
+
+def _set_aggregates(sets_qs, user_key):
+    """One GROUP BY over sets: volume and timed seconds per (user, muscle group, category)."""
+    return (
+        sets_qs.filter(completed=True)
+        .values(user_key, 'workout_exercise__exercise__muscle_group', 'workout_exercise__exercise__category')
+        .annotate(volume=Sum(F('reps') * F('weight_kg')), seconds=Sum('duration_seconds'))
+    )
+
+
+def _workout_days(user_ids, today):
+    """Distinct completed-workout dates per user in the last year, newest first (for streaks)."""
+    days = {}
+    rows = (
+        Workout.objects.filter(user_id__in=user_ids, status='completed', date__gt=today - timedelta(days=366))
+        .values_list('user_id', 'date').distinct().order_by('user_id', '-date')
+    )
+    for user_id, day in rows:
+        days.setdefault(user_id, []).append(day)
+    return days
+
+
+def _streak(dates_desc, today):
+    streak, expected = 0, None
+    for day in dates_desc:
+        if expected is None:
+            if (today - day).days > 1:
+                return 0
+        elif day != expected:
+            break
+        streak += 1
+        expected = day - timedelta(days=1)
+    return streak
+
+
+def _empty_raw():
+    return {'volume': {}, 'cardio_seconds': 0, 'flexibility_seconds': 0}
+
+
+def _accumulate(raw, row):
+    """Add one ``_set_aggregates`` row to a raw totals dict (BodyPartMetrics.raw_totals shape)."""
+    group = row['workout_exercise__exercise__muscle_group']
+    category = row['workout_exercise__exercise__category']
+    raw['volume'][group] = raw['volume'].get(group, 0) + float(row['volume'] or 0)
+    secs = float(row['seconds'] or 0)
+    if group == 'cardio' or category == 'cardio':
+        raw['cardio_seconds'] += secs
+    elif category == 'flexibility':
+        raw['flexibility_seconds'] += secs
+
+
+def recompute_block(user_ids, today=None):
+    """Full recompute for a block of users; two upserts for the whole block."""
+    today = today or timezone.localdate()
+    index = {user_id: i for i, user_id in enumerate(user_ids)}
+    n = len(user_ids)
+
+    # Archived history first, then whatever is still in the database
+    archived = {a.user_id: a for a in ArchivedTotals.objects.filter(user_id__in=user_ids)}
+    raw = []
+    for user_id in user_ids:
+        a = archived.get(user_id)
+        raw.append(_empty_raw() if a is None else {
+            'volume': dict(a.volume), 'cardio_seconds': a.cardio_seconds, 'flexibility_seconds': a.flexibility_seconds,
+        })
+    user_key = 'workout_exercise__workout__user_id'
+    for row in _set_aggregates(ExerciseSet.objects.filter(**{f'{user_key}__in': user_ids}), user_key):
+        _accumulate(raw[index[row[user_key]]], row)
+
+    volume = np.array([[r['volume'].get(g, 0) for g in MUSCLE_GROUPS] for r in raw], dtype=float).reshape(n, -1)
+    cardio = np.array([r['cardio_seconds'] for r in raw], dtype=float)
+    flex = np.array([r['flexibility_seconds'] for r in raw], dtype=float)
+    levels, strength, endurance, flexibility = _scores(volume, cardio, flex)
+
+    sleep = dict(
+        SleepLog.objects.filter(user_id__in=user_ids, date__gt=today - timedelta(days=SLEEP_WINDOW_DAYS))
+        .values('user_id').annotate(avg=Avg('duration_hours')).values_list('user_id', 'avg')
+    )
+    recovery = np.clip(
+        np.array([float(sleep.get(u) or 0) for u in user_ids]) / TARGET_SLEEP_HOURS * 100.0, 0, 100
+    )
+    totals = dict(
+        Workout.objects.filter(user_id__in=user_ids, status='completed')
+        .values('user_id').annotate(c=Count('id')).values_list('user_id', 'c')
+    )
+    days = _workout_days(user_ids, today)
+
+    stats = [
+        UserRPGStats(
+            user_id=user_id,
+            strength_score=int(round(strength[i])),
+            endurance_score=int(round(endurance[i])),
+            flexibility_score=int(round(flexibility[i])),
+            recovery_score=int(round(recovery[i])),
+            consistency_streak=_streak(days.get(user_id, []), today),
+            total_workouts=totals.get(user_id, 0) + getattr(archived.get(user_id), 'completed_workouts', 0),
+            last_workout_date=(days.get(user_id) or [None])[0],
+        )
+        for user_id, i in index.items()
+    ]
+    metrics = [
+        BodyPartMetrics(user_id=user_id, raw_totals=raw[i],
+                        **{part: round(float(levels[i, j]), 2) for j, part in enumerate(BODY_PARTS)})
+        for user_id, i in index.items()
+    ]
+
+    with transaction.atomic():
+        UserRPGStats.objects.bulk_create(stats, update_conflicts=True, unique_fields=['user'],
+                                         update_fields=STAT_FIELDS + ['last_updated'])
+        BodyPartMetrics.objects.bulk_create(metrics, update_conflicts=True, unique_fields=['user'],
+                                            update_fields=BODY_PARTS + ['raw_totals', 'updated_at'])
+    return n
+
+
+def recompute_all(block_size=USER_BLOCK_SIZE):
+    """Nightly job: walk all users in id order, one vectorised block at a time."""
+    ids = AppUsers.objects.order_by('id').values_list('id', flat=True)
+    done, last = 0, None
+    while True:
+        block = list((ids if last is None else ids.filter(id__gt=last))[:block_size])
+        if not block:
+            return done
+        done += recompute_block(block)
+        last = block[-1]
+
+
+def apply_session(workout):
+    """Cheap incremental update for one just-completed workout."""
+    rows = _set_aggregates(ExerciseSet.objects.filter(workout_exercise__workout=workout),
+                           'workout_exercise__workout_id')
+
+    with transaction.atomic():
+        stats, _ = UserRPGStats.objects.select_for_update().get_or_create(user_id=workout.user_id)
+        metrics, _ = BodyPartMetrics.objects.select_for_update().get_or_create(user_id=workout.user_id)
+
+        raw = {**_empty_raw(), **(metrics.raw_totals or {})}
+        for row in rows:
+            _accumulate(raw, row)
+
+        volume = np.array([[raw['volume'].get(g, 0) for g in MUSCLE_GROUPS]], dtype=float)
+        levels, strength, endurance, flexibility = _scores(
+            volume, [raw['cardio_seconds']], [raw['flexibility_seconds']]
+        )
+
+        for j, part in enumerate(BODY_PARTS):
+            setattr(metrics, part, round(float(levels[0, j]), 2))
+        metrics.raw_totals = raw
+        metrics.save()
+
+        last = stats.last_workout_date
+        if last is None or workout.date > last:
+            stats.consistency_streak = stats.consistency_streak + 1 if last and (workout.date - last).days == 1 else 1
+            stats.last_workout_date = workout.date
+        stats.strength_score = int(round(strength[0]))
+        stats.endurance_score = int(round(endurance[0]))
+        stats.flexibility_score = int(round(flexibility[0]))
+        stats.total_workouts += 1
+        stats.save()
+
+    return stats, metrics
+
+
+def archive_workouts(workouts):
+    """
+    Fold the sets and completed count of ``workouts`` into ArchivedTotals.
+    Called by logArchive inside the transaction that deletes them.
+    """
+    user_key = 'workout_exercise__workout__user_id'
+    by_user = {}
+    for row in _set_aggregates(ExerciseSet.objects.filter(workout_exercise__workout__in=workouts), user_key):
+        _accumulate(by_user.setdefault(row[user_key], _empty_raw()), row)
+    completed = dict(
+        workouts.filter(status='completed').values('user_id').annotate(c=Count('id')).values_list('user_id', 'c')
+    )
+
+    for user_id in by_user.keys() | completed.keys():
+        raw = by_user.get(user_id) or _empty_raw()
+        totals, _ = ArchivedTotals.objects.select_for_update().get_or_create(user_id=user_id)
+        for group, kg in raw['volume'].items():
+            totals.volume[group] = totals.volume.get(group, 0) + kg
+        totals.cardio_seconds += raw['cardio_seconds']
+        totals.flexibility_seconds += raw['flexibility_seconds']
+        totals.completed_workouts += completed.get(user_id, 0)
+        totals.save()
@@ -0,0 +1,260 @@
+"""
+Local background task queue for post-write side effects.
+
+Views enqueue follow-up work (achievement checks, cache refreshes, ...) after
+commit and return immediately; a worker drains the queue in batches. Pending
+tasks are de-duplicated by key, e.g. (task, user, date), so ten water taps in a
+row collapse into one refresh. Failed tasks are retried with exponential backoff.
+
+Backends:
+    memory - in-process, drained by a daemon thread (default)
+    sqlite - a local SQLite file shared by web workers; drain with
+             ``manage.py drain_tasks``. A claim is a lease: rows claimed longer
+             than LEASE_SECONDS ago (the drainer died mid-task) are claimed again,
+             so LEASE_SECONDS must exceed the slowest handler.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+BASE_RETRY_DELAY_SECONDS = 2
+LEASE_SECONDS = 300
+
+_handlers = {}
+
+
+def task(name):
+    """Register a handler: ``@task("refresh_x") def refresh_x(**payload): ...``"""
+    def register(func):
+        _handlers[name] = func
+        return func
+    return register
+
+
+# --- 1. BACKENDS ---
+
+class MemoryBackend:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()  # dedupe_key -> task dict
+        self._seq = 0
+
+    def push(self, name, payload, dedupe_key, run_after=0.0, attempts=0):
+        with self._lock:
+            if dedupe_key in self._pending:
+                return False
+            self._seq += 1
+            self._pending[dedupe_key] = {
+                'id': self._seq, 'name': name, 'payload': payload,
+                'dedupe_key': dedupe_key, 'attempts': attempts, 'run_after': run_after,
+            }
+            return True
+
+    def claim(self, limit, now):
+        with self._lock:
+            due = [key for key, t in self._pending.items() if t['run_after'] <= now][:limit]
+            return [self._pending.pop(key) for key in due]
+
+    def retry(self, item, run_after, error):
+        self.push(item['name'], item['payload'], item['dedupe_key'], run_after, item['attempts'] + 1)
+
+    def done(self, item):
+        pass
+
+    def __len__(self):
+        return len(self._pending)
+
+
+class SQLiteBackend:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            dedupe_key TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            run_after REAL NOT NULL DEFAULT 0,
+            claimed_at REAL,
+            last_error TEXT
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS tasks_pending_dedupe ON tasks (dedupe_key) WHERE claimed_at IS NULL;
+        CREATE INDEX IF NOT EXISTS tasks_due ON tasks (run_after) WHERE claimed_at IS NULL;
+        CREATE INDEX IF NOT EXISTS tasks_claimed ON tasks (claimed_at) WHERE claimed_at IS NOT NULL;
+    """
+
+    def __init__(self, path, lease_seconds=LEASE_SECONDS):
+        self.path = str(path)
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(self.SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def push(self, name, payload, dedupe_key, run_after=0.0, attempts=0):
+        cur = self._conn().execute(
+            "INSERT OR IGNORE INTO tasks (name, payload, dedupe_key, attempts, run_after) VALUES (?, ?, ?, ?, ?)",
+            (name, json.dumps(payload), dedupe_key, attempts, run_after),
+        )
+        return cur.rowcount == 1
+
+    def claim(self, limit, now):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Due rows, plus rows whose lease expired; a lost run counts as an attempt
+            rows = conn.execute(
+                "SELECT id, name, payload, dedupe_key, attempts + (claimed_at IS NOT NULL) FROM tasks "
+                "WHERE run_after <= ? AND (claimed_at IS NULL OR claimed_at <= ?) "
+                "ORDER BY run_after, id LIMIT ?",
+                (now, now - self.lease_seconds, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE tasks SET claimed_at = ?, attempts = ? WHERE id = ?",
+                [(now, r[4], r[0]) for r in rows],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return [
+            {'id': r[0], 'name': r[1], 'payload': json.loads(r[2]), 'dedupe_key': r[3], 'attempts': r[4]}
+            for r in rows
+        ]
+
+    def retry(self, item, run_after, error):
+        conn = self._conn()
+        cur = conn.execute(
+            "UPDATE OR IGNORE tasks SET claimed_at = NULL, attempts = attempts + 1, run_after = ?, last_error = ? "
+            "WHERE id = ?",
+            (run_after, error[:500], item['id']),
+        )
+        if cur.rowcount == 0:
+            # A fresh duplicate is already pending and will do the same work
+            self.done(item)
+
+    def done(self, item):
+        self._conn().execute("DELETE FROM tasks WHERE id = ?", (item['id'],))
+
+    def __len__(self):
+        return self._conn().execute("SELECT COUNT(*) FROM tasks WHERE claimed_at IS NULL").fetchone()[0]
+
+
+# --- 2. QUEUE ---
+
+class TaskQueue:
+    def __init__(self, backend, start_worker=False):
+        self.backend = backend
+        self._wakeup = threading.Event()
+        self._worker = None
+        if start_worker:
+            self.start_worker()
+
+    def enqueue(self, name, payload, dedupe_key=None, delay=0):
+        key = dedupe_key or f"{name}:{json.dumps(payload, sort_keys=True)}"
+        added = self.backend.push(name, payload, key, time.time() + delay)
+        self._wakeup.set()
+        return added
+
+    def enqueue_on_commit(self, name, payload, dedupe_key=None):
+        """Defer until the surrounding transaction commits (runs now outside one)."""
+        transaction.on_commit(lambda: self.enqueue(name, payload, dedupe_key))
+
+    def drain(self, max_tasks=None, batch_size=BATCH_SIZE):
+        """Run due tasks in batches; returns the number handled."""
+        handled = 0
+        while max_tasks is None or handled < max_tasks:
+            limit = batch_size if max_tasks is None else min(batch_size, max_tasks - handled)
+            batch = self.backend.claim(limit, time.time())
+            if not batch:
+                break
+            for item in batch:
+                self._run(item)
+            handled += len(batch)
+            close_old_connections()
+        return handled
+
+    def _run(self, item):
+        handler = _handlers.get(item['name'])
+        if handler is None:
+            print(f"⚠️ No handler for task {item['name']}, dropping")
+            self.backend.done(item)
+            return
+        if item['attempts'] >= MAX_ATTEMPTS:
+            # Reclaimed after too many lost leases; the handler keeps killing its worker
+            print(f"❌ Task {item['name']} abandoned after {item['attempts']} attempts")
+            self.backend.done(item)
+            return
+        try:
+            handler(**item['payload'])
+        except Exception as e:
+            if item['attempts'] + 1 >= MAX_ATTEMPTS:
+                print(f"❌ Task {item['name']} failed permanently: {e}")
+                self.backend.done(item)
+            else:
+                delay = BASE_RETRY_DELAY_SECONDS * (2 ** item['attempts'])
+                self.backend.retry(item, time.time() + delay, str(e))
+        else:
+            self.backend.done(item)
+
+    def start_worker(self, idle_seconds=1.0):
+        if self._worker is not None:
+            return
+
+        def loop():
+            while True:
+                self._wakeup.wait(timeout=idle_seconds)
+                self._wakeup.clear()
+                try:
+                    self.drain()
+                except Exception as e:
+                    print(f"❌ Task worker error: {e}")
+
+        self._worker = threading.Thread(target=loop, name="reactfit-task-worker", daemon=True)
+        self._worker.start()
+
+
+def _build_queue():
+    config = getattr(settings, 'TASK_QUEUE', {})
+    if config.get('BACKEND', 'memory') == 'sqlite':
+        backend = SQLiteBackend(config.get('PATH', 'tasks.sqlite3'), config.get('LEASE_SECONDS', LEASE_SECONDS))
+    else:
+        backend = MemoryBackend()
+    return TaskQueue(backend, start_worker=config.get('WORKER', True))
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = _build_queue()
+    return _queue
+
+
+def enqueue_for_user_day(name, user_id, day, scope="", **payload):
+    """
+    Enqueue after commit, collapsing duplicates for the same (task, user, date[, scope]).
+    Only the first payload of a collapsed run is kept, so handlers should re-read state.
+    """
+    payload = {'user_id': str(user_id), **payload}
+    get_queue().enqueue_on_commit(name, payload, dedupe_key=f"{name}:{user_id}:{day}:{scope}")
@@ -0,0 +1,154 @@
+"""
+Streaming per-user data export (everything we hold about one AppUsers row).
+
+Each table is read with ``.iterator(chunk_size)`` (a server-side cursor on
+Postgres) and encoded row by row inside a generator, so a worker only ever
+holds one chunk of rows plus one output buffer, however long the history.
+Rows already moved to cold storage (services/logArchive.py) are included too.
+
+Formats:
+    ndjson - one ``{"table": ..., "row": {...}}`` object per line
+    zip    - one ``<table>.ndjson`` member per table, written to a
+             non-seekable stream so it can be sent while it is built
+"""
+
+import zipfile
+
+from django.utils import timezone
+
+from ..models.aiActions import AIAction
+from ..models.appUsers import AppUsers, ArchivedTotals, BodyPartMetrics, NutritionTargets, UserAchievement, UserRPGStats
+from ..models.dietLogs import DietLog
+from ..models.exerciseLibrary import Exercise
+from ..models.habitLogs import HabitLog
+from ..models.habits import Habit
+from ..models.reminders import Reminder
+from ..models.sleepLogs import SleepLog
+from ..models.stepLogs import StepLog
+from ..models.waterIntake import WaterIntake
+from ..models.waterIntakeLogs import WaterIntakeLog
+from ..models.workoutExercises import WorkoutExercise
+from ..models.workoutSessions import Workout
+from ..models.workoutSet import ExerciseSet
+from ..renderers import dumps
+from . import logArchive, readReplica
+
+FORMAT_VERSION = 1
+CHUNK_SIZE = 2000
+FLUSH_BYTES = 64 * 1024
+
+# Never exported
+PROFILE_EXCLUDE = {'password'}
+
+# table name -> (model, lookup from the model to the user's id)
+TABLES = {
+    'rpg_stats': (UserRPGStats, 'user_id'),
+    'body_metrics': (BodyPartMetrics, 'user_id'),
+    'nutrition_targets': (NutritionTargets, 'user_id'),
+    'archived_totals': (ArchivedTotals, 'user_id'),
+    'achievements': (UserAchievement, 'user_id'),
+    'water_intake': (WaterIntake, 'user_id'),
+    'water_intake_logs': (WaterIntakeLog, 'user_id'),
+    'diet_logs': (DietLog, 'user_id'),
+    'workouts': (Workout, 'user_id'),
+    'workout_exercises': (WorkoutExercise, 'workout__user_id'),
+    'exercise_sets': (ExerciseSet, 'workout_exercise__workout__user_id'),
+    'habits': (Habit, 'user_id'),
+    'habit_logs': (HabitLog, 'habit__user_id'),
+    'step_logs': (StepLog, 'user_id'),
+    'sleep_logs': (SleepLog, 'user_id'),
+    'reminders': (Reminder, 'user_id'),
+    'ai_actions': (AIAction, 'user_id'),
+    'created_exercises': (Exercise, 'created_by_id'),
+}
+
+
+# --- 1. ROW SOURCES ---
+
+def _profile(user_id, alias):
+    fields = [f.attname for f in AppUsers._meta.concrete_fields if f.attname not in PROFILE_EXCLUDE]
+    return AppUsers.objects.using(alias).filter(id=user_id).values(*fields)
+
+
+def _rows(model, lookup, user_id, chunk_size, alias):
+    fields = [f.attname for f in model._meta.concrete_fields]
+    queryset = model.objects.using(alias).filter(**{lookup: user_id}).order_by().values(*fields)
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+def iter_tables(user_id, chunk_size=CHUNK_SIZE):
+    """Yield (table, row iterator) for every table holding the user's data; nothing is fetched up front."""
+    alias = readReplica.alias_for(user_id)
+    yield 'profile', _profile(user_id, alias).iterator(chunk_size=1)
+    for table, (model, lookup) in TABLES.items():
+        yield table, _rows(model, lookup, user_id, chunk_size, alias)
+    for name in logArchive.DATASETS:
+        yield f"archive_{name}", logArchive.iter_archive(name, user_id=user_id, batch_size=chunk_size)
+
+
+def _encode(obj):
+    return dumps(obj) + b'\n'
+
+
+def _header(user_id):
+    return {'user_id': str(user_id), 'generated_at': timezone.now(), 'format_version': FORMAT_VERSION}
+
+
+# --- 2. ENCODERS ---
+
+def stream_ndjson(user_id, chunk_size=CHUNK_SIZE):
+    """Yield ~FLUSH_BYTES chunks of NDJSON."""
+    buffer = bytearray(_encode({'table': 'export', 'row': _header(user_id)}))
+    for table, rows in iter_tables(user_id, chunk_size):
+        for row in rows:
+            buffer += _encode({'table': table, 'row': row})
+            if len(buffer) >= FLUSH_BYTES:
+                yield bytes(buffer)
+                buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+class _Pipe:
+    """Write-only, non-seekable sink for ZipFile; the generator drains it between writes."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.offset = 0
+
+    def write(self, data):
+        self.buffer += data
+        self.offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.offset
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+
+def stream_zip(user_id, chunk_size=CHUNK_SIZE):
+    """Yield a deflated zip with ``export.json`` and one ``<table>.ndjson`` per table."""
+    pipe = _Pipe()
+    with zipfile.ZipFile(pipe, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('export.json', _encode(_header(user_id)))
+        for table, rows in iter_tables(user_id, chunk_size):
+            with archive.open(f"{table}.ndjson", 'w') as member:
+                for row in rows:
+                    member.write(_encode(row))
+                    if len(pipe.buffer) >= FLUSH_BYTES:
+                        yield pipe.drain()
+            yield pipe.drain()
+    yield pipe.drain()
+
+
+STREAMS = {
+    'ndjson': (stream_ndjson, 'application/x-ndjson', 'ndjson'),
+    'zip': (stream_zip, 'application/zip', 'zip'),
+}
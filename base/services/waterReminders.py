@@ -0,0 +1,121 @@
+"""
+"Drink water" reminders driven by WaterIntake.last_intake_at.
+
+A user is due when today's intake is behind a linear pace towards
+``daily_goal_ml`` over the waking day AND their last sip is older than
+``min_gap``. The check runs in SQL, one keyset-paginated query per shard walking
+the (date, last_intake_at) index, so the sweep cost does not grow with Python work
+per user.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.db.models import ExpressionWrapper, F, FloatField, Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from ..models.appUsers import AppUsers
+from ..models.waterIntake import WaterIntake
+
+SHARD_SIZE = 1000
+MIN_GAP = timedelta(minutes=90)
+WAKING_DAY_START = time(7, 0)
+WAKING_DAY_END = time(22, 0)
+DEFAULT_GOAL_ML = 3000  # users without stored nutrition targets
+
+
+def pace_fraction(now):
+    """Share of the waking day elapsed at ``now`` (0.0 before start, 1.0 after end)."""
+    local = timezone.localtime(now)
+    start = timezone.make_aware(datetime.combine(local.date(), WAKING_DAY_START))
+    end = timezone.make_aware(datetime.combine(local.date(), WAKING_DAY_END))
+    if local <= start:
+        return 0.0
+    return min((local - start) / (end - start), 1.0)
+
+
+def _event(user_id, intake, goal, last_sip, now):
+    return {
+        "type": "water",
+        "user_id": str(user_id),
+        "title": "Time to hydrate 💧",
+        "current_intake_ml": intake,
+        "daily_goal_ml": goal,
+        "last_sip": last_sip.isoformat() if last_sip else None,
+        "due_at": now.isoformat(),
+    }
+
+
+def behind_pace_queryset(today, cutoff, fraction):
+    """Today's rows behind pace whose last sip is older than ``cutoff``."""
+    target = ExpressionWrapper(F('daily_goal_ml') * fraction, output_field=FloatField())
+    return (
+        WaterIntake.objects
+        # current < goal repeats the partial index predicate so the planner can use it
+        .filter(date=today, last_intake_at__lt=cutoff, current_intake_ml__lt=F('daily_goal_ml'))
+        .alias(target_ml=target)
+        .filter(current_intake_ml__lt=F('target_ml'))
+        .order_by('last_intake_at', 'id')
+        .values_list('id', 'user_id', 'current_intake_ml', 'daily_goal_ml', 'last_intake_at')
+    )
+
+
+def _behind_pace_shards(today, cutoff, fraction, shard_size):
+    """Behind-pace rows, keyset-paginated on (last_intake_at, id)."""
+    base_qs = behind_pace_queryset(today, cutoff, fraction)
+
+    last = None
+    while True:
+        qs = base_qs
+        if last is not None:
+            qs = qs.filter(Q(last_intake_at__gt=last[0]) | Q(last_intake_at=last[0], id__gt=last[1]))
+        shard = list(qs[:shard_size])
+        if not shard:
+            return
+        yield shard
+        last = (shard[-1][4], shard[-1][0])
+
+
+def _no_log_shards(today, shard_size):
+    """(user id, water goal) for active users with no WaterIntake row today (NOT EXISTS), keyset-paginated on id."""
+    base_qs = (
+        AppUsers.objects
+        .filter(is_active=True)
+        .exclude(water_logs__date=today)
+        .order_by('id')
+        .values_list('id', Coalesce('nutrition_targets__water_ml', DEFAULT_GOAL_ML))
+    )
+
+    last_id = None
+    while True:
+        qs = base_qs if last_id is None else base_qs.filter(id__gt=last_id)
+        shard = list(qs[:shard_size])
+        if not shard:
+            return
+        yield shard
+        last_id = shard[-1][0]
+
+
+def dispatch_due_reminders(sink, now=None, min_gap=MIN_GAP, shard_size=SHARD_SIZE):
+    """Emit one event per due user to ``sink`` (batched per shard); returns the count."""
+    now = now or timezone.now()
+    fraction = pace_fraction(now)
+    if fraction <= 0:
+        return 0
+
+    today = timezone.localdate(now)
+    cutoff = now - min_gap
+    sent = 0
+
+    for shard in _behind_pace_shards(today, cutoff, fraction, shard_size):
+        sink.dispatch([_event(user_id, intake, goal, last, now) for _, user_id, intake, goal, last in shard])
+        sent += len(shard)
+
+    # Nobody has logged a sip yet today; only nag once the first gap has passed
+    day_start = timezone.make_aware(datetime.combine(today, WAKING_DAY_START))
+    if day_start <= cutoff:
+        for shard in _no_log_shards(today, shard_size):
+            sink.dispatch([_event(user_id, 0, goal, None, now) for user_id, goal in shard])
+            sent += len(shard)
+
+    return sent
@@ -0,0 +1,170 @@
+"""
+Bulk ingest of wearable samples (steps + sleep).
+
+Syncs arrive as NDJSON, one sample per line. Lines are parsed as they stream in,
+grouped into batches and upserted with one ``INSERT ... ON CONFLICT (user, date)
+DO UPDATE`` per batch, so memory stays bounded by ``BATCH_SIZE`` no matter how
+many weeks a device uploads at once.
+
+Sleep ``duration_hours`` is worked out per line while parsing, not in the upsert:
+each line is rejected on its own when it is not 0-24 hours, and that check
+needs the duration anyway (one subtraction, no extra statement per batch).
+"""
+
+import json
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from ..models.sleepLogs import SleepLog, sleep_duration_hours
+from ..models.stepLogs import StepLog
+from . import readReplica
+
+BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 20
+
+STEP_UPDATE_FIELDS = ['step_count', 'distance_km', 'active_minutes', 'calories_burned', 'source', 'updated_at']
+SLEEP_UPDATE_FIELDS = ['bedtime', 'wake_time', 'duration_hours', 'quality_rating', 'interruptions',
+                       'deep_sleep_hours', 'rem_sleep_hours']
+
+# Accepted range per field; values outside are a bad line, never a failed batch at the database
+STEP_RANGES = {'step_count': (0, 200000), 'distance_km': (0, 500), 'active_minutes': (0, 1440),
+               'calories_burned': (0, 20000)}
+SLEEP_RANGES = {'quality_rating': (1, 5), 'interruptions': (0, 1000), 'deep_sleep_hours': (0, 24),
+                'rem_sleep_hours': (0, 24)}
+MAX_SLEEP_HOURS = 24
+
+
+def _date(value):
+    parsed = parse_date(str(value))
+    if parsed is None:
+        raise ValueError(f"Invalid date: {value}")
+    return parsed
+
+
+def _datetime(value):
+    parsed = parse_datetime(str(value))
+    if parsed is None:
+        raise ValueError(f"Invalid datetime: {value}")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _number(sample, field, ranges, cast, default=None):
+    value = sample.get(field)
+    if value is None:
+        return default
+    low, high = ranges[field]
+    try:
+        if isinstance(value, bool):
+            raise ValueError
+        number = cast(value)
+        if not low <= number <= high:
+            raise ValueError
+    except (ValueError, TypeError, InvalidOperation):
+        raise ValueError(f"Invalid {field}: {value!r} (expected {low}-{high})") from None
+    return number
+
+
+def _int(value):
+    number = float(value)
+    if not number.is_integer():
+        raise ValueError
+    return int(number)
+
+
+def _decimal(places):
+    exponent = Decimal(1).scaleb(-places)
+    return lambda value: Decimal(str(value)).quantize(exponent)
+
+
+def _step_row(user_id, sample):
+    return StepLog(
+        user_id=user_id,
+        date=_date(sample["date"]),
+        step_count=_number(sample, "step_count", STEP_RANGES, _int, default=0),
+        distance_km=_number(sample, "distance_km", STEP_RANGES, _decimal(2)),
+        active_minutes=_number(sample, "active_minutes", STEP_RANGES, _int),
+        calories_burned=_number(sample, "calories_burned", STEP_RANGES, _int),
+        source=str(sample.get("source", "manual"))[:50],
+    )
+
+
+def _sleep_row(user_id, sample):
+    bedtime = _datetime(sample["bedtime"])
+    wake_time = _datetime(sample["wake_time"])
+    if wake_time <= bedtime:
+        raise ValueError("wake_time must be after bedtime")
+    duration = sleep_duration_hours(bedtime, wake_time)
+    if duration > MAX_SLEEP_HOURS:
+        raise ValueError(f"Sleep longer than {MAX_SLEEP_HOURS} hours")
+    return SleepLog(
+        user_id=user_id,
+        date=_date(sample.get("date") or wake_time.date()),
+        bedtime=bedtime,
+        wake_time=wake_time,
+        duration_hours=duration,
+        quality_rating=_number(sample, "quality_rating", SLEEP_RANGES, _int),
+        interruptions=_number(sample, "interruptions", SLEEP_RANGES, _int, default=0),
+        deep_sleep_hours=_number(sample, "deep_sleep_hours", SLEEP_RANGES, _decimal(1)),
+        rem_sleep_hours=_number(sample, "rem_sleep_hours", SLEEP_RANGES, _decimal(1)),
+    )
+
+
+ROW_BUILDERS = {"steps": _step_row, "sleep": _sleep_row}
+
+
+def _flush(model, rows, update_fields):
+    # rows is keyed by date, so one statement never touches the same (user, date) twice
+    if rows:
+        model.objects.bulk_create(
+            list(rows.values()),
+            update_conflicts=True,
+            unique_fields=['user', 'date'],
+            update_fields=update_fields,
+        )
+    return len(rows)
+
+
+def ingest_ndjson(user_id, lines, batch_size=BATCH_SIZE):
+    """
+    Upsert NDJSON samples from an iterable of lines (bytes or str).
+
+    Each line is ``{"type": "steps" | "sleep", "date": ..., ...}``. A later sample
+    for the same day replaces an earlier one. Bad lines are skipped and reported.
+    """
+    pending = {"steps": {}, "sleep": {}}
+    result = {"steps": 0, "sleep": 0, "skipped": 0, "errors": []}
+
+    def flush_all():
+        with transaction.atomic():
+            result["steps"] += _flush(StepLog, pending["steps"], STEP_UPDATE_FIELDS)
+            result["sleep"] += _flush(SleepLog, pending["sleep"], SLEEP_UPDATE_FIELDS)
+        pending["steps"] = {}
+        pending["sleep"] = {}
+
+    for line_no, raw in enumerate(lines, start=1):
+        if not raw.strip():
+            continue
+        try:
+            sample = json.loads(raw)
+            kind = sample.get("type")
+            if kind not in ROW_BUILDERS:
+                raise ValueError(f"Unknown sample type: {kind}")
+            row = ROW_BUILDERS[kind](user_id, sample)
+        except (ValueError, TypeError, KeyError, AttributeError, InvalidOperation) as e:
+            result["skipped"] += 1
+            if len(result["errors"]) < MAX_REPORTED_ERRORS:
+                result["errors"].append({"line": line_no, "error": str(e)})
+            continue
+
+        pending[kind][row.date] = row
+        if len(pending["steps"]) + len(pending["sleep"]) >= batch_size:
+            flush_all()
+
+    flush_all()
+    readReplica.mark_write(user_id)  # bulk_create sends no post_save
+    return result
@@ -0,0 +1,117 @@
+"""
+Logging performed workouts (sets actually done, as opposed to AI plans).
+"""
+
+from datetime import date as date_type
+from typing import List, Optional
+from uuid import UUID
+
+from django.db import transaction
+from django.utils import timezone
+from pydantic import BaseModel, Field, model_validator
+
+from ..models.workoutExercises import WorkoutExercise
+from ..models.workoutSessions import Workout
+from ..models.workoutSet import ExerciseSet
+from . import rpgScoring
+from .workoutPlans import Category, MuscleGroup, resolve_exercises
+
+
+# Column limits: ExerciseSet.weight_kg Decimal(6,2), distance_meters Decimal(8,2); Workout.total_volume_kg Decimal(10,2)
+MAX_WEIGHT_KG = 9999.99
+MAX_DISTANCE_M = 999999.99
+MAX_VOLUME_KG = 99999999.99
+
+
+class WorkoutAlreadyLogged(Exception):
+    """The referenced workout was already completed; logging it again would double count."""
+
+
+class LoggedSet(BaseModel):
+    reps: Optional[int] = Field(default=None, ge=0, le=1000)
+    weight_kg: Optional[float] = Field(default=None, ge=0, le=MAX_WEIGHT_KG)
+    duration_seconds: Optional[int] = Field(default=None, ge=0, le=86400)
+    distance_meters: Optional[float] = Field(default=None, ge=0, le=MAX_DISTANCE_M)
+
+    @property
+    def volume(self):
+        return (self.reps or 0) * (self.weight_kg or 0)
+
+
+class LoggedExercise(BaseModel):
+    name: str = Field(min_length=1, max_length=200)
+    muscle_group: MuscleGroup
+    category: Category = "strength"
+    sets: List[LoggedSet] = Field(min_length=1)
+
+
+class WorkoutSession(BaseModel):
+    workout_id: Optional[UUID] = None  # complete a planned (e.g. AI) workout instead of creating one
+    title: str = ""
+    date: Optional[date_type] = None
+    duration_minutes: Optional[int] = Field(default=None, ge=0)
+    exercises: List[LoggedExercise] = Field(min_length=1)
+
+    @model_validator(mode="after")
+    def _volume_fits(self):
+        volume = sum(logged_set.volume for logged in self.exercises for logged_set in logged.sets)
+        if volume > MAX_VOLUME_KG:
+            raise ValueError(f"total volume {volume:.0f} kg exceeds {MAX_VOLUME_KG:.0f} kg")
+        return self
+
+
+def log_session(user, session):
+    """
+    Store performed sets, mark the workout completed and fold it into the RPG stats, all in one
+    transaction (a completed workout always has its stats applied); returns (Workout, UserRPGStats).
+    """
+    with transaction.atomic():
+        if session.workout_id:
+            workout = Workout.objects.select_for_update().get(id=session.workout_id, user=user)
+            if workout.status == 'completed':
+                raise WorkoutAlreadyLogged(str(workout.id))
+        else:
+            workout = Workout(user=user, title=session.title)
+
+        workout.title = session.title or workout.title
+        workout.date = session.date or (workout.date if session.workout_id else timezone.localdate())
+        workout.status = 'completed'
+        workout.completed_at = timezone.now()
+        workout.duration_minutes = session.duration_minutes
+        workout.save()
+
+        library = resolve_exercises(user, session.exercises)
+        planned = {we.exercise_id: we for we in workout.exercises.all()} if session.workout_id else {}
+        next_order = max((we.order for we in planned.values()), default=-1) + 1
+
+        new_exercises, sets, volume = [], [], 0.0
+        for logged in session.exercises:
+            exercise = library[logged.name.strip().lower()]
+            workout_exercise = planned.get(exercise.id)
+            if workout_exercise is None:
+                workout_exercise = WorkoutExercise(
+                    workout=workout, exercise=exercise, order=next_order, target_sets=len(logged.sets)
+                )
+                planned[exercise.id] = workout_exercise
+                new_exercises.append(workout_exercise)
+                next_order += 1
+
+            start = workout_exercise.completed_sets
+            for number, logged_set in enumerate(logged.sets, start=start + 1):
+                sets.append(ExerciseSet(workout_exercise=workout_exercise, set_number=number,
+                                        **logged_set.model_dump()))
+                volume += logged_set.volume
+            workout_exercise.completed_sets = start + len(logged.sets)
+
+        WorkoutExercise.objects.bulk_create(new_exercises)
+        WorkoutExercise.objects.bulk_update(
+            [we for we in planned.values() if we not in new_exercises], ['completed_sets']
+        )
+        ExerciseSet.objects.bulk_create(sets)
+
+        workout.total_volume_kg = round(volume, 2)
+        workout.save(update_fields=['total_volume_kg', 'updated_at'])
+
+        stats, _ = rpgScoring.apply_session(workout)
+
+    return workout, stats
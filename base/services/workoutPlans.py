@@ -0,0 +1,199 @@
+"""
+Structured workout plans.
+
+The coach normally answers in free text ("warm up sets / working sets"), which
+the app then has to re-parse. This module asks the LLM for a JSON document that
+matches ``WorkoutPlan``, validates it with pydantic (Rust core, one pass over the
+raw bytes) and stores the result as ``Workout`` / ``WorkoutExercise`` rows plus
+an ``AIAction`` audit entry holding the compact plan JSON.
+"""
+
+import json
+from typing import List, Literal, Optional
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+from groq import BadRequestError
+from pydantic import BaseModel, Field, ValidationError
+
+from ..models.aiActions import AIAction
+from ..models.exerciseLibrary import Exercise
+from ..models.workoutExercises import WorkoutExercise
+from ..models.workoutSessions import Workout
+
+PLAN_MODEL = "llama-3.1-8b-instant"
+MAX_ATTEMPTS = 2
+
+MuscleGroup = Literal["chest", "back", "shoulders", "arms", "core", "legs", "full_body", "cardio"]
+Category = Literal["strength", "cardio", "flexibility", "balance", "sports"]
+
+
+class PlanValidationError(Exception):
+    """Raised when the LLM never produced a reply matching ``WorkoutPlan``."""
+
+
+# --- 1. SCHEMA ---
+
+class PlannedSet(BaseModel):
+    weight_kg: float = Field(ge=0, le=9999.99)  # WorkoutExercise.target_weight_kg is Decimal(6,2)
+    reps: int = Field(ge=1, le=100)
+    reps_max: Optional[int] = Field(default=None, ge=1, le=100)
+
+
+class PlannedExercise(BaseModel):
+    name: str = Field(min_length=1, max_length=200)
+    muscle_group: MuscleGroup
+    category: Category = "strength"
+    warmup_sets: List[PlannedSet] = Field(default_factory=list)
+    working_sets: List[PlannedSet] = Field(min_length=1)
+
+
+class WorkoutPlan(BaseModel):
+    title: str = Field(min_length=1, max_length=200)
+    notes: str = ""
+    exercises: List[PlannedExercise] = Field(min_length=1, max_length=15)
+
+
+PLAN_JSON_SCHEMA = WorkoutPlan.model_json_schema()
+
+
+def structured_output_instruction():
+    """Prompt suffix that replaces the free-text exercise format."""
+    return (
+        "Respond ONLY with a single JSON object (no prose, no markdown) matching this JSON schema:\n"
+        f"{json.dumps(PLAN_JSON_SCHEMA, separators=(',', ':'))}\n"
+        "Use kilograms for weight_kg (0 for bodyweight). For rep ranges like 8-10 set reps=8 and reps_max=10."
+    )
+
+
+# --- 2. LLM CALL + VALIDATION ---
+
+def _complete(client, messages, response_format):
+    chat_completion = client.chat.completions.create(
+        messages=messages,
+        model=PLAN_MODEL,
+        temperature=0.3,
+        max_tokens=1200,
+        response_format=response_format,
+    )
+    return chat_completion.choices[0].message.content or ""
+
+
+def request_plan(client, messages):
+    """
+    Ask the LLM for a plan and return a validated ``WorkoutPlan``.
+
+    Prefers JSON-schema responses; models that reject ``json_schema`` fall back
+    to plain JSON mode (the schema is in the system prompt either way). A reply
+    that fails validation is retried once with the validation errors attached.
+    """
+    response_format = {
+        "type": "json_schema",
+        "json_schema": {"name": "workout_plan", "schema": PLAN_JSON_SCHEMA},
+    }
+    last_error = None
+
+    for _ in range(MAX_ATTEMPTS):
+        try:
+            raw = _complete(client, messages, response_format)
+        except BadRequestError:
+            if response_format["type"] == "json_object":
+                raise
+            response_format = {"type": "json_object"}
+            raw = _complete(client, messages, response_format)
+
+        try:
+            return WorkoutPlan.model_validate_json(raw)
+        except ValidationError as e:
+            last_error = e
+            messages = messages + [
+                {"role": "assistant", "content": raw},
+                {"role": "user", "content": f"That JSON is invalid: {e.errors(include_url=False)}. Reply with corrected JSON only."},
+            ]
+
+    raise PlanValidationError(str(last_error))
+
+
+# --- 3. PERSISTENCE ---
+
+def resolve_exercises(user, planned):
+    """Map planned exercise names to library rows in one query, creating custom ones."""
+    wanted = {p.name.strip().lower(): p for p in planned}
+    # Only the shared library and this user's own customs; library rows win a name clash
+    existing = {
+        e.lname: e
+        for e in Exercise.objects.annotate(lname=Lower("name"))
+        .filter(Q(is_custom=False) | Q(created_by=user), lname__in=list(wanted))
+        .order_by("-is_custom")
+    }
+
+    missing = [
+        Exercise(
+            name=p.name.strip(),
+            category=p.category,
+            muscle_group=p.muscle_group,
+            is_custom=True,
+            created_by=user,
+        )
+        for key, p in wanted.items() if key not in existing
+    ]
+    if missing:
+        Exercise.objects.bulk_create(missing)
+        existing.update({e.name.lower(): e for e in missing})
+
+    return existing
+
+
+def save_plan(user, plan, prompt=""):
+    """Store a validated plan as a planned ``Workout`` and return its ``AIAction``."""
+    compact = plan.model_dump(mode="json", exclude_defaults=True)
+
+    with transaction.atomic():
+        workout = Workout.objects.create(
+            user=user,
+            title=plan.title,
+            date=timezone.now().date(),
+            status="planned",
+            notes=plan.notes,
+            ai_generated=True,
+            ai_prompt=prompt,
+        )
+
+        library = resolve_exercises(user, plan.exercises)
+        rows = []
+        for order, planned in enumerate(plan.exercises):
+            top_set = max(planned.working_sets, key=lambda s: s.weight_kg)
+            warmup = ", ".join(f"{s.weight_kg:g}kg x {s.reps}" for s in planned.warmup_sets)
+            rows.append(WorkoutExercise(
+                workout=workout,
+                exercise=library[planned.name.strip().lower()],
+                order=order,
+                target_sets=len(planned.working_sets),
+                target_reps=top_set.reps_max or top_set.reps,
+                target_weight_kg=top_set.weight_kg,
+                notes=f"Warm up: {warmup}" if warmup else "",
+            ))
+        WorkoutExercise.objects.bulk_create(rows)
+
+        action = AIAction.objects.create(
+            user=user,
+            action_type="workout_create",
+            action_data={"workout_id": str(workout.id), "plan": compact},
+        )
+
+    return action
+
+
+def recent_plans(user_id, limit=10):
+    """Compact plan JSON for the user's latest AI-created workouts."""
+    actions = (
+        AIAction.objects
+        .filter(user_id=user_id, action_type="workout_create", success=True)
+        .values("action_data", "timestamp")[:limit]
+    )
+    return [
+        {**a["action_data"], "created": a["timestamp"].isoformat()}
+        for a in actions
+    ]
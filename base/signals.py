@@ -0,0 +1,149 @@
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.db import transaction
+from django.dispatch import receiver
+
+from .models.aiActions import AIAction
+from .models.appUsers import (Achievement, AppUsers, ArchivedTotals, BodyPartMetrics, NutritionTargets,
+                              UserAchievement, UserRPGStats)
+from .models.exerciseLibrary import Exercise
+from .models.foods import Food
+from .models.habitLogs import HabitLog
+from .models.habits import Habit
+from .models.reminders import Reminder
+from .models.sleepLogs import SleepLog
+from .models.stepLogs import StepLog
+from .models.dietLogs import DietLog
+from .models.waterIntake import WaterIntake
+from .models.waterIntakeLogs import WaterIntakeLog
+from .models.workoutExercises import WorkoutExercise
+from .models.workoutSessions import Workout
+from .models.workoutSet import ExerciseSet
+from .services import achievements, changeFeed, dashboard, exerciseCatalogue, foodDatabase, nutritionTargets, readReplica
+from .services import realtime, reminderScheduler
+
+
+# --- REMINDERS: keep an in-process scheduler in step with edits ---
+
+@receiver(post_save, sender=Reminder)
+def reminder_saved(sender, instance, **kwargs):
+    reminderScheduler.reminder_saved(instance)
+
+
+@receiver(post_delete, sender=Reminder)
+def reminder_deleted(sender, instance, **kwargs):
+    reminderScheduler.reminder_deleted(instance)
+
+
+# --- ACHIEVEMENTS: recompile rules after an edit ---
+
+@receiver(post_save, sender=Achievement)
+@receiver(post_delete, sender=Achievement)
+def achievement_changed(sender, instance, **kwargs):
+    achievements.registry.invalidate()
+
+
+# --- EXERCISE CATALOGUE: rebuild the precompressed blob after an edit ---
+
+@receiver(post_save, sender=Exercise)
+@receiver(post_delete, sender=Exercise)
+def exercise_changed(sender, instance, **kwargs):
+    if not instance.is_custom:
+        transaction.on_commit(exerciseCatalogue.invalidate)
+
+
+# --- FOOD INDEX: recompile after an admin edit ---
+
+@receiver(post_save, sender=Food)
+@receiver(post_delete, sender=Food)
+def food_changed(sender, instance, **kwargs):
+    transaction.on_commit(foodDatabase.invalidate)
+
+
+# --- NUTRITION TARGETS: recompute when a profile input changed ---
+
+@receiver(post_save, sender=AppUsers)
+def profile_saved(sender, instance, update_fields=None, **kwargs):
+    nutritionTargets.profile_saved(instance, update_fields)
+
+
+# --- USER WRITES: pin analytics reads to the primary, refresh the dashboard ---
+
+# Rows analytics reads serve (the replica router's opt-in readers); connected per model, not globally
+USER_ROWS = (
+    AppUsers, UserRPGStats, BodyPartMetrics, NutritionTargets, ArchivedTotals, UserAchievement,
+    WaterIntake, WaterIntakeLog, DietLog, Workout, Habit, StepLog, SleepLog, Reminder, AIAction,
+)
+
+# Rows without a user_id: attribute path to their owner's id
+OWNER_PATHS = {
+    HabitLog: ('habit', 'user_id'),
+    WorkoutExercise: ('workout', 'user_id'),
+    ExerciseSet: ('workout_exercise', 'workout', 'user_id'),
+}
+
+
+def _owner_id(instance, path):
+    try:
+        for attr in path:
+            instance = getattr(instance, attr)
+    except ObjectDoesNotExist:
+        return None
+    return instance
+
+
+def user_row_written(sender, instance, **kwargs):
+    user_id = instance.pk if sender is AppUsers else instance.user_id
+    readReplica.mark_write(user_id)
+
+    # --- DASHBOARD: drop the cached sections this row feeds ---
+    sections = dashboard.MODEL_SECTIONS.get(sender.__name__)
+    if sections and user_id:
+        transaction.on_commit(lambda: dashboard.invalidate(user_id, sections))
+
+
+def owned_row_saved(sender, instance, **kwargs):
+    # Owned through a parent row: only the replica pin needs the owner, so skip the lookup without a replica
+    if readReplica.enabled():
+        readReplica.mark_write(_owner_id(instance, OWNER_PATHS[sender]))
+
+
+for model in USER_ROWS:
+    post_save.connect(user_row_written, sender=model, dispatch_uid=f'user_row_saved.{model.__name__}')
+    post_delete.connect(user_row_written, sender=model, dispatch_uid=f'user_row_deleted.{model.__name__}')
+
+# Saves only: these are deleted by cascades from a parent that already pinned the owner,
+# and a delete receiver would take Django's fast-delete path away from the largest tables
+for model in OWNER_PATHS:
+    post_save.connect(owned_row_saved, sender=model, dispatch_uid=f'owned_row_saved.{model.__name__}')
+
+
+# --- SYNC FEED: latest change per synced row, tombstones for deletes; pushed to open sockets ---
+
+@receiver(post_save, sender=AppUsers)
+@receiver(post_save, sender=DietLog)
+@receiver(post_save, sender=WaterIntake)
+@receiver(post_save, sender=Workout)
+def synced_row_saved(sender, instance, **kwargs):
+    entry = changeFeed.record(instance, changeFeed.UPSERT)
+    if entry:
+        realtime.change(entry, changeFeed.row(instance))
+
+
+@receiver(pre_delete, sender=AppUsers)
+def user_deleting(sender, instance, **kwargs):
+    changeFeed.user_deleting(instance.pk)
+
+
+@receiver(post_delete, sender=AppUsers)
+@receiver(post_delete, sender=DietLog)
+@receiver(post_delete, sender=WaterIntake)
+@receiver(post_delete, sender=Workout)
+def synced_row_deleted(sender, instance, **kwargs):
+    if sender is AppUsers:
+        # Runs after the user's rows cascaded (without tombstones, see user_deleting)
+        changeFeed.forget_user(instance.pk)
+    else:
+        entry = changeFeed.record(instance, changeFeed.DELETE)
+        if entry:
+            realtime.change(entry)
@@ -0,0 +1,11 @@
+"""
+Background tasks run by services/taskQueue.py after a log is committed.
+"""
+
+from .services import achievements
+from .services.taskQueue import task
+
+
+@task("check_achievements")
+def check_achievements(user_id, event, context=None):
+    achievements.evaluate(user_id, event, context)
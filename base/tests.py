@@ -1,3 +1,770 @@
-from django.test import TestCase
+import json
+import tempfile
+import time
+import uuid
+from datetime import time as datetime_time, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models.deletion import Collector
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from pydantic import ValidationError
+
+from .models.appUsers import Achievement, AppUsers, BodyPartMetrics, NutritionTargets, UserAchievement, UserRPGStats
+from .models.changeLogs import ChangeLog
+from .models.dietLogs import DietLog
+from .models.exerciseLibrary import Exercise
+from .models.foods import Food
+from .models.habitLogs import HabitLog
+from .models.habits import Habit
+from .models.reminders import Reminder
+from .models.sleepLogs import SleepLog
+from .models.stepLogs import StepLog
+from .models.waterIntake import WaterIntake
+from .models.workoutExercises import WorkoutExercise
+from .models.workoutSessions import Workout
+from .models.workoutSet import ExerciseSet
+from .services import (achievements, changeFeed, dashboard, exerciseCatalogue, foodDatabase, history, idempotency,
+                       logArchive, logSchemas, nutritionTargets, readReplica, reminderScheduler, rpgScoring, taskQueue,
+                       userExport, waterReminders, wearableIngest, workoutPlans)
+
+API = "/api/v1/reactfit/v001/"
+
+
+def make_user(**fields):
+    return AppUsers.objects.create_user(username=f"test_{uuid.uuid4().hex[:8]}", password="x", **fields)
+
+
+def post_json(client, url, body):
+    return client.post(API + url, data=json.dumps(body), content_type="application/json")
+
+
+# --- NUTRITION DATABASE (services/foodDatabase.py) ---
+
+class ParseItemTests(TestCase):
+    def test_quantities(self):
+        self.assertEqual(foodDatabase.parse_item("2 slices of toast"), (2.0, None, "toast"))
+        self.assertEqual(foodDatabase.parse_item("200g chicken"), (200.0, "g", "chicken"))
+        self.assertEqual(foodDatabase.parse_item("1 1/2 cups rice"), (1.5, "cup", "rice"))
+        self.assertEqual(foodDatabase.parse_item("half banana"), (0.5, None, "banana"))
+
+    def test_rejects_implausible_quantities(self):
+        for text in ("0 eggs", "1/0 eggs", "0/4 eggs", "500 cups rice", "99999999999 eggs", "9 kg chicken"):
+            with self.subTest(text=text):
+                self.assertIsNone(foodDatabase.parse_item(text)[0])
+
+
+class FoodIndexVersionTests(TestCase):
+    def test_edits_from_another_process_are_picked_up(self):
+        self.assertEqual(foodDatabase.get_index().version, foodDatabase.table_version())
+        # No signal fires here, as for a write made by another process
+        Food.objects.bulk_create([Food(code="test-quokka-bar", name="Quokka Bar", serving_g=40, kcal=180)])
+        foodDatabase._checked_at = 0.0  # VERSION_CHECK_INTERVAL elapsed
+        self.assertEqual([f["name"] for f in foodDatabase.autocomplete("quokka")], ["Quokka Bar"])
+        if foodDatabase.INDEX_PATH:
+            self.assertEqual(foodDatabase.FoodIndex.open(foodDatabase.INDEX_PATH).version,
+                             foodDatabase.table_version())
+
+    def test_stale_file_is_rebuilt(self):
+        foodDatabase.get_index()
+        Food.objects.bulk_create([Food(code="test-wombat-bar", name="Wombat Bar", serving_g=40, kcal=180)])
+        foodDatabase._index = None  # a fresh process, the file on disk is older than the table
+        self.assertEqual([f["name"] for f in foodDatabase.autocomplete("wombat")], ["Wombat Bar"])
+
+
+    def test_foods_with_empty_servings_are_left_out(self):
+        bad = Food(code="test-numbat-bar", name="Numbat Bar", serving_g=0, kcal=180)
+        with self.assertRaises(DjangoValidationError):
+            bad.full_clean()
+        Food.objects.bulk_create([bad])
+        foodDatabase._index = None
+        self.assertEqual(foodDatabase.autocomplete("numbat"), [])
+        response = self.client.get(API + "resolvemeal/", {"q": "100g numbat bar"})
+        self.assertEqual(response.status_code, 200)
+
+
+class DietLogFoodsTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+
+    def log(self, **entry):
+        return post_json(self.client, "adddietlog/", {"userID": str(self.user.id), "messages": entry})
+
+    def test_foods_resolved_into_macros(self):
+        response = self.log(foods="2 eggs + toast")
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(DietLog.objects.get(user=self.user).calories, 0)
+
+    def test_bad_quantities_are_400(self):
+        for foods in ("500 cups rice", "99999999999 eggs", "1/0 eggs", "0 eggs"):
+            with self.subTest(foods=foods):
+                response = self.log(foods=foods)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()["invalid"], [foods])
+        self.assertFalse(DietLog.objects.filter(user=self.user).exists())
+
+    def test_totals_over_the_caps_are_400(self):
+        # Each item is plausible, the sum is not (Kilocalories caps at 10000)
+        response = self.log(foods=" + ".join(["5 cups rice"] * 12))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("calories", [d["field"] for d in response.json()["details"]])
+
+    def test_resolve_meal_reports_bad_quantities(self):
+        response = self.client.get(API + "resolvemeal/", {"q": "1/0 eggs + toast"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["invalid"], ["1/0 eggs"])
+
+
+# --- WEARABLE INGEST (services/wearableIngest.py) ---
+
+class WearableIngestTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+
+    def ingest(self, *samples, batch_size=wearableIngest.BATCH_SIZE):
+        lines = [json.dumps(sample) if isinstance(sample, dict) else sample for sample in samples]
+        return wearableIngest.ingest_ndjson(self.user.id, lines, batch_size=batch_size)
+
+    def test_bad_values_skip_the_line_not_the_sync(self):
+        good = {"type": "steps", "date": "2026-01-01", "step_count": 8000, "distance_km": 6.2, "active_minutes": 55}
+        bad = [
+            {"type": "steps", "date": "2026-01-02", "distance_km": "abc"},
+            {"type": "steps", "date": "2026-01-03", "active_minutes": "abc"},
+            {"type": "steps", "date": "2026-01-04", "distance_km": 99999999},
+            {"type": "steps", "date": "2026-01-05", "step_count": -5},
+            {"type": "steps", "date": "2026-01-06", "step_count": True},
+            {"type": "sleep", "bedtime": "2026-01-06T23:00:00", "wake_time": "2026-01-07T07:00:00", "quality_rating": 9},
+            {"type": "sleep", "bedtime": "2026-01-01T23:00:00", "wake_time": "2026-01-07T07:00:00"},
+            "{not json",
+        ]
+        last = {"type": "sleep", "bedtime": "2026-01-07T23:00:00", "wake_time": "2026-01-08T06:30:00",
+                "interruptions": None, "deep_sleep_hours": "1.25"}
+
+        result = self.ingest(good, *bad, last, batch_size=2)
+
+        self.assertEqual((result["steps"], result["sleep"], result["skipped"]), (1, 1, len(bad)))
+        self.assertEqual([e["line"] for e in result["errors"]], list(range(2, len(bad) + 2)))
+        self.assertEqual(StepLog.objects.get(user=self.user).active_minutes, 55)
+        sleep = SleepLog.objects.get(user=self.user)
+        self.assertEqual((sleep.interruptions, str(sleep.deep_sleep_hours)), (0, "1.2"))
+
+    def test_view_returns_counts(self):
+        body = "\n".join([
+            json.dumps({"type": "steps", "date": "2026-01-01", "step_count": 100}),
+            json.dumps({"type": "steps", "date": "2026-01-02", "distance_km": 99999999}),
+        ])
+        response = self.client.post(f"{API}ingestwearabledata/?userID={self.user.id}", data=body,
+                                    content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()["steps"], response.json()["skipped"]), (1, 1))
+
+    def test_view_rejects_bad_users(self):
+        for user_id, status in (("nope", 400), (str(uuid.uuid4()), 404)):
+            with self.subTest(user_id=user_id):
+                response = self.client.post(f"{API}ingestwearabledata/?userID={user_id}", data="",
+                                            content_type="application/x-ndjson")
+                self.assertEqual(response.status_code, status)
+
+
+# --- EXERCISE CATALOGUE (services/exerciseCatalogue.py) ---
+
+class ExerciseCatalogueVersionTests(TestCase):
+    def get(self, **headers):
+        return self.client.get(API + "exercisecatalogue/", **headers)
+
+    def test_edits_from_another_process_change_the_etag(self):
+        etag = self.get()["ETag"]
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # No signal fires here, as for a write made by another process
+        Exercise.objects.bulk_create([Exercise(name="Test Zercher Squat", category="strength", muscle_group="legs")])
+        exerciseCatalogue._checked_at = 0.0  # VERSION_CHECK_INTERVAL elapsed
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_custom_exercises_do_not_rebuild(self):
+        version = exerciseCatalogue.get_blob().version
+        Exercise.objects.create(name="Test Private Move", category="strength", muscle_group="legs", is_custom=True)
+        exerciseCatalogue._checked_at = 0.0
+        self.assertEqual(exerciseCatalogue.get_blob().version, version)
+
+
+# --- HISTORY VALIDATORS (services/history.py) ---
+
+class DietHistoryValidatorTests(TestCase):
+    def test_edit_changes_the_etag(self):
+        user = make_user()
+        log = DietLog.objects.create(user=user, title="Oats", calories=300, time="08:00", period="AM")
+        params = {"userID": str(user.id), "days": 7}
+        etag = self.client.get(API + "diethistory/", params)["ETag"]
+        self.assertEqual(self.client.get(API + "diethistory/", params, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        log.calories = 350
+        log.save()
+        response = self.client.get(API + "diethistory/", params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+    def test_malformed_user_id_is_400(self):
+        with mock.patch.object(history, "validators", wraps=history.validators) as validators:
+            for kind in ("diethistory/", "waterhistory/"):
+                self.assertEqual(self.client.get(API + kind, {"userID": "zz"}).status_code, 400)
+        validators.assert_not_called()
+
+
+# --- ARCHIVAL CARRY-OVER (services/logArchive.py) ---
+
+class ArchiveCarryOverTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.old = timezone.localdate().replace(day=1) - timedelta(days=400)
+        squat = Exercise.objects.create(name="Test Squat", category="strength", muscle_group="legs")
+        for day in (self.old, timezone.localdate()):
+            workout = Workout.objects.create(user=self.user, date=day, status="completed")
+            entry = WorkoutExercise.objects.create(workout=workout, exercise=squat)
+            ExerciseSet.objects.create(workout_exercise=entry, set_number=1, reps=5, weight_kg=100)
+            DietLog.objects.create(user=self.user, date=day, title="Oats", calories=300, time="08:00", period="AM")
+
+    def snapshot(self):
+        rpgScoring.recompute_block([self.user.id])
+        stats = UserRPGStats.objects.get(user=self.user)
+        metrics = BodyPartMetrics.objects.get(user=self.user)
+        return stats.total_workouts, stats.strength_score, metrics.quads_level, achievements._diet_logs_total(self.user.id)
+
+    def test_archiving_keeps_cumulative_stats(self):
+        before = self.snapshot()
+        self.assertEqual((before[0], before[3]), (2, 2))
+
+        with tempfile.TemporaryDirectory() as root, override_settings(LOG_ARCHIVE={'ROOT': root, 'COMPRESSION': 'zstd'}):
+            totals = logArchive.archive_older_than(6)
+            self.assertEqual(totals["workouts"], 1)
+            # Re-running finds nothing left to fold twice
+            logArchive.archive_older_than(6)
+
+        self.assertEqual(Workout.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(self.snapshot(), before)
+
+
+# --- READ REPLICA STICKINESS (services/readReplica.py) ---
+
+class ReplicaStickinessTests(TestCase):
+    def test_rows_owned_through_a_parent_pin_their_owner(self):
+        user = make_user()
+        habit = Habit.objects.create(user=user, name="Stretch")
+        with mock.patch.object(readReplica, "enabled", return_value=True), \
+                mock.patch.object(readReplica, "mark_write") as mark_write:
+            HabitLog.objects.create(habit=habit, completed=True)
+        mark_write.assert_called_once_with(user.id)
+
+    def test_unrelated_models_keep_fast_deletes(self):
+        collector = Collector(using="default")
+        for model in (ExerciseSet, HabitLog, ChangeLog):
+            with self.subTest(model=model.__name__):
+                self.assertTrue(collector.can_fast_delete(model.objects.all()))
+
+    def test_sticky_cache_must_be_shared(self):
+        with mock.patch.object(readReplica, "enabled", return_value=True):
+            self.assertEqual(readReplica.check_sticky_cache(), [])
+            local = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+            with override_settings(CACHES={**settings.CACHES, readReplica.STICKY_CACHE: local}):
+                self.assertEqual([e.id for e in readReplica.check_sticky_cache()], ["base.E001"])
+
+
+# --- NUTRITION TARGETS (services/nutritionTargets.py) ---
+
+class NutritionTargetsRecomputeTests(TestCase):
+    def test_bulk_recompute_syncs_todays_water_goal(self):
+        user = make_user(weight=70, height=175)
+        water = WaterIntake.objects.create(user=user, daily_goal_ml=1000)
+        key = dashboard._key("water", user.id, timezone.localdate())
+        caches[dashboard.CACHE_ALIAS].set(key, b"{}")
+
+        # No signal fires here, as for a backfill after a formula change
+        AppUsers.objects.filter(pk=user.pk).update(weight=100)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(nutritionTargets.recompute_all(), 1)
+
+        goal = NutritionTargets.objects.get(user=user).water_ml
+        last_sip = water.last_intake_at
+        water.refresh_from_db()
+        self.assertEqual(water.daily_goal_ml, goal)
+        self.assertIsNone(caches[dashboard.CACHE_ALIAS].get(key))
+        # A new goal is not a sip: the behind-pace reminder sweep must still see the old one
+        self.assertEqual(water.last_intake_at, last_sip)
+
+    def test_goal_change_keeps_water_reminders_due(self):
+        user = make_user(weight=70, height=175)
+        sip = timezone.now() - timedelta(hours=3)
+        WaterIntake.objects.create(user=user, current_intake_ml=100, daily_goal_ml=2000, last_intake_at=sip)
+        user.weight = 100
+        user.save()
+
+        now = timezone.now()
+        due = waterReminders.behind_pace_queryset(timezone.localdate(now), now - waterReminders.MIN_GAP, 0.5)
+        self.assertEqual([row[1] for row in due], [user.id])
+
+    def test_targets_are_exported(self):
+        self.assertIn("nutrition_targets", userExport.TABLES)
+
+
+# --- DASHBOARD (services/dashboard.py) ---
+
+class DashboardTests(TestCase):
+    def test_non_canonical_user_id_shares_the_cache(self):
+        user = make_user()
+        raw = user.id.hex.upper()  # no dashes, upper case
+        etag = self.client.get(API + "dashboard/", {"userID": raw})["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            WaterIntake.objects.create(user=user, current_intake_ml=500)
+        response = self.client.get(API + "dashboard/", {"userID": raw}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_malformed_user_id_is_400(self):
+        self.assertEqual(self.client.get(API + "dashboard/", {"userID": "not-a-uuid"}).status_code, 400)
+
+    def test_if_none_match_compares_whole_etags(self):
+        user = make_user()
+        etag = self.client.get(API + "dashboard/", {"userID": str(user.id)})["ETag"]
+        for header, status in ((etag, 304), (f'"x", {etag.removeprefix("W/")}', 304), ("*", 304),
+                               (etag[:-4] + '"', 200), (f'"{etag}"', 200), ("", 200)):
+            with self.subTest(header=header):
+                response = self.client.get(API + "dashboard/", {"userID": str(user.id)}, HTTP_IF_NONE_MATCH=header)
+                self.assertEqual(response.status_code, status)
+
+    def test_sections_are_cached_where_every_worker_sees_them(self):
+        self.assertEqual(dashboard.CACHE_ALIAS, "shared")
+        self.assertNotIn(settings.CACHES[dashboard.CACHE_ALIAS]["BACKEND"], readReplica.PROCESS_LOCAL_CACHES)
+
+
+# --- WORKOUT PLANS (services/workoutPlans.py) ---
+
+class WorkoutPlanTests(TestCase):
+    def test_other_users_custom_exercises_are_not_reused(self):
+        owner, user = make_user(), make_user()
+        theirs = Exercise.objects.create(name="Test Secret Move", category="strength", muscle_group="legs",
+                                         is_custom=True, created_by=owner)
+        planned = [workoutPlans.PlannedExercise(name="test secret move", category="strength", muscle_group="legs",
+                                                working_sets=[workoutPlans.PlannedSet(weight_kg=60, reps=5)])]
+
+        mine = workoutPlans.resolve_exercises(user, planned)["test secret move"]
+        self.assertNotEqual(mine.pk, theirs.pk)
+        self.assertEqual(mine.created_by_id, user.id)
+        self.assertEqual(workoutPlans.resolve_exercises(user, planned)["test secret move"].pk, mine.pk)
+
+    def test_bad_parameters_are_400(self):
+        user = make_user()
+        url = API + "getworkoutplans/"
+        self.assertEqual(self.client.get(url, {"userID": "not-a-uuid"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"userID": str(user.id), "limit": "abc"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"userID": str(user.id), "limit": -1}).status_code, 200)
+
+    def test_generate_rejects_bad_users_before_calling_the_model(self):
+        for user_id, status in (("nope", 400), (str(uuid.uuid4()), 404)):
+            with self.subTest(user_id=user_id):
+                response = post_json(self.client, "generateworkoutplan/", {"userID": user_id, "messages": []})
+                self.assertEqual(response.status_code, status)
+
+    def test_planned_weight_fits_the_column(self):
+        with self.assertRaises(ValidationError):
+            workoutPlans.PlannedSet(weight_kg=123456, reps=5)
+
+
+# --- USER EXPORT (services/userExport.py) ---
+
+class UserExportTests(TestCase):
+    def test_malformed_user_id_is_400(self):
+        self.assertEqual(self.client.get(API + "exportuserdata/", {"userID": "not-a-uuid"}).status_code, 400)
+        self.assertEqual(self.client.get(API + "exportuserdata/", {"userID": str(uuid.uuid4())}).status_code, 404)
+
+
+# --- HABIT LOGS (services/habitStreaks.py) ---
+
+class HabitLogTests(TestCase):
+    def test_bad_dates_are_400(self):
+        user = make_user()
+        habit = Habit.objects.create(user=user, name="Stretch")
+        for date in ("2026-13-45", "yesterday", 20260101):
+            with self.subTest(date=date):
+                response = post_json(self.client, "addhabitlog/", {
+                    "userID": str(user.id), "messages": {"habitID": str(habit.id), "date": date}})
+                self.assertEqual(response.status_code, 400)
+        self.assertFalse(HabitLog.objects.filter(habit=habit).exists())
+
+    def test_bad_ids_are_400_and_unknown_ids_404(self):
+        user = make_user()
+        habit = Habit.objects.create(user=user, name="Stretch")
+        cases = [
+            ("addhabit/", {"userID": "nope", "messages": {"name": "Read"}}, 400),
+            ("addhabit/", {"userID": str(uuid.uuid4()), "messages": {"name": "Read"}}, 404),
+            ("addhabitlog/", {"userID": "nope", "messages": {"habitID": str(habit.id)}}, 400),
+            ("addhabitlog/", {"userID": str(user.id), "messages": {"habitID": "nope"}}, 400),
+            ("addhabitlog/", {"userID": str(user.id), "messages": {"habitID": str(uuid.uuid4())}}, 404),
+        ]
+        for url, body, status in cases:
+            with self.subTest(url=url, body=body):
+                self.assertEqual(post_json(self.client, url, body).status_code, status)
+
+
+# --- REMINDER SCHEDULER (services/reminderScheduler.py) ---
+
+class ReminderSchedulerTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.sink = reminderScheduler.QueueSink()
+        self.scheduler = reminderScheduler.ReminderScheduler(self.sink)
+
+    def remind(self):
+        return Reminder.objects.create(user=self.user, type="water", title="Drink", time=datetime_time(9, 0))
+
+    def test_reminders_deleted_elsewhere_are_dropped_when_due(self):
+        reminder = self.remind()
+        self.scheduler.load()
+        due_at = self.scheduler._heap[0][0]
+        Reminder.objects.filter(pk=reminder.pk).delete()  # another process: no signal reaches us
+
+        self.assertEqual(self.scheduler.run_pending(due_at), 0)
+        self.assertEqual(self.scheduler._specs, {})
+        self.assertIsNone(self.scheduler.seconds_until_next(due_at))
+
+    def test_due_reminders_fire_and_rearm(self):
+        self.remind()
+        self.scheduler.load()
+        due_at = self.scheduler._heap[0][0]
+        self.assertEqual(self.scheduler.run_pending(due_at), 1)
+        self.assertGreater(self.scheduler.seconds_until_next(due_at), 0)
+
+    def test_late_commits_are_picked_up_once(self):
+        self.scheduler.load()
+        reminder = self.remind()
+        # Stamped before the last sync, committed after it
+        Reminder.objects.filter(pk=reminder.pk).update(updated_at=self.scheduler._last_sync - timedelta(seconds=5))
+
+        self.scheduler.sync_changes()
+        seq = self.scheduler._specs[reminder.pk][0]
+        self.scheduler.sync_changes()
+        self.assertEqual(self.scheduler._specs[reminder.pk][0], seq)
+        self.assertEqual(len(self.scheduler._heap), 1)
+
+
+# --- SYNC CHANGE FEED (services/changeFeed.py) ---
+
+class ChangeFeedTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+
+    def diet_log(self, title):
+        return DietLog.objects.create(user=self.user, title=title, calories=300, time="08:00", period="AM")
+
+    def changes(self, **kwargs):
+        return [(c["table"], c["op"], c["row"]["id"] if "row" in c else c["id"])
+                for c in changeFeed.page(self.user.id, **kwargs)["changes"]]
+
+    def test_upsert_moves_to_the_head(self):
+        first, second = self.diet_log("Oats"), self.diet_log("Eggs")
+        first.calories = 350
+        first.save()
+        self.assertEqual(self.changes(), [
+            ("profile", "upsert", self.user.id), ("diet_logs", "upsert", second.id), ("diet_logs", "upsert", first.id),
+        ])
+
+    def test_delete_leaves_a_tombstone(self):
+        log = self.diet_log("Oats")
+        cursor = changeFeed.page(self.user.id)["cursor"]
+        log_id = log.id
+        log.delete()
+        self.assertEqual(self.changes(cursor=cursor), [("diet_logs", "delete", str(log_id))])
+
+    def test_limit_and_has_more(self):
+        logs = [self.diet_log(title) for title in ("Oats", "Eggs")]
+        first = changeFeed.page(self.user.id, limit=2)
+        self.assertTrue(first["has_more"])
+        self.assertEqual(len(first["changes"]), 2)
+
+        rest = changeFeed.page(self.user.id, cursor=first["cursor"], limit=2)
+        self.assertFalse(rest["has_more"])
+        self.assertEqual([c["row"]["id"] for c in rest["changes"]], [logs[1].id])
+
+    def test_future_cursor_resets(self):
+        head = changeFeed.page(self.user.id)["cursor"]
+        self.assertNotIn("reset", changeFeed.page(self.user.id, cursor=head))
+        self.assertTrue(changeFeed.page(self.user.id, cursor=head + 100)["reset"])
+
+    def test_user_delete_writes_no_tombstones(self):
+        for title in ("Oats", "Eggs", "Toast"):
+            self.diet_log(title)
+        with mock.patch.object(changeFeed, "_next_seq", wraps=changeFeed._next_seq) as next_seq:
+            self.user.delete()
+        next_seq.assert_not_called()
+        self.assertFalse(ChangeLog.objects.filter(user_id=self.user.id).exists())
+
+        # Other users' deletes still write theirs
+        other = make_user()
+        log = DietLog.objects.create(user=other, title="Oats", calories=300, time="08:00", period="AM")
+        log.delete()
+        self.assertEqual(ChangeLog.objects.get(user_id=other.id, table="diet_logs").op, changeFeed.DELETE)
+
+    def test_malformed_user_id_is_400(self):
+        self.assertEqual(self.client.get(API + "sync/", {"userID": "nope"}).status_code, 400)
+
+    def test_suppressed_deletes_leave_no_tombstone(self):
+        log = self.diet_log("Oats")
+        cursor = changeFeed.page(self.user.id)["cursor"]
+        with changeFeed.suppressed():
+            log.delete()
+        self.assertEqual(changeFeed.page(self.user.id, cursor=cursor)["changes"], [])
+        self.assertEqual(self.changes(), [("profile", "upsert", self.user.id)])
+
+
+# --- LOG SCHEMAS (services/logSchemas.py) ---
+
+class LogSchemaTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+
+    def test_units_are_parsed(self):
+        entry = logSchemas.DietEntry.model_validate({"calories": "300 cal", "protein": "0.1kg", "fat": 12.4})
+        self.assertEqual((entry.calories, entry.protein, entry.fat), (300, 100, 12))
+        for amount, ml in (("250", 250), ("250ml", 250), ("0.5 L", 500), ("8 fl oz", 237)):
+            with self.subTest(amount=amount):
+                self.assertEqual(logSchemas.WaterEntry.model_validate({"amount": amount}).amount, ml)
+
+    def test_bad_water_amounts_are_400(self):
+        for amount in (0, -250, 6000, "6 L", "a glass", True, "250 cups"):
+            with self.subTest(amount=amount):
+                response = post_json(self.client, "addwaterintakelog/",
+                                     {"userID": str(self.user.id), "messages": {"amount": amount}})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual([d["field"] for d in response.json()["details"]], ["messages.amount"])
+        self.assertFalse(WaterIntake.objects.filter(user=self.user).exists())
+
+    def test_bad_diet_values_are_400(self):
+        response = post_json(self.client, "adddietlog/", {"userID": str(self.user.id), "messages": {
+            "title": "Feast", "calories": 20000, "protein": "3kg", "carbs": "lots", "period": "noon"}})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(sorted(d["field"] for d in response.json()["details"]),
+                         ["messages.calories", "messages.carbs", "messages.period", "messages.protein"])
+        self.assertFalse(DietLog.objects.filter(user=self.user).exists())
+
+    def test_malformed_user_id_is_400(self):
+        response = post_json(self.client, "addwaterintakelog/", {"userID": "not-a-uuid", "messages": {"amount": 250}})
+        self.assertEqual(response.status_code, 400)
+
+
+# --- WORKOUT LOGS (services/workoutLogs.py) ---
+
+class WorkoutLogTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+
+    def log(self, *sets):
+        return post_json(self.client, "logworkoutsession/", {"userID": str(self.user.id), "messages": {
+            "exercises": [{"name": "Test Squat", "muscle_group": "legs", "sets": list(sets)}]}})
+
+    def test_session_is_logged(self):
+        response = self.log({"reps": 5, "weight_kg": 100}, {"reps": 5, "weight_kg": 102.5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["total_volume_kg"], 1012.5)
+
+    def test_unknown_user_is_404(self):
+        response = post_json(self.client, "logworkoutsession/", {"userID": str(uuid.uuid4()), "messages": {}})
+        self.assertEqual(response.status_code, 404)
+
+    def test_stats_are_applied_with_the_workout(self):
+        with mock.patch.object(rpgScoring, "apply_session", side_effect=RuntimeError("crashed")):
+            self.assertEqual(self.log({"reps": 5, "weight_kg": 100}).status_code, 500)
+        self.assertFalse(Workout.objects.filter(user=self.user).exists())
+
+        self.assertEqual(self.log({"reps": 5, "weight_kg": 100}).status_code, 200)
+        self.assertEqual(UserRPGStats.objects.get(user=self.user).total_workouts, 1)
+
+    def test_values_over_the_column_limits_are_400(self):
+        for bad in ({"reps": 5, "weight_kg": 123456789}, {"reps": 10 ** 6, "weight_kg": 1},
+                    {"distance_meters": 10 ** 7}, {"weight_kg": -1}):
+            with self.subTest(bad=bad):
+                self.assertEqual(self.log(bad).status_code, 400)
+        self.assertFalse(Workout.objects.filter(user=self.user).exists())
+
+    def test_total_volume_overflow_is_400(self):
+        heavy = {"reps": 1000, "weight_kg": 9999.99}
+        response = self.log(*[heavy] * 11)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("total volume", response.json()["details"][0]["error"])
+        self.assertFalse(Workout.objects.filter(user=self.user).exists())
+
+
+# --- IDEMPOTENCY KEYS (services/idempotency.py) ---
+
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.key = uuid.uuid4().hex
+
+    def log_water(self, amount, key=None):
+        return self.client.post(API + "addwaterintakelog/", content_type="application/json",
+                                data=json.dumps({"userID": str(self.user.id), "messages": {"amount": amount}}),
+                                HTTP_IDEMPOTENCY_KEY=key or self.key)
+
+    def total(self):
+        return WaterIntake.objects.get(user=self.user).current_intake_ml
+
+    def test_retry_replays_without_writing_again(self):
+        first = self.log_water(250)
+        retry = self.log_water(250)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(retry.content, first.content)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(self.total(), 250)
+
+        self.log_water(250, key=uuid.uuid4().hex)
+        self.assertEqual(self.total(), 500)
+
+    def test_reused_key_with_another_body_is_422(self):
+        self.log_water(250)
+        self.assertEqual(self.log_water(500).status_code, 422)
+        self.assertEqual(self.total(), 250)
+
+    def test_duplicate_in_flight_waits_then_gives_up(self):
+        cache = idempotency.caches[idempotency.CACHE_ALIAS]
+        lock_key = f"{idempotency.KEY_PREFIX}{API}addwaterintakelog/:{self.key}:lock"
+        cache.add(lock_key, 1, idempotency.LOCK_SECONDS)  # the first attempt is still running
+        try:
+            with mock.patch.object(idempotency, "WAIT_SECONDS", 0.2):
+                self.assertEqual(self.log_water(250).status_code, 409)
+        finally:
+            cache.delete(lock_key)
+        self.assertFalse(WaterIntake.objects.filter(user=self.user).exists())
+
+    def test_duplicate_in_flight_replays_the_first_result(self):
+        first = self.log_water(250)
+        cache = idempotency.caches[idempotency.CACHE_ALIAS]
+        cache_key = f"{idempotency.KEY_PREFIX}{API}addwaterintakelog/:{self.key}"
+        entry = cache.get(cache_key)
+        cache.delete(cache_key)
+        cache.add(f"{cache_key}:lock", 1, idempotency.LOCK_SECONDS)
+
+        # The first attempt finishes while the duplicate polls
+        def finish(seconds):
+            cache.set(cache_key, entry)
+        with mock.patch.object(idempotency.time, "sleep", side_effect=finish):
+            retry = self.log_water(250)
+        cache.delete(f"{cache_key}:lock")
+        self.assertEqual((retry.status_code, retry.content), (200, first.content))
+        self.assertEqual(self.total(), 250)
+
+    def test_cache_is_shared_between_workers(self):
+        backend = settings.CACHES[idempotency.CACHE_ALIAS]["BACKEND"]
+        self.assertNotIn(backend, readReplica.PROCESS_LOCAL_CACHES)
+
+
+# --- ACHIEVEMENTS (services/achievements.py) ---
+
+class AchievementRuleTests(TestCase):
+    def test_bad_values_and_events_are_rejected_at_compile_time(self):
+        streak = {"metric": "habit_streak", "op": ">=", "value": 3}
+        for logic in ({**streak, "value": "3"}, {**streak, "value": True}, {**streak, "value": None},
+                      {**streak, "events": "habit_logged"}, {**streak, "events": ["habit_loged"]}):
+            with self.subTest(logic=logic):
+                with self.assertRaises(achievements.RuleError):
+                    achievements.rule_events(logic, achievements.compile_rule(logic)[1])
+
+    def test_bad_rules_are_skipped_not_retried(self):
+        Achievement.objects.create(name="Test Bad", description="x", category="consistency", condition_logic={
+            "metric": "water_today_ml", "op": ">=", "value": "lots"})
+        achievements.registry.invalidate()
+        self.assertEqual(achievements.evaluate(make_user().id, achievements.WATER_LOGGED), [])
+
+    def test_habit_rules_read_the_current_streak(self):
+        user = make_user()
+        habit = Habit.objects.create(user=user, name="Stretch", current_streak=3, completed_count=3,
+                                     last_completed_date=timezone.localdate())
+        Achievement.objects.create(name="Test Three Days", description="x", category="consistency", condition_logic={
+            "metric": "habit_streak", "op": ">=", "value": 3})
+        achievements.registry.invalidate()
+
+        # The context of a collapsed task is stale; only the habit id is used
+        unlocked = achievements.evaluate(user.id, achievements.HABIT_LOGGED,
+                                         {"habit_id": str(habit.id), "habit_streak": 0})
+        self.assertEqual(unlocked, ["Test Three Days"])
+        self.assertTrue(UserAchievement.objects.filter(user=user).exists())
+
+
+# --- TASK QUEUE (services/taskQueue.py) ---
+
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        self.calls = []
+        self.fail_times = 0
+
+        def record(n):
+            if self.fail_times:
+                self.fail_times -= 1
+                raise RuntimeError("flaky")
+            self.calls.append(n)
+
+        handlers = mock.patch.dict(taskQueue._handlers, {"test_record": record})
+        handlers.start()
+        self.addCleanup(handlers.stop)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.sqlite_path = f"{tmp.name}/tasks.sqlite3"
+
+    def backends(self):
+        return {"memory": taskQueue.MemoryBackend(), "sqlite": taskQueue.SQLiteBackend(self.sqlite_path)}
+
+    def test_pending_duplicates_collapse(self):
+        for kind, backend in self.backends().items():
+            with self.subTest(backend=kind):
+                self.calls.clear()
+                queue = taskQueue.TaskQueue(backend)
+                self.assertTrue(queue.enqueue("test_record", {"n": 1}, dedupe_key="k"))
+                self.assertFalse(queue.enqueue("test_record", {"n": 2}, dedupe_key="k"))
+                self.assertEqual(queue.drain(), 1)
+                self.assertEqual(self.calls, [1])
+                self.assertEqual(len(backend), 0)
+
+    def test_failures_are_retried_with_backoff(self):
+        for kind, backend in self.backends().items():
+            with self.subTest(backend=kind):
+                self.calls.clear()
+                self.fail_times = 1
+                queue = taskQueue.TaskQueue(backend)
+                queue.enqueue("test_record", {"n": 1})
+                self.assertEqual(queue.drain(), 1)
+                self.assertEqual((self.calls, len(backend)), ([], 1))
+                # Not due until the backoff passes
+                self.assertEqual(queue.drain(), 0)
+                later = time.time() + taskQueue.BASE_RETRY_DELAY_SECONDS + 1
+                with mock.patch.object(taskQueue, "time", mock.Mock(time=lambda: later)):
+                    self.assertEqual(queue.drain(), 1)
+                self.assertEqual((self.calls, len(backend)), ([1], 0))
+
+    def test_expired_sqlite_claims_are_reclaimed(self):
+        backend = taskQueue.SQLiteBackend(self.sqlite_path, lease_seconds=60)
+        backend.push("test_record", {"n": 1}, "k")
+        now = time.time()
+        # A drainer claims the task and dies before finishing it
+        self.assertEqual(len(backend.claim(10, now)), 1)
+        self.assertEqual(backend.claim(10, now + 30), [])
+
+        [item] = backend.claim(10, now + 61)
+        self.assertEqual(item["attempts"], 1)
+        taskQueue.TaskQueue(backend)._run(item)
+        self.assertEqual(self.calls, [1])
+        self.assertEqual(backend._conn().execute("SELECT COUNT(*) FROM tasks").fetchone()[0], 0)
+
+    def test_tasks_that_keep_losing_their_lease_are_abandoned(self):
+        backend = taskQueue.SQLiteBackend(self.sqlite_path, lease_seconds=60)
+        backend.push("test_record", {"n": 1}, "k")
+        now = time.time()
+        for lost in range(taskQueue.MAX_ATTEMPTS + 1):
+            [item] = backend.claim(10, now + lost * 61)
+        taskQueue.TaskQueue(backend)._run(item)
+        self.assertEqual(self.calls, [])
+        self.assertEqual(backend._conn().execute("SELECT COUNT(*) FROM tasks").fetchone()[0], 0)
@@ -7,6 +7,21 @@ urlpatterns = [
     path('reactfit/v001/setupuser/',views.setupUser),
     path("reactfit/v001/chat/",views.continueChat),
     path("reactfit/v001/addwaterintakelog/",views.addWaterIntakeLog),
-    path("reactfit/v001/adddietlog/",views.addDietLog)
+    path("reactfit/v001/adddietlog/",views.addDietLog),
+    path("reactfit/v001/generateworkoutplan/",views.generateWorkoutPlan),
+    path("reactfit/v001/getworkoutplans/",views.getWorkoutPlans),
+    path("reactfit/v001/ingestwearabledata/",views.ingestWearableData),
+    path("reactfit/v001/addhabit/",views.addHabit),
+    path("reactfit/v001/addhabitlog/",views.addHabitLog),
+    path("reactfit/v001/logworkoutsession/",views.logWorkoutSession),
+    path("reactfit/v001/updateprofile/",views.updateProfile),
+    path("reactfit/v001/exportuserdata/",views.exportUserData),
+    path("reactfit/v001/dashboard/",views.getDashboard),
+    path("reactfit/v001/diethistory/",views.getDietHistory),
+    path("reactfit/v001/waterhistory/",views.getWaterHistory),
+    path("reactfit/v001/exercisecatalogue/",views.getExerciseCatalogue),
+    path("reactfit/v001/sync/",views.syncChanges),
+    path("reactfit/v001/foodautocomplete/",views.getFoodAutocomplete),
+    path("reactfit/v001/resolvemeal/",views.resolveMeal),
     
 ]
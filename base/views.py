@@ -1,8 +1,12 @@
 import json
 import os
 import re  # <--- IMPORTED for Regex
-from django.http import JsonResponse
+import uuid
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
 from groq import Groq
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
@@ -10,9 +14,20 @@ from rest_framework.permissions import AllowAny
 from .models.appUsers import AppUsers
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.db import transaction
+from django.utils.dateparse import parse_date
 from .serializers import RegisterSerializer
+from .renderers import ORJSONResponse
 from .models.waterIntake import WaterIntake
 from .models.dietLogs import DietLog
+from .models.waterIntakeLogs import WaterIntakeLog
+from .models.habits import Habit
+from .services import workoutPlans, wearableIngest, habitStreaks, workoutLogs, achievements, taskQueue
+from .services import dashboard, nutritionTargets, profileCache, readReplica, userExport
+from .services import changeFeed, exerciseCatalogue, foodDatabase, history, httpCompression, logSchemas, realtime
+from .services.idempotency import idempotent
+from .models.workoutSessions import Workout
+from pydantic import ValidationError
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -54,9 +69,10 @@ def extract_user_context(messages):
     return None
 
 # --- 2. SYSTEM PROMPT GENERATOR ---
-def generate_system_instruction(user_profile):
+def generate_system_instruction(user_profile, structured=False):
     """
     Constructs the System Prompt dynamically based on DB user_profile.
+    structured=True swaps the free-text exercise format for the JSON plan schema.
     """
     
     # 1. Default Fallbacks
@@ -72,6 +88,7 @@ def generate_system_instruction(user_profile):
     height = user_profile.get("height", "N/A")
     water_today = user_profile.get("water", "0")
     diet_today = user_profile.get("diet", "0 kcal")
+    targets = user_profile.get("targets", "N/A")
 
     # 2. The Master Template
     system_prompt = f"""
@@ -90,9 +107,21 @@ def generate_system_instruction(user_profile):
     * **Height:** {height} cm
     * **TODAY'S WATER INTAKE:** {water_today} ml
     * **TODAY'S NUTRITION:** {diet_today}
+    * **DAILY TARGETS:** {targets}
     * **Conditions:** {conditions}
 
     **INSTRUCTIONS:**
+    """
+
+    if structured:
+        system_prompt += f"""
+    * Build one workout session with weights, progressive overload & number of reps.
+    Provide exercises to user according to their height and weights (According to beginner lifter level)
+    {workoutPlans.structured_output_instruction()}
+    """
+        return system_prompt.strip()
+
+    system_prompt += """
     * Start every response by acknowledging their current stats if relevant (e.g., "Good job hitting 2L water" or "You are low on protein today").
     * Provide exercises with weights, progressive overload & number of reps.
     * Example Format for Exercise:
@@ -107,7 +136,39 @@ def generate_system_instruction(user_profile):
     return system_prompt.strip()
 
 
-# --- 3. VIEWS ---
+# --- 3. HELPER: FOLLOW-UP WORK ---
+def queue_achievement_check(user_id, event, scope="", context=None):
+    """
+    Badge checks run on the background queue after commit, so they add no latency here.
+    Pending checks for the same user/day/event/scope collapse into one.
+    """
+    taskQueue.enqueue_for_user_day(
+        "check_achievements", user_id, timezone.localdate(), scope=f"{event}:{scope}",
+        event=event, context=context,
+    )
+
+
+# --- 4. HELPER: IDS FROM THE REQUEST ---
+def parse_uuid(value):
+    """UUID from a request value, or None when it is malformed."""
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def get_user_or_error(user_id):
+    """(user, None), or (None, a 400/404 response) for a malformed or unknown userID."""
+    user_id = parse_uuid(user_id)
+    if user_id is None:
+        return None, JsonResponse({"error": "Invalid UserID"}, status=400)
+    user = AppUsers.objects.filter(id=user_id).first()
+    if user is None:
+        return None, JsonResponse({"error": "User not found"}, status=404)
+    return user, None
+
+
+# --- 5. VIEWS ---
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -130,6 +191,15 @@ def continueChat(request):
             # print(data)
             history = data.get("messages", [])
             user_profile = {}
+
+            # --- A. STORED PROFILE (cached) AS BASELINE ---
+            profile = profileCache.get_profile(data.get("userID")) if data.get("userID") else None
+            if profile:
+                user_profile["name"] = profile.firstName or "Athlete"
+                user_profile["main_goal"] = profile.primaryGoal or "optimize fitness"
+                user_profile["weight"] = profile.weight or "N/A"
+                user_profile["height"] = profile.height or "N/A"
+                user_profile["targets"] = nutritionTargets.describe(profile.targets)
             
             # --- B. EXTRACT DYNAMIC DATA FROM CHAT ---
             extracted_data = extract_user_context(history)
@@ -158,6 +228,28 @@ def continueChat(request):
             final_messages = [system_message_obj] + history
 
             # --- E. CALL GROQ API ---
+            user_id = data.get("userID")
+            if data.get("stream") and user_id:
+                # Tokens are pushed to the user's open sockets as they arrive; the full reply is still returned
+                chat_id = str(data.get("chatID") or uuid.uuid4())
+                parts = []
+                try:
+                    for chunk in client.chat.completions.create(
+                        messages=final_messages,
+                        model="llama-3.1-8b-instant",
+                        temperature=0.7,
+                        max_tokens=600,
+                        stream=True,
+                    ):
+                        token = chunk.choices[0].delta.content if chunk.choices else None
+                        if token:
+                            parts.append(token)
+                            realtime.chat_token(user_id, chat_id, token)
+                finally:
+                    realtime.chat_done(user_id, chat_id)
+
+                return JsonResponse({"message": "".join(parts), "chatID": chat_id})
+
             chat_completion = client.chat.completions.create(
                 messages=final_messages,
                 model="llama-3.1-8b-instant", 
@@ -178,41 +270,43 @@ def continueChat(request):
     return JsonResponse({"message": "Method not allowed"}, status=405)
 
 
+@idempotent
 @api_view(["POST"])
 @permission_classes([AllowAny])
 def addWaterIntakeLog(request):
     try:
-        data = request.data
-        print(f"💧 Received Water Log: {data}")
+        # 1. Decode + validate the raw body in one pass ("250", "250ml", "0.5 L", ...)
+        try:
+            payload = logSchemas.WaterLogRequest.model_validate_json(request.body)
+        except ValidationError as e:
+            return JsonResponse({"error": "Invalid water log", "details": logSchemas.error_details(e)}, status=400)
 
-        # 1. Extract Data
-        user_id = data.get("userID")
-        log_entry = data.get("messages", {}) 
-        
-        # 2. Parse Amount
-        amount_str = log_entry.get("amount", "0") 
-        amount_int = int(str(amount_str).lower().replace("ml", "").strip())
+        print(f"💧 Received Water Log: {payload.messages.amount}ml for {payload.userID}")
+        amount_int = payload.messages.amount
 
-        if not user_id:
-            return JsonResponse({"error": "UserID is required"}, status=400)
-
-        # 3. Get User
-        user = get_object_or_404(AppUsers, id=user_id)
+        # 2. Get User (cached profile, no DB hit on the hot path)
+        user = profileCache.get_profile(payload.userID)
+        if user is None:
+            return JsonResponse({"error": "User not found"}, status=404)
 
-        # 4. Get or Create Today's Record
+        # 3. Get or Create Today's Record
         today = timezone.now().date()
         
         water_record, created = WaterIntake.objects.get_or_create(
-            user=user,
+            user_id=user.id,
             date=today,
-            defaults={'current_intake_ml': 0, 'daily_goal_ml': 3000}
+            defaults={'current_intake_ml': 0, 'daily_goal_ml': nutritionTargets.water_goal_ml(user)}
         )
 
-        # 5. Add to existing total
-        water_record.current_intake_ml += amount_int
-        water_record.save()
+        # 4. Add to existing total + keep the individual entry
+        with transaction.atomic():
+            water_record.current_intake_ml += amount_int
+            water_record.last_intake_at = timezone.now()
+            water_record.save()
+            WaterIntakeLog.objects.create(user_id=user.id, date=today, amount_ml=amount_int)
 
         print(f"✅ Updated Water: +{amount_int}ml | Total: {water_record.current_intake_ml}ml")
+        queue_achievement_check(user.id, achievements.WATER_LOGGED)
 
         return JsonResponse({
             "message": "Log stored successfully",
@@ -221,68 +315,566 @@ def addWaterIntakeLog(request):
             "date": str(today)
         }, status=200)
 
-    except ValueError:
-        return JsonResponse({"error": "Invalid amount format"}, status=400)
     except Exception as e:
         print(f"❌ Server Error: {str(e)}")
         return JsonResponse({"error": str(e)}, status=500)
     
+@idempotent
 @api_view(["POST"])
 @permission_classes([AllowAny])
 def addDietLog(request):
+    try:
+        # 1. Decode + validate the raw body in one pass ("12g", "300 kcal", ...)
+        try:
+            payload = logSchemas.DietLogRequest.model_validate_json(request.body)
+        except ValidationError as e:
+            return JsonResponse({"error": "Invalid diet log", "details": logSchemas.error_details(e)}, status=400)
+
+        log_entry = payload.messages
+        print(f"🥦 Received Diet Log: {log_entry.title} for {payload.userID}")
+
+        # 2. Extract User
+        user = profileCache.get_profile(payload.userID)
+        if user is None:
+            return JsonResponse({"error": "User not found"}, status=404)
+
+        # 3. Macros from the nutrition database when the meal is described ("2 eggs + toast")
+        if log_entry.foods:
+            meal = foodDatabase.resolve(log_entry.foods)
+            if meal["invalid"]:
+                return JsonResponse({"error": "Invalid food quantities", "invalid": meal["invalid"]}, status=400)
+            if meal["unmatched"] or not meal["items"]:
+                return JsonResponse({"error": "Unrecognised foods", "unmatched": meal["unmatched"]}, status=400)
+            totals = meal["totals"]
+            # Re-validated so looked-up totals get the same caps as typed-in ones
+            try:
+                log_entry = logSchemas.DietEntry.model_validate({
+                    **log_entry.model_dump(exclude_unset=True),
+                    "title": log_entry.title if "title" in log_entry.model_fields_set else log_entry.foods[:200],
+                    "calories": totals["kcal"], "protein": totals["protein_g"],
+                    "carbs": totals["carbs_g"], "fat": totals["fat_g"],
+                })
+            except ValidationError as e:
+                return JsonResponse({"error": "Invalid diet log", "details": logSchemas.error_details(e)}, status=400)
+
+        # 4. Save to DB
+        new_log = DietLog.objects.create(
+            user_id=user.id,
+            title=log_entry.title,
+            calories=log_entry.calories,
+            protein_g=log_entry.protein,
+            carbs_g=log_entry.carbs,
+            fat_g=log_entry.fat,
+            time=log_entry.time,
+            period=log_entry.period
+        )
+
+        print(f"✅ Saved: {log_entry.title} | {log_entry.calories}kcal")
+        queue_achievement_check(user.id, achievements.DIET_LOGGED)
+
+        return JsonResponse({
+            "message": "Diet Log stored successfully",
+            "id": new_log.id,
+            "title": new_log.title,
+            "calories": new_log.calories
+        }, status=200)
+
+    except Exception as e:
+        print(f"❌ Server Error: {str(e)}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def generateWorkoutPlan(request):
     try:
         data = request.data
-        print(f"🥦 Received Diet Log: {data}")
 
         # 1. Extract User
         user_id = data.get("userID")
         if not user_id:
             return JsonResponse({"error": "UserID is required"}, status=400)
 
-        user = get_object_or_404(AppUsers, id=user_id)
+        user, error = get_user_or_error(user_id)
+        if error:
+            return error
+        history = data.get("messages", [])
+
+        # 2. Profile from DB, overridden by live chat context if present
+        user_profile = {
+            "name": user.firstName or "Athlete",
+            "main_goal": user.primaryGoal or "optimize fitness",
+            "weight": user.weight or "N/A",
+            "height": user.height or "N/A",
+        }
+        extracted_data = extract_user_context(history)
+        if extracted_data:
+            user_profile.update({
+                "name": extracted_data["firstName"],
+                "main_goal": extracted_data["goal"],
+                "weight": extracted_data["weight"],
+                "height": extracted_data["height"],
+                "water": extracted_data["water"],
+                "diet": extracted_data["diet"],
+            })
+
+        # 3. Ask for a JSON plan and validate it
+        system_message_obj = {
+            "role": "system",
+            "content": generate_system_instruction(user_profile, structured=True)
+        }
+        plan = workoutPlans.request_plan(client, [system_message_obj] + history)
 
-        # 2. Extract Log
-        log_entry = data.get("messages", {}) 
-        
-        # 3. Helper to clean strings
-        def parse_int(value):
-            try:
-                clean_val = str(value).lower().replace("g", "").strip()
-                return int(float(clean_val))
-            except (ValueError, TypeError):
-                return 0
-
-        # 4. Parse Fields
-        title = log_entry.get("title", "Unknown Meal")
-        time_str = log_entry.get("time", "")
-        period_str = log_entry.get("period", "")
-        
-        calories_int = parse_int(log_entry.get("calories", 0))
-        protein_int = parse_int(log_entry.get("protein", 0))
-        carbs_int = parse_int(log_entry.get("carbs", 0))
-        fat_int = parse_int(log_entry.get("fat", 0))
+        # 4. Persist as Workout / WorkoutExercise rows + AIAction
+        prompt = history[-1].get("content", "") if history else ""
+        action = workoutPlans.save_plan(user, plan, prompt=prompt)
 
-        # 5. Save to DB
-        new_log = DietLog.objects.create(
+        print(f"✅ Saved AI plan: {plan.title} | {len(plan.exercises)} exercises")
+
+        return JsonResponse(action.action_data, status=201)
+
+    except workoutPlans.PlanValidationError as e:
+        print(f"❌ Invalid plan from LLM: {e}")
+        return JsonResponse({"error": "Could not generate a valid plan"}, status=502)
+    except Exception as e:
+        print(f"❌ Server Error: {str(e)}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def getWorkoutPlans(request):
+    user_id = request.query_params.get("userID")
+    if not user_id:
+        return JsonResponse({"error": "UserID is required"}, status=400)
+
+    try:
+        user_id = str(uuid.UUID(user_id))
+    except ValueError:
+        return JsonResponse({"error": "Invalid UserID"}, status=400)
+
+    try:
+        limit = max(1, min(int(request.query_params.get("limit", 10)), 50))
+    except ValueError:
+        return JsonResponse({"error": "Invalid limit"}, status=400)
+
+    with readReplica.analytics_reads(user_id):
+        plans = workoutPlans.recent_plans(user_id, limit)
+
+    return ORJSONResponse({"plans": plans}, status=200)
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def getDashboard(request):
+    """Everything the home screen shows, in one call. Honours If-None-Match."""
+    user_id = request.query_params.get("userID")
+    if not user_id:
+        return JsonResponse({"error": "UserID is required"}, status=400)
+
+    # Canonical form: the section cache is keyed (and invalidated) by str(UUID)
+    try:
+        user_id = str(uuid.UUID(user_id))
+    except ValueError:
+        return JsonResponse({"error": "Invalid UserID"}, status=400)
+
+    if profileCache.get_profile(user_id) is None:
+        return JsonResponse({"error": "User not found"}, status=404)
+
+    try:
+        body, etag = dashboard.render(user_id)
+    except Exception as e:
+        print(f"❌ Server Error: {str(e)}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+    # Whole tags, weakly compared (RFC 9110 13.1.2), not a substring of the header
+    if_none_match = {tag.removeprefix("W/") for tag in parse_etags(request.headers.get("If-None-Match", ""))}
+    if "*" in if_none_match or etag.removeprefix("W/") in if_none_match:
+        response = HttpResponse(status=304)
+    else:
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def history_validators(request, kind):
+    """(etag, last_modified) for a history request, computed once per request."""
+    if not hasattr(request, "_history_validators"):
+        try:
+            # Parsed first: a malformed id must not reach the validator aggregate
+            user_id = uuid.UUID(request.GET["userID"])
+            start, end = history.parse_range(request.GET)
+            request._history_validators = history.validators(kind, user_id, start, end)
+        except Exception:
+            # Bad input: skip the conditional check and let the view answer with a 400
+            request._history_validators = (None, None)
+    return request._history_validators
+
+
+def history_view(kind, build):
+    @condition(
+        etag_func=lambda request: history_validators(request, kind)[0],
+        last_modified_func=lambda request: history_validators(request, kind)[1],
+    )
+    @api_view(["GET"])
+    @permission_classes([AllowAny])
+    def view(request):
+        user_id = request.query_params.get("userID")
+        if not user_id:
+            return JsonResponse({"error": "UserID is required"}, status=400)
+        try:
+            user_id = uuid.UUID(user_id)
+        except ValueError:
+            return JsonResponse({"error": "Invalid UserID"}, status=400)
+        try:
+            start, end = history.parse_range(request.query_params)
+        except history.RangeError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        try:
+            days = build(user_id, start, end)
+        except Exception as e:
+            print(f"❌ Server Error: {str(e)}")
+            return JsonResponse({"error": str(e)}, status=500)
+
+        response = ORJSONResponse({"start": start, "end": end, "days": days})
+        response["Cache-Control"] = "private, no-cache"
+        return response
+    return view
+
+
+# GET ?userID=&days=30 (or &start=&end=); 304 when nothing in the range changed
+getDietHistory = history_view("diet", history.diet_history)
+getWaterHistory = history_view("water", history.water_history)
+
+
+@condition(
+    etag_func=lambda request: exerciseCatalogue.get_blob().etag,
+    last_modified_func=lambda request: exerciseCatalogue.get_blob().last_modified,
+)
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def getExerciseCatalogue(request):
+    """The built-in exercise library, straight from a precompressed in-memory blob."""
+    blob = exerciseCatalogue.get_blob()
+    encoding = httpCompression.negotiate(request.headers.get("Accept-Encoding"))
+    if encoding not in blob.variants:
+        encoding = "identity"
+
+    response = HttpResponse(blob.variants[encoding], content_type="application/json")
+    if encoding != "identity":
+        response["Content-Encoding"] = encoding
+    patch_vary_headers(response, ("Accept-Encoding",))
+    response["Cache-Control"] = "public, max-age=300"
+    return response
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def syncChanges(request):
+    """Rows changed since the client's last sync: GET ?userID=&cursor=<last seen>&limit="""
+    user_id = request.query_params.get("userID")
+    if not user_id:
+        return JsonResponse({"error": "UserID is required"}, status=400)
+
+    try:
+        user_id = uuid.UUID(user_id)
+    except ValueError:
+        return JsonResponse({"error": "Invalid UserID"}, status=400)
+
+    try:
+        cursor = int(request.query_params.get("cursor", 0))
+        limit = min(int(request.query_params.get("limit", changeFeed.DEFAULT_LIMIT)), changeFeed.MAX_LIMIT)
+    except ValueError:
+        return JsonResponse({"error": "cursor and limit must be integers"}, status=400)
+    if cursor < 0 or limit < 1:
+        return JsonResponse({"error": "cursor must be >= 0 and limit >= 1"}, status=400)
+
+    try:
+        result = changeFeed.page(user_id, cursor, limit)
+    except Exception as e:
+        print(f"❌ Server Error: {str(e)}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+    print(f"🔄 Sync: {len(result['changes'])} changes after {cursor} (more: {result['has_more']})")
+
+    response = ORJSONResponse(result)
+    response["Cache-Control"] = "private, no-store"
+    return response
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def getFoodAutocomplete(request):
+    """Foods matching what the user is typing: GET ?q=chick&limit=10 (prefix first, then typo-tolerant)."""
+    query = request.query_params.get("q", "")
+    try:
+        limit = min(int(request.query_params.get("limit", foodDatabase.DEFAULT_LIMIT)), foodDatabase.MAX_LIMIT)
+    except ValueError:
+        return JsonResponse({"error": "Invalid limit"}, status=400)
+
+    try:
+        results = foodDatabase.autocomplete(query[:100], max(limit, 1))
+    except Exception as e:
+        print(f"❌ Server Error: {str(e)}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+    response = ORJSONResponse({"query": query, "results": results})
+    response["Cache-Control"] = "public, max-age=300"
+    return response
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def resolveMeal(request):
+    """Macros for a described meal: GET ?q=2 eggs + toast"""
+    text = request.query_params.get("q", "").strip()
+    if not text:
+        return JsonResponse({"error": "q is required"}, status=400)
+    if len(text) > 500:
+        return JsonResponse({"error": "q must be at most 500 characters"}, status=400)
+
+    try:
+        meal = foodDatabase.resolve(text)
+    except Exception as e:
+        print(f"❌ Server Error: {str(e)}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+    print(f"🍳 Resolved '{text}': {len(meal['items'])} items, {meal['totals']['kcal']} kcal")
+    return ORJSONResponse(meal)
+
+
+@csrf_exempt
+def ingestWearableData(request):
+    """
+    NDJSON bulk sync: POST ?userID=<uuid> with one sample per line.
+    Plain Django view so the body is read line by line, never buffered whole.
+    """
+    if request.method != 'POST':
+        return JsonResponse({"message": "Method not allowed"}, status=405)
+
+    user_id = request.GET.get("userID")
+    if not user_id:
+        return JsonResponse({"error": "UserID is required"}, status=400)
+
+    user, error = get_user_or_error(user_id)
+    if error:
+        return error
+
+    try:
+        result = wearableIngest.ingest_ndjson(user.id, request)
+
+        print(f"⌚ Wearable sync: {result['steps']} step days | {result['sleep']} sleep days | {result['skipped']} skipped")
+
+        return JsonResponse(result, status=200)
+
+    except Exception as e:
+        print(f"❌ Server Error: {str(e)}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+def exportUserData(request):
+    """
+    Streams everything stored for a user: GET ?userID=<uuid>&format=ndjson|zip
+    Plain Django view so the body is generated while it is sent, never buffered whole.
+    """
+    if request.method != 'GET':
+        return JsonResponse({"message": "Method not allowed"}, status=405)
+
+    user_id = request.GET.get("userID")
+    if not user_id:
+        return JsonResponse({"error": "UserID is required"}, status=400)
+
+    export_format = request.GET.get("format", "ndjson")
+    if export_format not in userExport.STREAMS:
+        return JsonResponse({"error": f"format must be one of {list(userExport.STREAMS)}"}, status=400)
+
+    try:
+        user_id = uuid.UUID(user_id)
+    except ValueError:
+        return JsonResponse({"error": "Invalid UserID"}, status=400)
+
+    user = get_object_or_404(AppUsers, id=user_id)
+    stream, content_type, extension = userExport.STREAMS[export_format]
+
+    print(f"📤 Data export ({export_format}) for {user.username}")
+
+    response = StreamingHttpResponse(stream(user.id), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="reactfit-export-{user.id}.{extension}"'
+    return response
+
+
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def addHabit(request):
+    try:
+        data = request.data
+
+        user_id = data.get("userID")
+        if not user_id:
+            return JsonResponse({"error": "UserID is required"}, status=400)
+
+        user, error = get_user_or_error(user_id)
+        if error:
+            return error
+        habit_entry = data.get("messages", {})
+
+        name = str(habit_entry.get("name", "")).strip()
+        if not name:
+            return JsonResponse({"error": "Habit name is required"}, status=400)
+
+        habit = Habit.objects.create(
             user=user,
-            title=title,
-            calories=calories_int,
-            protein_g=protein_int,
-            carbs_g=carbs_int,
-            fat_g=fat_int,
-            time=time_str,
-            period=period_str
+            name=name,
+            description=habit_entry.get("description", ""),
+            icon=habit_entry.get("icon", ""),
         )
 
-        print(f"✅ Saved: {title} | {calories_int}kcal")
+        print(f"✅ Habit created: {habit.name}")
+
+        return JsonResponse({"message": "Habit created", "id": habit.id, "name": habit.name}, status=201)
+
+    except Exception as e:
+        print(f"❌ Server Error: {str(e)}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def addHabitLog(request):
+    try:
+        data = request.data
+
+        # 1. Extract Data
+        user_id = data.get("userID")
+        log_entry = data.get("messages", {})
+        habit_id = log_entry.get("habitID")
+
+        if not user_id or not habit_id:
+            return JsonResponse({"error": "UserID and habitID are required"}, status=400)
+        user_id, habit_id = parse_uuid(user_id), parse_uuid(habit_id)
+        if user_id is None or habit_id is None:
+            return JsonResponse({"error": "Invalid UserID or habitID"}, status=400)
+
+        # 2. Parse Date (defaults to today)
+        date_str = log_entry.get("date")
+        try:
+            # None for a malformed string, ValueError for an impossible one (2026-13-45)
+            log_date = parse_date(date_str) if date_str else timezone.now().date()
+        except (TypeError, ValueError):
+            log_date = None
+        if log_date is None:
+            return JsonResponse({"error": "Invalid date format"}, status=400)
+
+        completed = str(log_entry.get("completed", True)).lower() in ("true", "1", "yes")
+
+        # 3. Store Log + update streak counters
+        try:
+            habit, log = habitStreaks.log_habit(habit_id, user_id, log_date, completed, log_entry.get("notes", ""))
+        except Habit.DoesNotExist:
+            return JsonResponse({"error": "Habit not found"}, status=404)
+
+        print(f"✅ Habit Log: {habit.name} {log.date} {'✓' if log.completed else '✗'} | streak {habit.current_streak}")
+        if log.completed:
+            # Streak and count are re-read by the task: duplicates of this check collapse into the first one
+            queue_achievement_check(habit.user_id, achievements.HABIT_LOGGED, scope=habit.id,
+                                    context={"habit_id": str(habit.id)})
 
         return JsonResponse({
-            "message": "Diet Log stored successfully",
-            "id": new_log.id,
-            "title": new_log.title,
-            "calories": new_log.calories
+            "message": "Habit log stored successfully",
+            "habit": habit.name,
+            "date": str(log.date),
+            "completed": log.completed,
+            "current_streak": habit.live_streak(),
+            "longest_streak": habit.longest_streak,
+            "completion_rate": habit.completion_rate(),
+        }, status=200)
+
+    except Exception as e:
+        print(f"❌ Server Error: {str(e)}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+@idempotent
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def logWorkoutSession(request):
+    try:
+        data = request.data
+
+        user_id = data.get("userID")
+        if not user_id:
+            return JsonResponse({"error": "UserID is required"}, status=400)
+
+        user, error = get_user_or_error(user_id)
+        if error:
+            return error
+
+        # 1. Validate the performed session
+        try:
+            session = workoutLogs.WorkoutSession.model_validate(data.get("messages", {}))
+        except ValidationError as e:
+            return JsonResponse({"error": "Invalid workout", "details": logSchemas.error_details(e)}, status=400)
+
+        # 2. Store sets and fold this one session into the RPG stats (one transaction)
+        try:
+            workout, stats = workoutLogs.log_session(user, session)
+        except Workout.DoesNotExist:
+            return JsonResponse({"error": "Workout not found"}, status=404)
+        except workoutLogs.WorkoutAlreadyLogged:
+            return JsonResponse({"error": "Workout already logged"}, status=409)
+
+        print(f"✅ Workout logged: {workout.title or 'Workout'} | {workout.total_volume_kg}kg volume")
+        # Stats are re-read by the task; only this session's volume travels with the event
+        queue_achievement_check(user.id, achievements.WORKOUT_LOGGED, scope=workout.id, context={
+            "session_volume_kg": float(workout.total_volume_kg or 0),
+        })
+
+        return JsonResponse({
+            "message": "Workout logged successfully",
+            "workout_id": workout.id,
+            "total_volume_kg": float(workout.total_volume_kg or 0),
+            "stats": {
+                "strength": stats.strength_score,
+                "endurance": stats.endurance_score,
+                "flexibility": stats.flexibility_score,
+                "recovery": stats.recovery_score,
+                "streak": stats.consistency_streak,
+                "total_workouts": stats.total_workouts,
+            },
         }, status=200)
 
     except Exception as e:
         print(f"❌ Server Error: {str(e)}")
-        return JsonResponse({"error": str(e)}, status=500)
\ No newline at end of file
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def updateProfile(request):
+    try:
+        data = request.data
+
+        user_id = data.get("userID")
+        if not user_id:
+            return JsonResponse({"error": "UserID is required"}, status=400)
+
+        user = get_object_or_404(AppUsers, id=user_id)
+
+        # Partial update; password/username/role changes are not allowed here
+        changes = {k: v for k, v in data.get("messages", {}).items() if k not in ("password", "username", "role")}
+        serializer = RegisterSerializer(user, data=changes, partial=True)
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=400)
+
+        # save() -> AppUsers.save() invalidates the cached profile
+        serializer.save()
+
+        print(f"✅ Profile updated: {user.username} | {sorted(changes)}")
+
+        return JsonResponse({"message": "Profile updated", "user_id": user.id}, status=200)
+
+    except Exception as e:
+        print(f"❌ Server Error: {str(e)}")
+        return JsonResponse({"error": str(e)}, status=500)
@@ -0,0 +1,100 @@
+"""
+JSON serialization benchmark: stdlib (JsonResponse / DRF JSONRenderer) vs orjson.
+
+    python benchmarks/bench_json.py > bench_output.txt
+
+Payloads mirror real responses: a year of diet history (diethistory/) and a
+long workout log with exercises and sets (Decimals, UUIDs, datetimes).
+No database is needed.
+"""
+
+import io
+import json
+import os
+import sys
+import timeit
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django
+from django.conf import settings
+
+settings.configure(INSTALLED_APPS=['rest_framework'], USE_TZ=True)
+django.setup()
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from base.parsers import ORJSONParser
+from base.renderers import ORJSONRenderer
+
+REPEAT = 5
+
+
+def diet_history_payload(days=366, meals_per_day=6):
+    today = date(2026, 1, 1)
+    out = []
+    for d in range(days):
+        entries = [
+            {"title": f"Meal {m} with a realistic name", "kcal": 450 + m, "p": 30, "c": 55, "f": 14, "time": "08:30 AM"}
+            for m in range(meals_per_day)
+        ]
+        out.append({"date": today - timedelta(days=d), "kcal": 2700, "p": 180, "c": 330, "f": 84, "entries": entries})
+    return {"start": today - timedelta(days=days - 1), "end": today, "days": out}
+
+
+def workout_payload(workouts=200, exercises=6, sets=5):
+    now = datetime(2026, 1, 1, 7, 30, tzinfo=timezone.utc)
+    return {"workouts": [
+        {
+            "id": uuid.uuid4(), "title": "Push day", "date": (now - timedelta(days=w)).date(),
+            "started_at": now - timedelta(days=w), "total_volume_kg": Decimal("12345.50"),
+            "exercises": [
+                {
+                    "id": uuid.uuid4(), "exercise_id": uuid.uuid4(), "order": e,
+                    "target_weight_kg": Decimal("80.00"),
+                    "sets": [
+                        {"id": uuid.uuid4(), "set_number": s + 1, "reps": 8, "weight_kg": Decimal("82.50"),
+                         "form_score": Decimal("91.25"), "completed": True, "created_at": now}
+                        for s in range(sets)
+                    ],
+                }
+                for e in range(exercises)
+            ],
+        }
+        for w in range(workouts)
+    ]}
+
+
+def best_ms(func, number):
+    return min(timeit.repeat(func, number=number, repeat=REPEAT)) / number * 1000
+
+
+def run(name, payload, number):
+    encoders = {
+        "JsonResponse (json + DjangoJSONEncoder)": lambda: json.dumps(payload, cls=DjangoJSONEncoder).encode(),
+        "DRF JSONRenderer": lambda: JSONRenderer().render(payload),
+        "ORJSONRenderer": lambda: ORJSONRenderer().render(payload),
+    }
+    body = ORJSONRenderer().render(payload)
+    parsers = {
+        "DRF JSONParser": lambda: JSONParser().parse(io.BytesIO(body)),
+        "ORJSONParser": lambda: ORJSONParser().parse(io.BytesIO(body)),
+    }
+
+    print(f"\n{name}: {len(body) / 1024:.0f} KiB")
+    for group in (encoders, parsers):
+        baseline = None
+        for label, func in group.items():
+            ms = best_ms(func, number)
+            baseline = baseline or ms
+            print(f"  {label:<42} {ms:8.2f} ms   x{baseline / ms:5.1f}")
+
+
+if __name__ == "__main__":
+    run("Diet history, 366 days x 6 meals", diet_history_payload(), number=10)
+    run("Workout log, 200 workouts x 6 exercises x 5 sets", workout_payload(), number=5)
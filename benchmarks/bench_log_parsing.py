@@ -0,0 +1,83 @@
+"""
+Per-request parse cost of the water / diet log bodies.
+
+    python benchmarks/bench_log_parsing.py >> bench_output.txt
+
+"before": DRF JSONParser (request.data) + the hand-rolled string cleanup the
+views used to do. "after": one pydantic model_validate_json over the raw bytes
+(base/services/logSchemas.py). No database is needed.
+"""
+
+import io
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django
+from django.conf import settings
+
+settings.configure(INSTALLED_APPS=['rest_framework'], USE_TZ=True)
+django.setup()
+
+from rest_framework.parsers import JSONParser
+
+from base.services.logSchemas import DietLogRequest, WaterLogRequest
+
+USER_ID = "0b7f3c1e-5a2d-4c8e-9f10-2b3c4d5e6f70"
+WATER_BODY = ('{"userID": "%s", "messages": {"amount": "250ml"}}' % USER_ID).encode()
+DIET_BODY = ('{"userID": "%s", "messages": {"title": "Chicken rice bowl", "calories": "650 kcal", '
+             '"protein": "42g", "carbs": "70 g", "fat": "18g", "time": "01:15", "period": "PM"}}' % USER_ID).encode()
+
+NUMBER = 20000
+REPEAT = 5
+
+
+def water_before():
+    data = JSONParser().parse(io.BytesIO(WATER_BODY))
+    user_id = data.get("userID")
+    log_entry = data.get("messages", {})
+    amount_str = log_entry.get("amount", "0")
+    return user_id, int(str(amount_str).lower().replace("ml", "").strip())
+
+
+def diet_before():
+    data = JSONParser().parse(io.BytesIO(DIET_BODY))
+    user_id = data.get("userID")
+    log_entry = data.get("messages", {})
+
+    def parse_int(value):
+        try:
+            clean_val = str(value).lower().replace("g", "").strip()
+            return int(float(clean_val))
+        except (ValueError, TypeError):
+            return 0
+
+    return (
+        user_id, log_entry.get("title", "Unknown Meal"), log_entry.get("time", ""), log_entry.get("period", ""),
+        parse_int(log_entry.get("calories", 0)), parse_int(log_entry.get("protein", 0)),
+        parse_int(log_entry.get("carbs", 0)), parse_int(log_entry.get("fat", 0)),
+    )
+
+
+def water_after():
+    return WaterLogRequest.model_validate_json(WATER_BODY)
+
+
+def diet_after():
+    return DietLogRequest.model_validate_json(DIET_BODY)
+
+
+def best_us(func):
+    return min(timeit.repeat(func, number=NUMBER, repeat=REPEAT)) / NUMBER * 1e6
+
+
+if __name__ == "__main__":
+    # The old diet cleanup also mangles "650 kcal" into 0 calories; the schema parses it
+    assert diet_before()[4] == 0 and diet_after().messages.calories == 650
+
+    print("\nLog request parsing (per request)")
+    for name, before, after in [("water", water_before, water_after), ("diet", diet_before, diet_after)]:
+        b, a = best_us(before), best_us(after)
+        print(f"  {name:<6} before {b:6.2f} us   after {a:6.2f} us   x{b / a:4.1f}  (after also validates)")
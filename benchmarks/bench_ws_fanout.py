@@ -0,0 +1,157 @@
+"""
+WebSocket fan-out load test: many idle sockets on one server process.
+
+    python benchmarks/bench_ws_fanout.py --sockets 10000 --users 1000 > bench_output.txt
+
+Starts daphne on the project's ASGI app (one process, in-memory channel
+layer), opens ``--sockets`` idle connections spread over ``--users`` bench
+users, then logs water over plain HTTP for a sample of users and times how
+long until every socket of that user has the push. Reports connect rate,
+server memory per idle socket and push latency. Uses whatever database
+DJANGO_SETTINGS_MODULE points at; the bench users are deleted afterwards.
+
+Needs ``pip install websockets`` and ``ulimit -n`` above 2x --sockets.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ReactFitPythonBackend.settings')
+
+import django
+
+django.setup()
+
+import websockets
+
+from base.models.appUsers import AppUsers
+
+USERNAME_PREFIX = "bench_ws_"
+
+
+def rss_mib(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server did not start on port {port}")
+
+
+def create_users(count):
+    AppUsers.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+    AppUsers.objects.bulk_create([
+        AppUsers(username=f"{USERNAME_PREFIX}{i}", email=f"{USERNAME_PREFIX}{i}@bench.local")
+        for i in range(count)
+    ], batch_size=1000)
+    return [str(pk) for pk in AppUsers.objects.filter(username__startswith=USERNAME_PREFIX).values_list("id", flat=True)]
+
+
+def log_water(port, user_id):
+    body = json.dumps({"userID": user_id, "messages": {"amount": 250}}).encode()
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/api/v1/reactfit/v001/addwaterintakelog/",
+        data=body, headers={"Content-Type": "application/json"},
+    )
+    urllib.request.urlopen(request).read()
+
+
+async def open_sockets(port, user_ids, count, concurrency):
+    gate = asyncio.Semaphore(concurrency)
+    sockets = [None] * count
+
+    async def connect(i):
+        async with gate:
+            url = f"ws://127.0.0.1:{port}/ws/v1/stream/?userID={user_ids[i % len(user_ids)]}"
+            sockets[i] = await websockets.connect(url, ping_interval=None, max_queue=None)
+
+    await asyncio.gather(*(connect(i) for i in range(count)))
+    return sockets
+
+
+async def push_latency(port, user_ids, sockets, samples):
+    by_user = {}
+    for i, ws in enumerate(sockets):
+        by_user.setdefault(user_ids[i % len(user_ids)], []).append(ws)
+
+    latencies = []
+    for user_id in user_ids[:samples]:
+        started = time.perf_counter()
+        await asyncio.to_thread(log_water, port, user_id)
+        # Each save produces one "change" push per socket (water_intake upsert)
+        await asyncio.gather(*(ws.recv() for ws in by_user[user_id]))
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+async def run(args, port, pid, user_ids):
+    baseline = rss_mib(pid)
+
+    started = time.perf_counter()
+    sockets = await open_sockets(port, user_ids, args.sockets, args.concurrency)
+    connect_seconds = time.perf_counter() - started
+
+    await asyncio.sleep(args.idle)
+    loaded = rss_mib(pid)
+
+    latencies = await push_latency(port, user_ids, sockets, args.samples)
+
+    print(f"sockets          {args.sockets} over {len(user_ids)} users ({args.sockets // len(user_ids)} per user)")
+    print(f"connect          {connect_seconds:.1f} s ({args.sockets / connect_seconds:.0f} sockets/s)")
+    print(f"server RSS       {baseline:.1f} MiB -> {loaded:.1f} MiB "
+          f"({(loaded - baseline) * 1024 / args.sockets:.1f} KiB per idle socket)")
+    latencies.sort()
+    print(f"HTTP write -> all of the user's sockets pushed, {len(latencies)} samples:")
+    print(f"  p50 {statistics.median(latencies):.1f} ms | "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.1f} ms | max {latencies[-1]:.1f} ms")
+
+    await asyncio.gather(*(ws.close() for ws in sockets))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sockets", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--samples", type=int, default=100, help="users to push to while all sockets are open")
+    parser.add_argument("--concurrency", type=int, default=200, help="handshakes in flight")
+    parser.add_argument("--idle", type=float, default=5.0, help="seconds to sit idle before measuring memory")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    user_ids = create_users(args.users)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "daphne", "-b", "127.0.0.1", "-p", str(args.port),
+         "ReactFitPythonBackend.asgi:application"],
+        cwd=ROOT, env=os.environ.copy(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(args.port)
+        asyncio.run(run(args, args.port, server.pid, user_ids))
+    finally:
+        server.terminate()
+        server.wait()
+        AppUsers.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+
+if __name__ == "__main__":
+    main()